@@ -3,19 +3,16 @@
 from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
 from pydantic import BaseModel, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# 加载 .env 文件
-# 计算项目根目录的 .env 文件路径
+# 计算项目根目录的 .env 文件路径（由下方 SettingsConfigDict(env_file=...) 读取，只解析一次）
 # Path(__file__) = src/ai_social_scheduler/config/model_config.py
 # .parent = src/ai_social_scheduler/config/
 # .parent.parent = src/ai_social_scheduler/
 # .parent.parent.parent = src/
 # .parent.parent.parent.parent = 项目根目录 ai_social_scheduler/
 _env_path = Path(__file__).parent.parent.parent.parent / ".env"
-load_dotenv(dotenv_path=_env_path)
 
 
 class AlibabaBailianConfig(BaseModel):
@@ -129,10 +129,9 @@ class FeedsAction:
             logger.info("页面加载完成")
             
             # 使用专门用于笔记详情页的数据提取方法（去除Vue响应式）
-            result = await AntiBotStrategy.extract_feed_detail_state(self.page)
-            logger.info(f"获取到的 __INITIAL_STATE__ 数据长度: {len(result)}")
+            initial_state = await AntiBotStrategy.extract_feed_detail_state_dict(self.page)
             
-            if not result:
+            if initial_state is None:
                 logger.error("未找到 __INITIAL_STATE__ 数据")
                 return FeedDetailResponse(
                     success=False,
@@ -141,9 +140,6 @@ class FeedsAction:
                     data=None
                 )
             
-            # 解析JSON数据
-            initial_state = json.loads(result)
-            
             # 从 noteDetailMap 中获取对应 note_id 的数据
             note_detail_map = initial_state.get("note", {}).get("noteDetailMap", {})
             note_detail = note_detail_map.get(note_id)
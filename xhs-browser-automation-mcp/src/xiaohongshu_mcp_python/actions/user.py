@@ -3,7 +3,6 @@
 """
 
 import asyncio
-import json
 import re
 from typing import Optional, Dict, Any, List
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
@@ -57,18 +56,12 @@ class UserProfileAction:
             # 使用统一的反爬虫导航策略
             await AntiBotStrategy.simulate_human_navigation(self.page, search_url)
             
-            # 等待__INITIAL_STATE__加载完成 -
-            await self.page.wait_for_function("() => window.__INITIAL_STATE__ !== undefined")
+            # 使用统一的安全数据提取方法（内部等待__INITIAL_STATE__加载完成）
+            initial_state = await AntiBotStrategy.extract_initial_state_dict(self.page)
             
-            # 使用统一的安全数据提取方法
-            result = await AntiBotStrategy.extract_initial_state_safely(self.page)
-            
-            if not result:
+            if initial_state is None:
                 raise ValueError("__INITIAL_STATE__ not found")
             
-            # 解析初始状态数据 - 数据结构
-            initial_state = json.loads(result)
-            
             # 提取用户数据 - 解析逻辑
             user_data = initial_state.get("user", {})
             user_page_data = user_data.get("userPageData", {}).get("_rawValue", {})
@@ -6,7 +6,7 @@
 from .login_manager import LoginManager
 from .login_session_manager import LoginSessionManager
 from .xiaohongshu_login import XiaohongshuLogin
-from .login_types import LoginStatus, LoginResult, QRCodeInfo, LoginConfig
+from .login_types import LoginStatus, LoginResult, QRCodeInfo, LoginConfig, LoginState, LoginStateKind
 
 __all__ = [
     "LoginManager",
@@ -16,5 +16,7 @@ __all__ = [
     "LoginResult",
     "QRCodeInfo",
     "LoginConfig",
+    "LoginState",
+    "LoginStateKind",
 ]
 
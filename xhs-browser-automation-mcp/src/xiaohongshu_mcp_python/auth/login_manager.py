@@ -6,6 +6,7 @@
 
 import asyncio
 import base64
+import time
 import traceback
 from typing import Optional
 from loguru import logger
@@ -289,12 +290,10 @@ class LoginManager:
         
         logger.info(f"开始等待用户登录，超时时间: {timeout}秒，检查间隔: {check_interval}秒")
         
-        start_time = asyncio.get_event_loop().time()
+        deadline = time.monotonic() + timeout
         
         while True:
-            current_time = asyncio.get_event_loop().time()
-            
-            if current_time - start_time > timeout:
+            if time.monotonic() > deadline:
                 logger.warning("等待登录超时")
                 return LoginResult.failure_result("等待登录超时")
             
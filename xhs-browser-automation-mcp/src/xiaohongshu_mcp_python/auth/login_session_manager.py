@@ -207,9 +207,7 @@ class LoginSessionManager:
             if fresh:
                 try:
                     session.message = "正在清空cookies..."
-                    session.login_manager.cookie_storage.clear_cookies()
-                    page = await session.login_manager.browser_manager.get_page()
-                    await page.context.clear_cookies()
+                    await session.login_manager.clear_login_cookies()
                     logger.info(f"会话 {session_id}: 已清空 cookies")
                 except Exception as ce:
                     logger.warning(f"会话 {session_id}: 清空 cookies 失败: {ce}")
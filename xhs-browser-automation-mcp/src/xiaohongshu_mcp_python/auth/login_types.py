@@ -17,6 +17,25 @@ class LoginStatus(Enum):
     LOGIN_EXPIRED = "login_expired"  # 登录已过期
 
 
+class LoginStateKind(Enum):
+    """一次页面探测得到的登录页面状态"""
+    LOGGED_IN = "logged_in"      # 已登录（"我"的链接已出现）
+    MODAL_OPEN = "modal_open"    # 登录弹窗已打开，二维码可用
+    FAILED = "failed"            # 探测失败或超时
+
+
+@dataclass
+class LoginState:
+    """登录页面状态（ensure_login_state 的返回值）"""
+    kind: LoginStateKind
+    qrcode_url: Optional[str] = None    # 仅 MODAL_OPEN 时有值
+    message: str = ""
+
+    @property
+    def logged_in(self) -> bool:
+        return self.kind is LoginStateKind.LOGGED_IN
+
+
 @dataclass
 class QRCodeInfo:
     """二维码信息"""
@@ -9,6 +9,7 @@
 """
 
 import asyncio
+import time
 from typing import Optional, Tuple
 from loguru import logger
 
@@ -18,6 +19,39 @@ from ..storage.cookie_storage import CookieStorage
 from ..config.xhs_xpath import XHSXPath
 
 
+# 页面内等待登录完成：MutationObserver（只监听节点增删）在 DOM 变化时检查，登录框消失且"我的"按钮出现时返回 true；
+# 显示/隐藏等属性变化由低频轮询兜底；超过 timeoutMs 时返回 false 并断开 observer，不会遗留在页面中。
+_WAIT_FOR_LOGIN_JS = """
+({modalCss, modalXpath, userCss, userXpath, timeoutMs}) => new Promise((resolve) => {
+    const byXpath = (xpath) => document.evaluate(
+        xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    const visible = (el) => !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const modalShown = () => visible(document.querySelector(modalCss)) || visible(byXpath(modalXpath));
+    const userShown = () => visible(byXpath(userXpath)) || visible(document.querySelector(userCss));
+    const done = () => !modalShown() && userShown();
+    if (done()) return resolve(true);
+    let observer, poll, timer;
+    const finish = (value) => {
+        observer.disconnect();
+        clearInterval(poll);
+        clearTimeout(timer);
+        resolve(value);
+    };
+    const onChange = () => {
+        if (done()) finish(true);
+    };
+    observer = new MutationObserver(onChange);
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+    poll = setInterval(onChange, 1000);
+    timer = setTimeout(() => finish(false), timeoutMs);
+})
+"""
+
+# 页面内等待脚本自身超时后，Python 侧再多等的时间（秒），避免两侧同时超时时丢失结果
+_IN_PAGE_TIMEOUT_MARGIN = 5
+
+
 class XiaohongshuLogin:
     """小红书登录管理器"""
     
@@ -58,13 +92,34 @@ class XiaohongshuLogin:
             await self.browser_manager.stop(save_cookies=save_cookies)
         logger.info("小红书登录管理器资源清理完成（浏览器已关闭）")
 
+    async def clear_login_cookies(self) -> bool:
+        """
+        清除本地 cookie 文件与浏览器上下文中的全部 cookies（登出、fresh 登录共用）
+
+        必须全部清除：只清除部分 cookie 时 web_session、a1 等会话 cookie 仍然有效，
+        登出后仍处于登录态，且关闭浏览器时又会被写回本地文件。
+        """
+        ok = self.cookie_storage.clear_cookies()
+        if self.browser_manager.is_started():
+            page = await self.browser_manager.get_page()
+            await page.context.clear_cookies()
+        return ok
+
+    async def _navigate_to_explore(self, force: bool = False) -> None:
+        """导航到探索页；页面已在探索页时跳过，避免重复加载"""
+        if not force and self.page_controller.page.url.startswith(self.XHS_URL):
+            logger.debug("页面已在探索页，跳过导航")
+            return
+        await self.page_controller.navigate(self.XHS_URL, wait_until="domcontentloaded")
+
     async def is_logged_in(self, navigate: bool = False) -> bool:
-        """仅通过 DOM 检查是否已登录；可选是否导航到探索页"""
+        """仅通过 DOM 检查是否已登录；navigate=True 时先重新加载探索页"""
         if not self.page_controller:
             await self.initialize()
         try:
             if navigate:
-                await self.page_controller.navigate(self.XHS_URL, wait_until="domcontentloaded")
+                # 显式要求导航时总是重新加载，不能读已在探索页上的旧 DOM
+                await self._navigate_to_explore(force=True)
             # 负向检查：出现“登录”按钮通常表示未登录
             try:
                 if await self.page_controller.has_element(self.LOGIN_BUTTON_CSS, timeout=1000):
@@ -93,14 +148,14 @@ class XiaohongshuLogin:
             except Exception:
                 pass
         except Exception as e:
-            logger.debug(f"登录状态 DOM 检查失败: {e}")
+            logger.debug("登录状态 DOM 检查失败: {}", e)
         return False
 
     async def open_login_modal(self) -> bool:
         """导航到探索页，打开登录弹窗，如果已登录则返回 False"""
         if not self.page_controller:
             await self.initialize()
-        await self.page_controller.navigate(self.XHS_URL, wait_until="domcontentloaded")
+        await self._navigate_to_explore()
         if await self.is_logged_in(navigate=False):
             logger.info("已登录，跳过打开登录弹窗")
             return False
@@ -109,7 +164,7 @@ class XiaohongshuLogin:
             await self.page_controller.click_element(self.LOGIN_BUTTON_CSS, timeout=8000)
             logger.info("已点击登录按钮，等待弹窗与二维码")
         except Exception as e:
-            logger.warning(f"未找到或无法点击登录按钮: {e}")
+            logger.warning("未找到或无法点击登录按钮: {}", e)
         return True
 
     async def get_qrcode(self) -> Optional[str]:
@@ -129,7 +184,7 @@ class XiaohongshuLogin:
                 logger.info("二维码已获取")
                 return src
         except Exception as e:
-            logger.error(f"二维码元素未找到或获取失败: {e}")
+            logger.error("二维码元素未找到或获取失败: {}", e)
             return None
         return None
 
@@ -152,61 +207,68 @@ class XiaohongshuLogin:
         # fresh 模式：清空 cookies（文件和上下文）
         if fresh:
             try:
-                self.cookie_storage.clear_cookies()
-                page = await self.browser_manager.get_page()
-                await page.context.clear_cookies()
+                await self.clear_login_cookies()
                 logger.info("已清空 cookies，开始干净的登录等待")
             except Exception as ce:
-                logger.warning(f"清空 cookies 失败: {ce}")
+                logger.warning("清空 cookies 失败: {}", ce)
         
-        logger.info(f"开始阻塞等待登录完成，超时={timeout}s, 检查间隔={interval}s")
+        logger.info("开始阻塞等待登录完成，超时={}s, 检查间隔={}s", timeout, interval)
         logger.info("等待条件：1) 登录框消失 2) '我的'按钮出现")
         
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.monotonic()
+        deadline = start_time + timeout
         last_log_time = start_time
         
+        # 优先在页面内等待（无需 Python 侧轮询）；页面导航会销毁执行上下文，此时回退到轮询
+        try:
+            page = await self.browser_manager.get_page()
+            logged_in = await asyncio.wait_for(
+                page.evaluate(
+                    _WAIT_FOR_LOGIN_JS,
+                    {
+                        "modalCss": self.LOGIN_MODAL_CSS,
+                        "modalXpath": self.LOGIN_MODAL_XPATH,
+                        "userCss": self.USER_LINK_CSS,
+                        "userXpath": self.USER_LINK_XPATH,
+                        "timeoutMs": int(timeout * 1000),
+                    },
+                ),
+                timeout=timeout + _IN_PAGE_TIMEOUT_MARGIN,
+            )
+            if not logged_in:
+                logger.warning("等待登录超时（{}秒）", timeout)
+                return False, f"等待登录超时（{timeout}秒）", False
+            logger.info("登录完成：登录框已消失且'我的'按钮已出现")
+            ok = await self.browser_manager.save_cookies()
+            logger.info("登录成功，已保存 cookies")
+            return True, "登录成功：登录框已消失且'我的'按钮已出现", ok
+        except asyncio.TimeoutError:
+            logger.warning("等待登录超时（{}秒）", timeout)
+            return False, f"等待登录超时（{timeout}秒）", False
+        except Exception as e:
+            logger.debug("页面内等待登录中断，回退到轮询检查: {}", e)
+        
         while True:
             # 超时判断
-            current_time = asyncio.get_event_loop().time()
-            elapsed = current_time - start_time
-            if elapsed > timeout:
-                logger.warning(f"等待登录超时（{timeout}秒）")
+            current_time = time.monotonic()
+            if current_time > deadline:
+                logger.warning("等待登录超时（{}秒）", timeout)
                 return False, f"等待登录超时（{timeout}秒）", False
             
             try:
-                # 检查条件1：登录框是否消失（使用CSS和XPath两种方式）
-                login_modal_exists = False
+                # 轮询节奏由外层 interval 控制，这里只读取当前 DOM 状态（is_visible 不等待），
+                # 整体超时仅由 deadline 判断
                 page = await self.browser_manager.get_page()
-                try:
-                    # 尝试使用CSS选择器检查
-                    locator_css = page.locator(self.LOGIN_MODAL_CSS)
-                    await locator_css.wait_for(state="visible", timeout=500)
-                    login_modal_exists = True
-                except Exception:
-                    try:
-                        # 如果CSS失败，尝试使用XPath
-                        locator_xpath = page.locator(self.LOGIN_MODAL_XPATH)
-                        await locator_xpath.wait_for(state="visible", timeout=500)
-                        login_modal_exists = True
-                    except Exception:
-                        # 如果都失败，假设登录框不存在
-                        login_modal_exists = False
-                
-                # 检查条件2："我的"按钮是否出现
-                user_button_exists = False
-                try:
-                    # 尝试使用XPath检查"我的"按钮（更可靠）
-                    locator_xpath = page.locator(self.USER_LINK_XPATH)
-                    await locator_xpath.wait_for(state="visible", timeout=500)
-                    user_button_exists = True
-                except Exception:
-                    try:
-                        # 如果XPath失败，尝试使用CSS
-                        locator_css = page.locator(self.USER_LINK_CSS)
-                        await locator_css.wait_for(state="visible", timeout=500)
-                        user_button_exists = True
-                    except Exception:
-                        user_button_exists = False
+                # 检查条件1：登录框是否消失（使用CSS和XPath两种方式）
+                login_modal_exists = (
+                    await page.locator(self.LOGIN_MODAL_CSS).first.is_visible()
+                    or await page.locator(self.LOGIN_MODAL_XPATH).first.is_visible()
+                )
+                # 检查条件2："我的"按钮是否出现（XPath 更可靠，CSS 备用）
+                user_button_exists = (
+                    await page.locator(self.USER_LINK_XPATH).first.is_visible()
+                    or await page.locator(self.USER_LINK_CSS).first.is_visible()
+                )
                 
                 # 两个条件都满足：登录框消失且"我的"按钮出现
                 if not login_modal_exists and user_button_exists:
@@ -217,19 +279,19 @@ class XiaohongshuLogin:
                 
                 # 每5秒记录一次当前状态（用于调试）
                 if current_time - last_log_time >= 5.0:
+                    elapsed = current_time - start_time
                     logger.debug(
-                        f"等待中... (已等待 {elapsed:.1f}s / {timeout}s) - "
-                        f"登录框存在: {login_modal_exists}, "
-                        f"'我的'按钮存在: {user_button_exists}"
+                        "等待中... (已等待 {:.1f}s / {}s) - 登录框存在: {}, '我的'按钮存在: {}",
+                        elapsed, timeout, login_modal_exists, user_button_exists,
                     )
                     last_log_time = current_time
                     
             except asyncio.CancelledError:
                 logger.debug("等待循环被取消，继续轮询")
             except Exception as e:
-                logger.debug(f"等待期间检查失败: {e}")
+                logger.debug("等待期间检查失败: {}", e)
             
-            await asyncio.sleep(interval)
+            await asyncio.sleep(min(interval, max(deadline - time.monotonic(), 0)))
 
     async def login(self, headless: bool = False, timeout: int = 90, fresh: bool = True) -> Tuple[bool, str, bool]:
         """
@@ -246,14 +308,13 @@ class XiaohongshuLogin:
             # fresh 模式：清空 cookies（文件和上下文）
             if fresh:
                 try:
-                    self.cookie_storage.clear_cookies()
-                    page = await self.browser_manager.get_page()
-                    await page.context.clear_cookies()
+                    await self.clear_login_cookies()
                     logger.info("已清空 cookies，开始干净的登录流程")
                 except Exception as ce:
-                    logger.warning(f"清空 cookies 失败: {ce}")
-            # 导航后通过 DOM 检查当前是否已登录
-            if await self.is_logged_in(navigate=True):
+                    logger.warning("清空 cookies 失败: {}", ce)
+            # 导航后通过 DOM 检查当前是否已登录；清空过 cookies 时必须重新加载页面
+            await self._navigate_to_explore(force=fresh)
+            if await self.is_logged_in(navigate=False):
                 ok = await self.browser_manager.save_cookies()
                 return True, "用户已登录", ok
             # 打开登录弹窗并阻塞等待登录完成
@@ -261,20 +322,17 @@ class XiaohongshuLogin:
             success, message, saved = await self.wait_for_login(timeout=timeout, interval=0.5, fresh=fresh)
             return success, message, saved
         except Exception as e:
-            logger.error(f"登录流程失败: {e}")
+            logger.error("登录流程失败: {}", e)
             return False, f"登录失败: {e}", False
 
     async def logout(self) -> bool:
         """清除本地与浏览器中的 Cookie"""
         try:
-            ok = self.cookie_storage.clear_cookies()
-            if self.browser_manager.is_started():
-                page = await self.browser_manager.get_page()
-                await page.context.clear_cookies()
+            ok = await self.clear_login_cookies()
             logger.info("已清除 cookies")
             return ok
         except Exception as e:
-            logger.error(f"登出失败: {e}")
+            logger.error("登出失败: {}", e)
             return False
 
     async def save_cookies(self) -> bool:
@@ -288,5 +346,5 @@ class XiaohongshuLogin:
                 logger.warning("浏览器未启动，无法保存 cookies")
                 return False
         except Exception as e:
-            logger.error(f"保存 cookies 失败: {e}")
+            logger.error("保存 cookies 失败: {}", e)
             return False
\ No newline at end of file
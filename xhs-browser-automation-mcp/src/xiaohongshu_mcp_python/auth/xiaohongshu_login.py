@@ -17,10 +17,70 @@ from ..browser.browser_manager import BrowserManager
 from ..browser.page_controller import PageController
 from ..storage.cookie_storage import CookieStorage
 from ..config.xhs_xpath import XHSXPath
+from .login_types import LoginState, LoginStateKind
+
+
+# 页面内一次性判定登录状态：用户链接出现 → 已登录；二维码出现 → 弹窗已打开（同时取出二维码地址）。
+# 两者都未出现时点击一次"登录"按钮，随后由 MutationObserver（只监听节点增删）等待 DOM 变化，
+# 显示/隐藏等属性变化由低频轮询兜底。分两段计时：点击前 timeoutMs 内须判定出状态或找到登录按钮，
+# 点击后二维码渲染另有 qrTimeoutMs；超时返回 timeout（附带所在阶段）并断开 observer，不会遗留在页面中。
+_LOGIN_STATE_JS = """
+({userXpath, qrCss, qrXpath, loginButtonXpath, timeoutMs, qrTimeoutMs}) => new Promise((resolve) => {
+    const byXpath = (xpath) => document.evaluate(
+        xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    const visible = (el) => !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    let clicked = false;
+    let observer, poll, timer;
+    const check = () => {
+        if (visible(byXpath(userXpath))) return {type: "logged_in"};
+        const qr = document.querySelector(qrCss) || byXpath(qrXpath);
+        if (qr && qr.src) return {type: "modal", qr: qr.src};
+        if (!clicked) {
+            const button = byXpath(loginButtonXpath);
+            if (button) {
+                clicked = true;
+                button.click();
+                // 已打开弹窗，改为等待二维码渲染
+                if (timer !== undefined) {
+                    clearTimeout(timer);
+                    timer = setTimeout(onTimeout, qrTimeoutMs);
+                }
+            }
+        }
+        return null;
+    };
+    const first = check();
+    if (first) return resolve(first);
+    const finish = (value) => {
+        observer.disconnect();
+        clearInterval(poll);
+        clearTimeout(timer);
+        resolve(value);
+    };
+    const onChange = () => {
+        const result = check();
+        if (result) finish(result);
+    };
+    observer = new MutationObserver(onChange);
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+    poll = setInterval(onChange, 1000);
+    const onTimeout = () => finish({type: "timeout", phase: clicked ? "qr" : "state"});
+    timer = setTimeout(onTimeout, clicked ? qrTimeoutMs : timeoutMs);
+})
+"""
+
+# 页面内等待脚本自身超时后，Python 侧再多等的时间（秒），避免两侧同时超时时丢失结果
+_IN_PAGE_TIMEOUT_MARGIN = 5
 
 
 class XiaohongshuLogin:
     """小红书登录管理器"""
+
+    # ensure_login_state 等待用户链接或登录按钮出现的默认超时（秒）
+    LOGIN_STATE_TIMEOUT = 8
+    # 点击登录按钮后等待二维码渲染的默认超时（秒），与原先 get_qrcode 的等待上限一致
+    QR_RENDER_TIMEOUT = 90
     
     # 使用配置文件中的选择器
     XHS_URL = XHSXPath.XHS_URL
@@ -58,6 +118,26 @@ class XiaohongshuLogin:
             await self.browser_manager.stop(save_cookies=save_cookies)
         logger.info("小红书登录管理器资源清理完成（浏览器已关闭）")
 
+    async def clear_login_cookies(self) -> bool:
+        """
+        清除本地 cookie 文件与浏览器上下文中的全部 cookies（登出、fresh 登录共用）
+
+        必须全部清除：只清除部分 cookie 时 web_session、a1 等会话 cookie 仍然有效，
+        登出后仍处于登录态，且关闭浏览器时又会被写回本地文件。
+        """
+        ok = self.cookie_storage.clear_cookies()
+        if self.browser_manager.is_started():
+            page = await self.browser_manager.get_page()
+            await page.context.clear_cookies()
+        return ok
+
+    async def _navigate_to_explore(self, force: bool = False) -> None:
+        """导航到探索页；页面已在探索页时跳过，避免重复加载"""
+        if not force and self.page_controller.page.url.startswith(self.XHS_URL):
+            logger.debug("页面已在探索页，跳过导航")
+            return
+        await self.page_controller.navigate(self.XHS_URL, wait_until="domcontentloaded")
+
     async def is_logged_in(self, navigate: bool = False) -> bool:
         """
         检查是否已登录
@@ -67,7 +147,7 @@ class XiaohongshuLogin:
         2. 负向检查：使用 LOGIN_BUTTON_XPATH，如果存在说明未登录
         
         Args:
-            navigate: 是否导航到探索页
+            navigate: 是否导航（重新加载）到探索页
         
         Returns:
             是否已登录
@@ -76,7 +156,8 @@ class XiaohongshuLogin:
             await self.initialize()
         try:
             if navigate:
-                await self.page_controller.navigate(self.XHS_URL, wait_until="domcontentloaded")
+                # 显式要求导航时总是重新加载，不能读已在探索页上的旧 DOM
+                await self._navigate_to_explore(force=True)
             
             # 正向检查：如果"我"的链接存在，说明已登录
             try:
@@ -95,45 +176,75 @@ class XiaohongshuLogin:
                 pass
                 
         except Exception as e:
-            logger.debug(f"登录状态 DOM 检查失败: {e}")
+            logger.debug("登录状态 DOM 检查失败: {}", e)
         return False
 
-    async def open_login_modal(self) -> bool:
-        """导航到探索页，打开登录弹窗，如果已登录则返回 False"""
+    async def ensure_login_state(
+        self, timeout: int = LOGIN_STATE_TIMEOUT, qr_timeout: int = QR_RENDER_TIMEOUT
+    ) -> LoginState:
+        """
+        一次导航 + 一次页面内探测，得到当前登录状态
+
+        未登录时会点击"登录"按钮打开弹窗，并在二维码出现时一并返回其地址。
+        
+        Args:
+            timeout: 等待用户链接或登录按钮出现的超时时间（秒），默认与原先点击登录按钮的 8 秒上限一致
+            qr_timeout: 点击登录按钮后等待二维码渲染的超时时间（秒），默认 90 秒
+        
+        Returns:
+            LoginState：LOGGED_IN / MODAL_OPEN（附带 qrcode_url）/ FAILED
+        """
         if not self.page_controller:
             await self.initialize()
-        await self.page_controller.navigate(self.XHS_URL, wait_until="domcontentloaded")
-        if await self.is_logged_in(navigate=False):
-            logger.info("已登录，跳过打开登录弹窗")
-            return False
-        # 点击"登录"按钮，触发弹窗
         try:
-            await self.page_controller.click_element(self.LOGIN_BUTTON_XPATH, timeout=8000)
-            logger.info("已点击登录按钮，等待弹窗与二维码")
+            await self._navigate_to_explore()
+            result = await asyncio.wait_for(
+                self.page_controller.page.evaluate(
+                    _LOGIN_STATE_JS,
+                    {
+                        "userXpath": self.USER_LINK_XPATH,
+                        "qrCss": self.QR_CSS,
+                        "qrXpath": self.QR_XPATH,
+                        "loginButtonXpath": self.LOGIN_BUTTON_XPATH,
+                        "timeoutMs": int(timeout * 1000),
+                        "qrTimeoutMs": int(qr_timeout * 1000),
+                    },
+                ),
+                timeout=timeout + qr_timeout + _IN_PAGE_TIMEOUT_MARGIN,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("等待登录状态超时（{}秒）", timeout + qr_timeout)
+            return LoginState(LoginStateKind.FAILED, message=f"超时（{timeout + qr_timeout}秒）")
         except Exception as e:
-            logger.warning(f"未找到或无法点击登录按钮: {e}")
+            logger.warning("探测登录状态失败: {}", e)
+            return LoginState(LoginStateKind.FAILED, message=str(e))
+
+        if result.get("type") == "timeout":
+            if result.get("phase") == "qr":
+                logger.warning("等待二维码渲染超时（{}秒）", qr_timeout)
+                return LoginState(LoginStateKind.FAILED, message=f"二维码加载超时（{qr_timeout}秒）")
+            logger.warning("等待登录状态超时（{}秒）", timeout)
+            return LoginState(LoginStateKind.FAILED, message=f"超时（{timeout}秒）")
+        if result.get("type") == "logged_in":
+            logger.info("检测到用户链接元素，判断为已登录")
+            return LoginState(LoginStateKind.LOGGED_IN, message="用户已登录")
+        logger.info("登录弹窗已打开，二维码已获取")
+        return LoginState(LoginStateKind.MODAL_OPEN, qrcode_url=result.get("qr"), message="请扫描二维码登录")
+
+    async def open_login_modal(self) -> bool:
+        """导航到探索页，打开登录弹窗，如果已登录则返回 False"""
+        state = await self.ensure_login_state()
+        if state.logged_in:
+            logger.info("已登录，跳过打开登录弹窗")
+            return False
         return True
 
     async def get_qrcode(self) -> Optional[str]:
         """确保弹窗打开并返回二维码图片 URL；如果已登录返回 None"""
-        if not self.page_controller:
-            await self.initialize()
-        opened = await self.open_login_modal()
-        if not opened and await self.is_logged_in(navigate=False):
-            return None
-        # 等待二维码元素出现
-        try:
-            if await self.page_controller.has_element(self.QR_CSS, timeout=90000):
-                src = await self.page_controller.get_attribute(self.QR_CSS, "src")
-            else:
-                src = await self.page_controller.get_attribute(self.QR_XPATH, "src")
-            if src:
-                logger.info("二维码已获取")
-                return src
-        except Exception as e:
-            logger.error(f"二维码元素未找到或获取失败: {e}")
-            return None
-        return None
+        state = await self.ensure_login_state()
+        if state.kind is LoginStateKind.FAILED:
+            logger.error("二维码元素未找到或获取失败: {}", state.message)
+        return state.qrcode_url
 
     async def wait_for_login(self, timeout: int = 90) -> Tuple[bool, str, bool]:
         """
@@ -160,7 +271,7 @@ class XiaohongshuLogin:
             logger.info("✅ 登录成功，已保存 cookies")
             return True, "登录成功", cookies_saved
         except PlaywrightTimeoutError:
-            logger.warning(f"等待登录超时（{timeout}秒）")
+            logger.warning("等待登录超时（{}秒）", timeout)
             return False, f"超时（{timeout}秒）", False
 
     async def login(self, headless: bool = False, timeout: int = 90, fresh: bool = True) -> Tuple[bool, str, bool]:
@@ -178,35 +289,34 @@ class XiaohongshuLogin:
             # fresh 模式：清空 cookies（文件和上下文）
             if fresh:
                 try:
-                    self.cookie_storage.clear_cookies()
-                    page = await self.browser_manager.get_page()
-                    await page.context.clear_cookies()
+                    await self.clear_login_cookies()
                     logger.info("已清空 cookies，开始干净的登录流程")
                 except Exception as ce:
-                    logger.warning(f"清空 cookies 失败: {ce}")
-            # 导航后通过 DOM 检查当前是否已登录
-            if await self.is_logged_in(navigate=True):
+                    logger.warning("清空 cookies 失败: {}", ce)
+            # 导航后通过 DOM 检查当前是否已登录；清空过 cookies 时必须重新加载页面
+            await self._navigate_to_explore(force=fresh)
+            state = await self.ensure_login_state()
+            if state.logged_in:
                 ok = await self.browser_manager.save_cookies()
                 return True, "用户已登录", ok
-            # 打开登录弹窗并阻塞等待登录完成
-            await self.open_login_modal()
+            if state.kind is LoginStateKind.FAILED:
+                # 既未登录也没能打开登录弹窗，继续等待扫码没有意义
+                return False, f"打开登录弹窗失败: {state.message}", False
+            # 登录弹窗已打开，阻塞等待登录完成
             success, message, saved = await self.wait_for_login(timeout=timeout)
             return success, message, saved
         except Exception as e:
-            logger.error(f"登录流程失败: {e}")
+            logger.error("登录流程失败: {}", e)
             return False, f"登录失败: {e}", False
 
     async def logout(self) -> bool:
         """清除本地与浏览器中的 Cookie"""
         try:
-            ok = self.cookie_storage.clear_cookies()
-            if self.browser_manager.is_started():
-                page = await self.browser_manager.get_page()
-                await page.context.clear_cookies()
+            ok = await self.clear_login_cookies()
             logger.info("已清除 cookies")
             return ok
         except Exception as e:
-            logger.error(f"登出失败: {e}")
+            logger.error("登出失败: {}", e)
             return False
 
     async def save_cookies(self) -> bool:
@@ -220,5 +330,5 @@ class XiaohongshuLogin:
                 logger.warning("浏览器未启动，无法保存 cookies")
                 return False
         except Exception as e:
-            logger.error(f"保存 cookies 失败: {e}")
+            logger.error("保存 cookies 失败: {}", e)
             return False
\ No newline at end of file
@@ -5,9 +5,11 @@
 - 浏览器实例管理
 - Cookie 持久化
 - 页面操作封装
+- 页面池复用
 """
 
 from .browser_manager import BrowserManager
 from .page_controller import PageController
+from .page_pool import PagePool
 
-__all__ = ["BrowserManager", "PageController"]
\ No newline at end of file
+__all__ = ["BrowserManager", "PageController", "PagePool"]
\ No newline at end of file
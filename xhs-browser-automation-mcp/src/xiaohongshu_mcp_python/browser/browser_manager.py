@@ -13,6 +13,7 @@ from playwright_stealth import Stealth
 from loguru import logger
 
 from ..storage.cookie_storage import CookieStorage
+from .page_pool import PagePool
 
 
 class BrowserManager:
@@ -53,6 +54,7 @@ class BrowserManager:
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
+        self._page_pool: Optional[PagePool] = None
     
     def is_started(self) -> bool:
         """检查浏览器是否已启动"""
@@ -175,6 +177,9 @@ class BrowserManager:
         if save_cookies:
             await self._save_cookies()
         
+        if self._page_pool:
+            await self._page_pool.close()
+        
         if self._page:
             await self._page.close()
             self._page = None
@@ -209,6 +214,14 @@ class BrowserManager:
         await self._apply_stealth(page)
         return page
     
+    @property
+    def page_pool(self) -> PagePool:
+        """页面池，复用预热页面执行导航类操作"""
+        if self._page_pool is None:
+            from ..config import BrowserConfig
+            self._page_pool = PagePool(self, pool_size=BrowserConfig.PAGE_POOL_SIZE)
+        return self._page_pool
+    
     async def load_cookies(self) -> None:
         """加载 cookies（公共方法）"""
         await self._load_cookies()
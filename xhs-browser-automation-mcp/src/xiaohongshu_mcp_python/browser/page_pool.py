@@ -0,0 +1,134 @@
+"""
+页面池
+
+复用一组已应用反检测脚本的预热页面，避免每次导航都新建页面（CDP Target.createTarget 往返 + 初始化）。
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Optional, Set
+
+from playwright.async_api import BrowserContext, Page
+from loguru import logger
+
+if TYPE_CHECKING:
+    from .browser_manager import BrowserManager
+
+
+class PagePool:
+    """页面池"""
+
+    def __init__(self, browser_manager: "BrowserManager", pool_size: int = 5):
+        """
+        初始化页面池
+
+        Args:
+            browser_manager: 浏览器管理器，用于创建新页面
+            pool_size: 池中最多同时存在的页面数
+        """
+        self.browser_manager = browser_manager
+        self.pool_size = pool_size
+
+        # id(page) -> page
+        self.pages: Dict[int, Page] = {}
+        self._busy: Set[int] = set()
+        self._semaphore = asyncio.Semaphore(pool_size)
+        self._lock = asyncio.Lock()
+        # 页面所属的浏览器上下文，浏览器重启后池中页面全部失效
+        self._context: Optional[BrowserContext] = None
+
+    def _drop_stale_pages(self) -> None:
+        """浏览器重启或页面被关闭后，移除失效的页面"""
+        context = self.browser_manager._context
+        if context is not self._context:
+            self.pages.clear()
+            self._busy.clear()
+            self._context = context
+            return
+
+        for key, page in list(self.pages.items()):
+            if page.is_closed():
+                self.pages.pop(key, None)
+                self._busy.discard(key)
+
+    async def _take_page(self) -> Page:
+        """取出一个空闲页面，没有则新建"""
+        # 必须在加锁前确保浏览器可用：浏览器断开时会重启，stop() 里会调用 close()
+        await self.browser_manager.ensure_started()
+        async with self._lock:
+            self._drop_stale_pages()
+
+            for key, page in self.pages.items():
+                if key not in self._busy:
+                    self._busy.add(key)
+                    return page
+
+            page = await self.browser_manager.new_page()
+            key = id(page)
+            self.pages[key] = page
+            self._busy.add(key)
+            logger.debug("页面池新建页面，当前共 {} 个", len(self.pages))
+            return page
+
+    async def release(self, page: Page) -> None:
+        """
+        归还页面
+
+        归还时导航到 about:blank，清理页面状态并停止页面上的脚本和请求，
+        下次取出时可直接使用。
+
+        Args:
+            page: 要归还的页面
+        """
+        key = id(page)
+        if key not in self.pages:
+            return
+
+        try:
+            if not page.is_closed():
+                await page.goto("about:blank")
+        except Exception as e:
+            logger.warning("重置池中页面失败，丢弃该页面: {}", e)
+            self.pages.pop(key, None)
+            try:
+                await page.close()
+            except Exception:
+                pass
+        finally:
+            self._busy.discard(key)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Page]:
+        """
+        获取一个页面，退出上下文时自动归还
+
+        池中页面都在使用时等待，直到有页面被归还。
+
+        Yields:
+            Playwright 页面实例
+        """
+        async with self._semaphore:
+            page = await self._take_page()
+            try:
+                yield page
+            finally:
+                await self.release(page)
+
+    async def close(self) -> None:
+        """
+        关闭池中所有页面
+
+        不获取 _lock：浏览器重启时由 BrowserManager.stop() 调用，此时可能有协程正持有锁等待新建页面。
+        下面的状态清理中间没有 await，不会与 _take_page 交错。
+        """
+        pages = list(self.pages.values())
+        self.pages.clear()
+        self._busy.clear()
+        self._context = None
+
+        for page in pages:
+            try:
+                if not page.is_closed():
+                    await page.close()
+            except Exception as e:
+                logger.debug("关闭池中页面失败: {}", e)
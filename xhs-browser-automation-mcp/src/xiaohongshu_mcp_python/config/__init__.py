@@ -3,54 +3,60 @@
 包含配置文件、设置和类型定义
 """
 
-from .config import (
-    XiaohongshuUrls,
-    XiaohongshuSelectors,
-    BrowserConfig,
-    PublishConfig,
-    StorageConfig,
-    ApiConfig,
-)
-from .xhs_xpath import XHSXPath
-from .settings import settings, Settings
-from .types import (
-    # HTTP API 响应类型
-    ErrorResponse,
-    SuccessResponse,
-    # MCP 工具结果类型
-    MCPContent,
-    MCPToolResult,
-    # 小红书数据结构
-    User,
-    Feed,
-    Comment,
-    # 数据结构组件
-    InteractInfo,
-    Cover,
-    ImageInfo,
-    DetailImageInfo,
-    Video,
-    VideoCapability,
-    NoteCard,
-    # 发布相关
-    PublishImageContent,
-    PublishVideoContent,
-    PublishResponse,
-    # 搜索相关
-    SearchResult,
-    # 推荐相关
-    FeedsListResponse,
-    FeedData,
-    FeedDetailResponse,
-    FeedDetail,
-    FeedDetailData,
-    CommentList,
-    # 用户相关
-    UserProfileResponse,
-    UserPageData,
-    UserBasicInfo,
-    UserInteractions,
-)
+import importlib
+
+# 名称 -> 所在子模块；按需导入（PEP 562），避免仅需 XHSXPath 等常量的调用方
+# 在导入时就加载 dotenv / pydantic
+_LAZY_IMPORTS = {
+    # 配置类
+    "XiaohongshuUrls": ".config",
+    "XiaohongshuSelectors": ".config",
+    "BrowserConfig": ".config",
+    "PublishConfig": ".config",
+    "StorageConfig": ".config",
+    "ApiConfig": ".config",
+    "XHSXPath": ".xhs_xpath",
+    # 设置
+    "settings": ".settings",
+    "Settings": ".settings",
+}
+_LAZY_IMPORTS.update(dict.fromkeys(
+    (
+        # HTTP API 响应类型
+        "ErrorResponse", "SuccessResponse",
+        # MCP 工具结果类型
+        "MCPContent", "MCPToolResult",
+        # 小红书数据结构
+        "User", "Feed", "Comment",
+        # 数据结构组件
+        "InteractInfo", "Cover", "ImageInfo", "DetailImageInfo", "Video",
+        "VideoCapability", "NoteCard",
+        # 发布相关
+        "PublishImageContent", "PublishVideoContent", "PublishResponse",
+        # 搜索相关
+        "SearchResult",
+        # 推荐相关
+        "FeedsListResponse", "FeedData", "FeedDetailResponse", "FeedDetail",
+        "FeedDetailData", "CommentList",
+        # 用户相关
+        "UserProfileResponse", "UserPageData", "UserBasicInfo", "UserInteractions",
+    ),
+    ".types",
+))
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     # 配置类
@@ -110,6 +110,9 @@ class BrowserConfig:
     VIEWPORT_WIDTH = 1920
     VIEWPORT_HEIGHT = 1080
     
+    # 页面池大小（并发导航时最多同时存在的预热页面数）
+    PAGE_POOL_SIZE = 5
+    
     # 浏览器启动参数 - 仅保留基本功能参数
     BROWSER_ARGS = [
         "--no-first-run",
@@ -137,7 +140,7 @@ class PublishConfig:
     IMAGE_MAX_COUNT = 9
     
     # 支持的图片格式
-    SUPPORTED_IMAGE_FORMATS = [".jpg", ".jpeg", ".png", ".webp", ".gif"]
+    SUPPORTED_IMAGE_FORMATS = frozenset({".jpg", ".jpeg", ".png", ".webp", ".gif"})
     
     # 支持的视频格式
     SUPPORTED_VIDEO_FORMATS = [".mp4", ".mov", ".avi", ".mkv"]
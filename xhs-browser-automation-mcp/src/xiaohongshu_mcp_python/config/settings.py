@@ -6,15 +6,20 @@
 import os
 from pathlib import Path
 from typing import Literal
-from dotenv import load_dotenv
 
-# 加载 .env 文件
-# 注意：这里不能使用 get_project_root()，因为函数定义在后面
-# 所以先使用相对路径，如果 get_project_root() 可用则使用它
-_temp_root = Path(__file__).parent.parent.parent.parent
-env_path = _temp_root / ".env"
-if env_path.exists():
-    load_dotenv(env_path)
+
+def _load_env() -> None:
+    """加载 .env 文件（只在模块导入时调用一次，dotenv 按需导入）"""
+    # 注意：这里不能使用 get_project_root()，因为函数定义在后面
+    # 所以先使用相对路径
+    env_path = Path(__file__).parent.parent.parent.parent / ".env"
+    if env_path.exists():
+        from dotenv import load_dotenv
+        load_dotenv(env_path)
+
+
+# Settings 的类属性在定义时读取环境变量，需先加载 .env
+_load_env()
 
 
 # 环境类型
@@ -215,15 +215,10 @@ class XiaohongshuService:
             动态列表响应
         """
         try:
-            page = await self.browser_manager.get_page()
-            if not page:
-                return FeedsListResponse(
-                    success=False,
-                    error="无法获取浏览器页面"
-                )
-            
-            feeds_action = FeedsAction(page)
-            result = await feeds_action.get_feeds(cursor_score)
+            # 从页面池取预热页面执行导航，避免每次新建页面
+            async with self.browser_manager.page_pool.acquire() as page:
+                feeds_action = FeedsAction(page)
+                result = await feeds_action.get_feeds(cursor_score)
             
             return result
             
@@ -335,35 +330,12 @@ class XiaohongshuService:
             用户资料响应
         """
         try:
-            page = await self.browser_manager.get_page()
-            if not page:
-                # 返回默认的空数据结构，避免data=None导致的验证错误
-                return UserProfileResponse(
-                    success=False,
-                    code=500,
-                    msg="无法获取浏览器页面",
-                    data=UserPageData(
-                        basic_info=UserBasicInfo(
-                            user_id=user_id,
-                            nickname="",
-                            avatar="",
-                            desc="",
-                            gender=0,
-                            ip_location="",
-                            red_id=""
-                        ),
-                        interactions=UserInteractions(
-                            follows="0",
-                            fans="0",
-                            interaction="0"
-                        )
-                    )
-                )
-            
             # 使用新的 UserProfileAction 来获取用户资料
             from ..actions.user import UserProfileAction
-            user_profile_action = UserProfileAction(page)
-            return await user_profile_action.user_profile(user_id, xsec_token)
+            # 从页面池取预热页面执行导航，避免每次新建页面
+            async with self.browser_manager.page_pool.acquire() as page:
+                user_profile_action = UserProfileAction(page)
+                return await user_profile_action.user_profile(user_id, xsec_token)
             
         except Exception as e:
             logger.error(f"获取用户资料失败: {e}")
@@ -408,17 +380,10 @@ class XiaohongshuService:
             动态详情响应
         """
         try:
-            page = await self.browser_manager.get_page()
-            if not page:
-                return FeedDetailResponse(
-                    success=False,
-                    code=500,
-                    msg="无法获取浏览器页面",
-                    data=None
-                )
-            
-            feeds_action = FeedsAction(page)
-            return await feeds_action.get_feed_detail(note_id, xsec_token)
+            # 从页面池取预热页面执行导航，避免每次新建页面
+            async with self.browser_manager.page_pool.acquire() as page:
+                feeds_action = FeedsAction(page)
+                return await feeds_action.get_feed_detail(note_id, xsec_token)
             
         except Exception as e:
             logger.error(f"获取动态详情失败: {e}")
@@ -5,10 +5,255 @@
 
 import asyncio
 import random
-from typing import Optional
+from typing import Any, Dict, Final, Optional
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 from loguru import logger
 
+try:
+    # 页面状态常达数百KB到数MB，orjson 解析明显快于标准库
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+
+# 页面内执行的提取脚本，模块加载时构建一次，避免每次调用重新创建大字符串
+
+# 使用与search.py相同的方法提取 __INITIAL_STATE__ 数据
+_INITIAL_STATE_JS: Final[str] = """
+() => {
+    if (window.__INITIAL_STATE__) {
+        // 安全地序列化，避免循环引用
+        try {
+            return JSON.stringify(window.__INITIAL_STATE__, (key, value) => {
+                // 跳过可能导致循环引用的属性
+                if (key === 'dep' || key === 'computed' || typeof value === 'function') {
+                    return undefined;
+                }
+                return value;
+            });
+        } catch (e) {
+            console.log('JSON序列化失败，尝试提取关键部分:', e.message);
+            // 如果还是有问题，尝试提取我们需要的部分
+            const state = window.__INITIAL_STATE__;
+            const result = {};
+
+            // 提取用户相关数据
+            if (state.user) {
+                result.user = {};
+                if (state.user.userPageData) {
+                    result.user.userPageData = state.user.userPageData;
+                }
+                if (state.user.notes) {
+                    result.user.notes = {};
+                    if (state.user.notes._rawValue) {
+                        result.user.notes._rawValue = state.user.notes._rawValue;
+                    }
+                }
+            }
+
+            // 提取笔记相关数据
+            if (state.note) {
+                result.note = state.note;
+            }
+
+            // 提取评论数据
+            if (state.comments) {
+                result.comments = state.comments;
+            }
+
+            // 提取feed数据
+            if (state.feed) {
+                result.feed = state.feed;
+            }
+
+            // 提取搜索相关数据
+            if (state.Main && state.Main.feedData) {
+                result.Main = {
+                    feedData: state.Main.feedData
+                };
+            }
+
+            try {
+                return JSON.stringify(result);
+            } catch (e2) {
+                console.log('备用方案也失败:', e2.message);
+                return "{}";
+            }
+        }
+    }
+    return "";
+}
+"""
+
+# 提取并清理 Vue 响应式数据的 JavaScript 代码
+_FEED_DETAIL_JS: Final[str] = """
+() => {
+    if (!window.__INITIAL_STATE__) {
+        return "";
+    }
+
+    // 需要跳过的 Vue 内部属性
+    const vueInternalKeys = new Set([
+        '__v_isRef', '__v_isReactive', '__v_isReadonly',
+        '__v_raw', 'dep', 'computed', '_shallow', '_dirty',
+        'effect', 'deps', 'activeEffect', 'targetMap'
+    ]);
+
+    // 去除 Vue 响应式包装（显式栈迭代，按深度优先先序处理，避免深层状态导致栈溢出）
+    function unwrapVueReactive(root) {
+        const visited = new Set();
+        const holder = {};
+        // 每项为 [原始值, 结果容器, 在容器中的 key]
+        const stack = [[root, holder, 'value']];
+
+        while (stack.length) {
+            const [src, parent, parentKey] = stack.pop();
+            try {
+                let obj = src;
+                let value;
+                for (;;) {
+                    // 处理 null、undefined 和基本类型
+                    if (obj === null || obj === undefined || typeof obj !== 'object') {
+                        value = obj;
+                        break;
+                    }
+                    // 处理循环引用
+                    if (visited.has(obj)) {
+                        value = null;
+                        break;
+                    }
+                    visited.add(obj);
+                    // 处理数组：子元素逆序入栈，保证按原顺序出栈
+                    if (Array.isArray(obj)) {
+                        value = new Array(obj.length);
+                        for (let i = obj.length - 1; i >= 0; i--) {
+                            stack.push([obj[i], value, i]);
+                        }
+                        break;
+                    }
+                    // 处理 Vue 响应式对象
+                    // Vue 3 使用 _rawValue, Vue 2 可能使用 _value
+                    if (obj._rawValue !== undefined) {
+                        obj = obj._rawValue;
+                        continue;
+                    }
+                    if (obj._value !== undefined && typeof obj._value === 'object') {
+                        obj = obj._value;
+                        continue;
+                    }
+                    // 构建清理后的对象：先按原顺序占位 key，子值逆序入栈
+                    value = {};
+                    const children = [];
+                    for (const key in obj) {
+                        // 跳过 Vue 内部属性
+                        if (vueInternalKeys.has(key)) {
+                            continue;
+                        }
+                        // 跳过以 _ 开头的 Vue 内部属性（除了我们需要的）
+                        if (key.startsWith('__') && key !== '__INITIAL_STATE__') {
+                            continue;
+                        }
+                        const child = obj[key];
+                        // 跳过函数
+                        if (typeof child === 'function') {
+                            continue;
+                        }
+                        value[key] = undefined;
+                        children.push([child, value, key]);
+                    }
+                    for (let i = children.length - 1; i >= 0; i--) {
+                        stack.push(children[i]);
+                    }
+                    break;
+                }
+                parent[parentKey] = value;
+            } catch (e) {
+                // 如果处理失败，跳过该属性
+                continue;
+            }
+        }
+
+        return holder.value;
+    }
+
+    try {
+        // 提取并清理状态数据
+        const state = window.__INITIAL_STATE__;
+        const cleanedState = unwrapVueReactive(state);
+
+        // 序列化为 JSON
+        return JSON.stringify(cleanedState, (key, value) => {
+            // 再次过滤函数和 Vue 内部属性
+            if (typeof value === 'function') {
+                return undefined;
+            }
+            if (key && (key.startsWith('__v_') || key === 'dep' || key === 'computed')) {
+                return undefined;
+            }
+            return value;
+        });
+    } catch (e) {
+        console.error('提取笔记详情状态失败:', e);
+        // 如果失败，尝试提取核心部分
+        try {
+            const state = window.__INITIAL_STATE__;
+            const coreData = {
+                global: state.global,
+                user: state.user,
+                note: state.note,
+                board: state.board,
+                login: state.login,
+                feed: state.feed,
+                layout: state.layout,
+                search: state.search,
+                notification: state.notification,
+                redMoji: state.redMoji
+            };
+
+            // 清理核心数据
+            const cleanedCore = unwrapVueReactive(coreData);
+            return JSON.stringify(cleanedCore);
+        } catch (e2) {
+            console.error('备用提取方案也失败:', e2);
+            return "{}";
+        }
+    }
+}
+"""
+
+# 在页面内等待 __INITIAL_STATE__ 就绪后调用提取函数（一次 CDP 往返）。提取函数只存在于本次调用的闭包中，
+# 不在页面上注册任何全局变量（页面可见的全局变量会成为自动化特征）；等待超时返回 false（与"没有数据"的空字符串区分开）
+_WAIT_AND_EXTRACT_TEMPLATE: Final[str] = """
+async (timeout) => {
+    const extract = (__EXTRACTOR__);
+    const deadline = Date.now() + timeout;
+    while (window.__INITIAL_STATE__ === undefined && Date.now() < deadline) {
+        await new Promise((resolve) => setTimeout(resolve, 50));
+    }
+    if (window.__INITIAL_STATE__ === undefined) {
+        return false;
+    }
+    return extract();
+}
+"""
+
+_WAIT_AND_EXTRACT_INITIAL_STATE_JS: Final[str] = _WAIT_AND_EXTRACT_TEMPLATE.replace("__EXTRACTOR__", _INITIAL_STATE_JS.strip())
+_WAIT_AND_EXTRACT_FEED_DETAIL_JS: Final[str] = _WAIT_AND_EXTRACT_TEMPLATE.replace("__EXTRACTOR__", _FEED_DETAIL_JS.strip())
+
+# 分步滚动：每步之前随机停顿 0.5~1.5 秒，滚动后停留 0.3 秒，最后滚动到底部
+_NATURAL_SCROLL_JS: Final[str] = """
+async (steps) => {
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+    const scrollStep = Math.floor(document.body.scrollHeight / (steps + 1));
+    for (let i = 0; i < steps; i++) {
+        await sleep(500 + Math.random() * 1000);
+        window.scrollTo(0, scrollStep * (i + 1));
+        await sleep(300);
+    }
+    window.scrollTo(0, document.body.scrollHeight);
+}
+"""
+
 
 class AntiBotStrategy:
     """反爬虫策略工具类"""
@@ -23,13 +268,14 @@ class AntiBotStrategy:
             max_extra: 最大额外延迟时间（秒）
             seed: 用于生成随机数的种子
         """
-        if seed:
-            extra_delay = hash(seed) % max_extra
-        else:
-            extra_delay = random.randint(0, max_extra - 1)
+        # 同一 seed 在不同进程间得到相同的延迟（内置 hash 受 PYTHONHASHSEED 影响，不可复现）
+        rng = random.Random(seed) if seed else random
+        extra_delay = rng.randrange(max_extra)
         
         delay = base_delay + extra_delay
-        logger.debug(f"添加随机延迟: {delay}秒")
+        if delay <= 0:
+            return
+        logger.debug("添加随机延迟: {}秒", delay)
         await asyncio.sleep(delay)
     
     @staticmethod
@@ -42,7 +288,7 @@ class AntiBotStrategy:
             url: 目标URL
             timeout: 超时时间（毫秒）
         """
-        logger.debug(f"模拟人类导航到: {url}")
+        logger.debug("模拟人类导航到: {}", url)
         
         # 使用更自然的等待策略
         await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
@@ -87,28 +333,14 @@ class AntiBotStrategy:
             page: Playwright页面对象
             scroll_count: 滚动步数
         """
-        logger.debug(f"模拟自然滚动，步数: {scroll_count}")
+        logger.debug("模拟自然滚动，步数: {}", scroll_count)
         
         try:
-            current_height = await page.evaluate("document.body.scrollHeight")
-            scroll_step = current_height // (scroll_count + 1)
-            
-            for i in range(scroll_count):
-                # 添加随机延迟
-                await asyncio.sleep(0.5 + random.random())
-                
-                # 滚动到指定位置
-                scroll_position = scroll_step * (i + 1)
-                await page.evaluate(f"window.scrollTo(0, {scroll_position})")
-                
-                # 短暂停留
-                await asyncio.sleep(0.3)
-            
-            # 最后滚动到底部
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            # 整个滚动过程在页面内一次完成，避免每一步都进行一次 CDP 往返
+            await page.evaluate(_NATURAL_SCROLL_JS, scroll_count)
             
         except Exception as e:
-            logger.warning(f"模拟自然滚动失败: {e}")
+            logger.warning("模拟自然滚动失败: {}", e)
     
     @staticmethod
     async def wait_for_page_stable(page: Page, timeout: int = 10000) -> None:
@@ -124,6 +356,20 @@ class AntiBotStrategy:
         except PlaywrightTimeoutError:
             logger.warning("等待页面稳定超时，继续执行")
     
+    @staticmethod
+    async def _run_extractor(page: Page, script: str, timeout: int = 30000) -> str:
+        """
+        在页面内等待__INITIAL_STATE__加载完成后执行提取脚本
+        
+        Raises:
+            PlaywrightTimeoutError: 超时后__INITIAL_STATE__仍未加载（页面未就绪，调用方可重试）
+        """
+        result = await page.evaluate(script, timeout)
+        if result is False:
+            logger.warning("等待__INITIAL_STATE__超时（{}ms），页面数据未就绪", timeout)
+            raise PlaywrightTimeoutError(f"等待__INITIAL_STATE__超时（{timeout}ms）")
+        return result
+    
     @staticmethod
     async def extract_initial_state_safely(page: Page) -> str:
         """
@@ -137,77 +383,8 @@ class AntiBotStrategy:
         """
         logger.debug("安全提取__INITIAL_STATE__数据")
         
-        # 等待__INITIAL_STATE__加载完成
-        await page.wait_for_function("() => window.__INITIAL_STATE__ !== undefined", timeout=30000)
-        
-        # 使用与search.py相同的方法提取数据
-        initial_state_js = """
-        () => {
-            if (window.__INITIAL_STATE__) {
-                // 安全地序列化，避免循环引用
-                try {
-                    return JSON.stringify(window.__INITIAL_STATE__, (key, value) => {
-                        // 跳过可能导致循环引用的属性
-                        if (key === 'dep' || key === 'computed' || typeof value === 'function') {
-                            return undefined;
-                        }
-                        return value;
-                    });
-                } catch (e) {
-                    console.log('JSON序列化失败，尝试提取关键部分:', e.message);
-                    // 如果还是有问题，尝试提取我们需要的部分
-                    const state = window.__INITIAL_STATE__;
-                    const result = {};
-                    
-                    // 提取用户相关数据
-                    if (state.user) {
-                        result.user = {};
-                        if (state.user.userPageData) {
-                            result.user.userPageData = state.user.userPageData;
-                        }
-                        if (state.user.notes) {
-                            result.user.notes = {};
-                            if (state.user.notes._rawValue) {
-                                result.user.notes._rawValue = state.user.notes._rawValue;
-                            }
-                        }
-                    }
-                    
-                    // 提取笔记相关数据
-                    if (state.note) {
-                        result.note = state.note;
-                    }
-                    
-                    // 提取评论数据
-                    if (state.comments) {
-                        result.comments = state.comments;
-                    }
-                    
-                    // 提取feed数据
-                    if (state.feed) {
-                        result.feed = state.feed;
-                    }
-                    
-                    // 提取搜索相关数据
-                    if (state.Main && state.Main.feedData) {
-                        result.Main = {
-                            feedData: state.Main.feedData
-                        };
-                    }
-                    
-                    try {
-                        return JSON.stringify(result);
-                    } catch (e2) {
-                        console.log('备用方案也失败:', e2.message);
-                        return "{}";
-                    }
-                }
-            }
-            return "";
-        }
-        """
-        
-        result = await page.evaluate(initial_state_js)
+        # 等待__INITIAL_STATE__加载完成后，使用与search.py相同的方法提取数据
+        result = await AntiBotStrategy._run_extractor(page, _WAIT_AND_EXTRACT_INITIAL_STATE_JS)
         return result
     
     @staticmethod
@@ -224,133 +401,40 @@ class AntiBotStrategy:
         """
         logger.debug("提取笔记详情页状态数据（去除Vue响应式）")
         
-        # 等待__INITIAL_STATE__加载完成
-        await page.wait_for_function("() => window.__INITIAL_STATE__ !== undefined", timeout=30000)
+        # 等待__INITIAL_STATE__加载完成后，提取并清理 Vue 响应式数据
+        result = await AntiBotStrategy._run_extractor(page, _WAIT_AND_EXTRACT_FEED_DETAIL_JS)
+        return result
+    
+    @staticmethod
+    async def extract_initial_state_dict(page: Page) -> Optional[Dict[str, Any]]:
+        """
+        提取__INITIAL_STATE__并解析为字典
         
-        # 提取并清理 Vue 响应式数据的 JavaScript 代码
-        extract_js = """
-        () => {
-            if (!window.__INITIAL_STATE__) {
-                return "";
-            }
-            
-            // 递归函数：去除 Vue 响应式包装
-            function unwrapVueReactive(obj, visited = new WeakSet()) {
-                // 处理 null 和 undefined
-                if (obj === null || obj === undefined) {
-                    return obj;
-                }
-                
-                // 处理循环引用
-                if (visited.has(obj)) {
-                    return null;
-                }
-                
-                // 处理基本类型
-                if (typeof obj !== 'object') {
-                    return obj;
-                }
-                
-                // 处理数组
-                if (Array.isArray(obj)) {
-                    visited.add(obj);
-                    return obj.map(item => unwrapVueReactive(item, visited));
-                }
-                
-                // 处理 Vue 响应式对象
-                // Vue 3 使用 _rawValue, Vue 2 可能使用 _value
-                if (obj._rawValue !== undefined) {
-                    visited.add(obj);
-                    return unwrapVueReactive(obj._rawValue, visited);
-                }
-                if (obj._value !== undefined && typeof obj._value === 'object') {
-                    visited.add(obj);
-                    return unwrapVueReactive(obj._value, visited);
-                }
-                
-                // 跳过 Vue 内部属性
-                const vueInternalKeys = [
-                    '__v_isRef', '__v_isReactive', '__v_isReadonly',
-                    '__v_raw', 'dep', 'computed', '_shallow', '_dirty',
-                    'effect', 'deps', 'activeEffect', 'targetMap'
-                ];
-                
-                // 构建清理后的对象
-                const result = {};
-                visited.add(obj);
-                
-                for (const key in obj) {
-                    // 跳过 Vue 内部属性
-                    if (vueInternalKeys.includes(key)) {
-                        continue;
-                    }
-                    
-                    // 跳过函数
-                    if (typeof obj[key] === 'function') {
-                        continue;
-                    }
-                    
-                    // 跳过以 _ 开头的 Vue 内部属性（除了我们需要的）
-                    if (key.startsWith('__') && key !== '__INITIAL_STATE__') {
-                        continue;
-                    }
-                    
-                    // 递归处理值
-                    try {
-                        result[key] = unwrapVueReactive(obj[key], visited);
-                    } catch (e) {
-                        // 如果处理失败，跳过该属性
-                        continue;
-                    }
-                }
-                
-                return result;
-            }
+        Args:
+            page: Playwright页面对象
             
-            try {
-                // 提取并清理状态数据
-                const state = window.__INITIAL_STATE__;
-                const cleanedState = unwrapVueReactive(state);
-                
-                // 序列化为 JSON
-                return JSON.stringify(cleanedState, (key, value) => {
-                    // 再次过滤函数和 Vue 内部属性
-                    if (typeof value === 'function') {
-                        return undefined;
-                    }
-                    if (key && (key.startsWith('__v_') || key === 'dep' || key === 'computed')) {
-                        return undefined;
-                    }
-                    return value;
-                });
-            } catch (e) {
-                console.error('提取笔记详情状态失败:', e);
-                // 如果失败，尝试提取核心部分
-                try {
-                    const state = window.__INITIAL_STATE__;
-                    const coreData = {
-                        global: state.global,
-                        user: state.user,
-                        note: state.note,
-                        board: state.board,
-                        login: state.login,
-                        feed: state.feed,
-                        layout: state.layout,
-                        search: state.search,
-                        notification: state.notification,
-                        redMoji: state.redMoji
-                    };
-                    
-                    // 清理核心数据
-                    const cleanedCore = unwrapVueReactive(coreData);
-                    return JSON.stringify(cleanedCore);
-                } catch (e2) {
-                    console.error('备用提取方案也失败:', e2);
-                    return "{}";
-                }
-            }
-        }
+        Returns:
+            状态数据字典，未找到数据时返回None
+        
+        Raises:
+            PlaywrightTimeoutError: 等待__INITIAL_STATE__超时
         """
+        result = await AntiBotStrategy.extract_initial_state_safely(page)
+        return _json_loads(result) if result else None
+    
+    @staticmethod
+    async def extract_feed_detail_state_dict(page: Page) -> Optional[Dict[str, Any]]:
+        """
+        提取笔记详情页状态数据（去除Vue响应式）并解析为字典
         
-        result = await page.evaluate(extract_js)
-        return result
\ No newline at end of file
+        Args:
+            page: Playwright页面对象
+            
+        Returns:
+            清理后的状态数据字典，未找到数据时返回None
+        
+        Raises:
+            PlaywrightTimeoutError: 等待__INITIAL_STATE__超时
+        """
+        result = await AntiBotStrategy.extract_feed_detail_state(page)
+        return _json_loads(result) if result else None
@@ -3,14 +3,69 @@
 处理混合的图片URL和本地路径
 """
 
+import asyncio
+import hashlib
+import json
 import os
+import stat
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from loguru import logger
 
 from .image_downloader import ImageDownloader
 from ..config import PublishConfig
 
+try:
+    from PIL import Image as _PIL_Image
+    _HAS_PIL = True
+except ImportError:
+    _PIL_Image = None
+    _HAS_PIL = False
+
+try:
+    import fcntl as _fcntl  # 仅 POSIX 可用，用于多进程间互斥写 URL 索引
+except ImportError:
+    _fcntl = None
+
+
+# 并发验证本地图片时的最大线程数，避免文件描述符耗尽
+_VALIDATE_CONCURRENCY = 16
+
+# 下载目录下持久化 URL→本地路径 映射的索引文件名
+_URL_INDEX_FILENAME = ".url_index.json"
+# 写索引时持有的锁文件名（多进程互斥）
+_URL_INDEX_LOCK_FILENAME = ".url_index.lock"
+# 索引条目的有效期（秒）：同一 URL 的远程图片可能被替换，过期后重新下载
+_URL_INDEX_TTL = 24 * 3600
+# 同一进程内多个 ImageProcessor 实例写索引时互斥
+_url_index_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _cached_validate(path: str, mtime_ns: int, size: int, mode: int, uid: int, gid: int) -> bool:
+    """
+    stat 之后的验证（大小、可读性），以 (路径, mtime, 大小, 权限位, 属主, 属组) 为键缓存
+    
+    文件被修改后 mtime/大小变化，chmod/chown 后权限位/属主变化，缓存自动失效，
+    不会沿用过期的可读性判断。
+    """
+    if size > PublishConfig.MAX_IMAGE_SIZE:
+        logger.warning("图片文件过大 {} bytes: {}", size, path)
+        return False
+    
+    if size == 0:
+        logger.warning("图片文件为空: {}", path)
+        return False
+    
+    if not os.access(path, os.R_OK):
+        logger.warning("图片文件不可读: {}", path)
+        return False
+    
+    return True
+
 
 class ImageProcessor:
     """图片处理器"""
@@ -23,6 +78,121 @@ class ImageProcessor:
             download_dir: 下载目录
         """
         self.downloader = ImageDownloader(download_dir)
+        self._url_index_path = self.downloader.download_dir / _URL_INDEX_FILENAME
+        # URL 哈希 -> {"path": 本地路径, "mtime_ns": 下载时的修改时间, "cached_at": 下载时间戳}，跨运行复用已下载的图片
+        self._url_cache: Dict[str, Dict] = self._load_url_cache()
+    
+    @staticmethod
+    def _url_key(url: str) -> str:
+        """URL 索引键（sha256），避免超长 URL 直接作为 JSON 键"""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+    
+    def _load_url_cache(self) -> Dict[str, Dict]:
+        """从下载目录加载 URL 索引，文件不存在或损坏时返回空索引"""
+        try:
+            with open(self._url_index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning("加载图片URL索引失败，忽略: {}", e)
+            return {}
+    
+    def _save_url_cache(self, updates: Dict[str, Dict]) -> None:
+        """
+        把本批新下载的条目合并进 URL 索引并原子地写回（先写临时文件再 os.replace）
+        
+        写入前在锁内重新读取磁盘上的索引再合并，其它实例或进程同时写入的条目不会被覆盖；
+        顺带丢弃已过期的条目。
+        """
+        lock_path = self._url_index_path.with_name(_URL_INDEX_LOCK_FILENAME)
+        tmp_path = self._url_index_path.with_suffix(f".json.{os.getpid()}.tmp")
+        try:
+            with _url_index_lock, open(lock_path, "a") as lock_file:
+                if _fcntl is not None:
+                    _fcntl.flock(lock_file, _fcntl.LOCK_EX)
+                merged = self._load_url_cache()
+                merged.update(updates)
+                now = time.time()
+                merged = {key: entry for key, entry in merged.items() if not self._is_expired(entry, now)}
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(merged, f, ensure_ascii=False)
+                os.replace(tmp_path, self._url_index_path)
+                # flock 随 lock_file 关闭释放
+            self._url_cache = merged
+        except Exception as e:
+            logger.warning("保存图片URL索引失败: {}", e)
+            self._url_cache.update(updates)
+    
+    @staticmethod
+    def _is_expired(entry: Dict, now: float) -> bool:
+        """条目超过有效期（或缺少下载时间）时视为过期"""
+        try:
+            return now - entry["cached_at"] > _URL_INDEX_TTL
+        except (KeyError, TypeError):
+            return True
+    
+    def _lookup_url_cache(self, url: str) -> Optional[str]:
+        """命中索引、条目未过期且文件未被修改时返回本地路径"""
+        entry = self._url_cache.get(self._url_key(url))
+        if not entry or self._is_expired(entry, time.time()):
+            return None
+        try:
+            if os.stat(entry["path"]).st_mtime_ns == entry.get("mtime_ns"):
+                return entry["path"]
+        except (OSError, KeyError, TypeError):
+            pass
+        return None
+    
+    async def _download_urls(self, urls: List[str]) -> List[str]:
+        """
+        下载URL图片，命中跨运行索引（且未过期）的URL直接复用本地文件，不再访问网络
+        
+        Args:
+            urls: 图片URL列表
+            
+        Returns:
+            按输入顺序排列的成功下载（或命中缓存）的本地路径列表
+        """
+        resolved: Dict[str, Optional[str]] = {}
+        misses = []
+        for url in urls:
+            if url in resolved:
+                continue
+            cached = self._lookup_url_cache(url)
+            if cached:
+                resolved[url] = cached
+            else:
+                resolved[url] = None
+                misses.append(url)
+        
+        if len(misses) < len(resolved):
+            logger.info("图片URL索引命中 {} 个，跳过下载", len(resolved) - len(misses))
+        
+        if misses:
+            results = await asyncio.gather(
+                *(self.downloader.download_image(url) for url in misses),
+                return_exceptions=True,
+            )
+            updates: Dict[str, Dict] = {}
+            for url, result in zip(misses, results):
+                if isinstance(result, Exception):
+                    logger.error("下载图片失败 {}: {}", url, result)
+                    continue
+                if not result:
+                    continue
+                resolved[url] = result
+                try:
+                    mtime_ns = os.stat(result).st_mtime_ns
+                except OSError:
+                    continue
+                updates[self._url_key(url)] = {"path": result, "mtime_ns": mtime_ns, "cached_at": time.time()}
+            # 服务层不会调用 cleanup，每批下载后立即落盘
+            if updates:
+                await asyncio.to_thread(self._save_url_cache, updates)
+        
+        return [path for path in (resolved[url] for url in urls) if path]
     
     async def process_images(self, image_paths: List[str]) -> List[str]:
         """
@@ -37,7 +207,7 @@ class ImageProcessor:
         if not image_paths:
             return []
         
-        logger.info(f"开始处理 {len(image_paths)} 张图片")
+        logger.info("开始处理 {} 张图片", len(image_paths))
         
         # 分离URL和本地路径
         urls = []
@@ -59,38 +229,35 @@ class ImageProcessor:
             else:
                 local_paths.append(path)
         
-        logger.info(f"发现 {len(urls)} 个URL，{len(local_paths)} 个本地路径")
+        logger.info("发现 {} 个URL，{} 个本地路径", len(urls), len(local_paths))
         
         # 下载URL图片
         downloaded_paths = []
         if urls:
-            downloaded_paths = await self.downloader.download_images(urls)
+            downloaded_paths = await self._download_urls(urls)
         
-        # 验证本地图片
-        validated_local_paths = []
-        for path in local_paths:
-            if self._validate_local_image(path):
-                validated_local_paths.append(path)
-            else:
-                logger.warning(f"本地图片无效或不存在: {path}")
+        # 合并结果，在线程池中并发完成存在性、格式和大小验证，不阻塞事件循环
+        all_paths = downloaded_paths + local_paths
+        semaphore = asyncio.Semaphore(_VALIDATE_CONCURRENCY)
         
-        # 合并结果
-        all_paths = downloaded_paths + validated_local_paths
+        async def validate(path: str) -> bool:
+            async with semaphore:
+                return await asyncio.to_thread(self._validate_image_all, path)
         
-        # 验证图片格式和大小
+        results = await asyncio.gather(*(validate(path) for path in all_paths))
         final_paths = []
-        for path in all_paths:
-            if self._validate_image_format(path) and self._validate_image_size(path):
+        for path, ok in zip(all_paths, results):
+            if ok:
                 final_paths.append(path)
             else:
-                logger.warning(f"图片验证失败，跳过: {path}")
+                logger.warning("图片验证失败，跳过: {}", path)
         
-        logger.info(f"图片处理完成，最终得到 {len(final_paths)} 张有效图片")
+        logger.info("图片处理完成，最终得到 {} 张有效图片", len(final_paths))
         return final_paths
     
-    def _validate_local_image(self, path: str) -> bool:
+    def _validate_image_all(self, path: str) -> bool:
         """
-        验证本地图片是否存在且可读
+        验证图片格式、是否存在且可读以及文件大小（只做一次 stat）
         
         Args:
             path: 图片路径
@@ -99,78 +266,26 @@ class ImageProcessor:
             是否有效
         """
         try:
-            file_path = Path(path)
-            
-            # 检查文件是否存在
-            if not file_path.exists():
-                logger.warning(f"图片文件不存在: {path}")
-                return False
-            
-            # 检查是否是文件
-            if not file_path.is_file():
-                logger.warning(f"路径不是文件: {path}")
-                return False
-            
-            # 检查文件是否可读
-            if not os.access(path, os.R_OK):
-                logger.warning(f"图片文件不可读: {path}")
-                return False
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"验证本地图片失败 {path}: {e}")
-            return False
-    
-    def _validate_image_format(self, path: str) -> bool:
-        """
-        验证图片格式是否支持
-        
-        Args:
-            path: 图片路径
-            
-        Returns:
-            是否支持的格式
-        """
-        try:
-            file_path = Path(path)
-            ext = file_path.suffix.lower()
-            
+            ext = Path(path).suffix.lower()
             if ext not in PublishConfig.SUPPORTED_IMAGE_FORMATS:
-                logger.warning(f"不支持的图片格式 {ext}: {path}")
+                logger.warning("不支持的图片格式 {}: {}", ext, path)
                 return False
             
-            return True
-            
-        except Exception as e:
-            logger.error(f"验证图片格式失败 {path}: {e}")
-            return False
-    
-    def _validate_image_size(self, path: str) -> bool:
-        """
-        验证图片文件大小
-        
-        Args:
-            path: 图片路径
-            
-        Returns:
-            文件大小是否符合要求
-        """
-        try:
-            file_size = os.path.getsize(path)
-            
-            if file_size > PublishConfig.MAX_IMAGE_SIZE:
-                logger.warning(f"图片文件过大 {file_size} bytes: {path}")
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                logger.warning("图片文件不存在: {}", path)
                 return False
             
-            if file_size == 0:
-                logger.warning(f"图片文件为空: {path}")
+            if not stat.S_ISREG(st.st_mode):
+                logger.warning("路径不是文件: {}", path)
                 return False
             
-            return True
+            # 未变化的文件复用上次的验证结果
+            return _cached_validate(path, st.st_mtime_ns, st.st_size, st.st_mode, st.st_uid, st.st_gid)
             
         except Exception as e:
-            logger.error(f"验证图片大小失败 {path}: {e}")
+            logger.error("验证图片失败 {}: {}", path, e)
             return False
     
     def _validate_image_content(self, path: str) -> bool:
@@ -183,34 +298,32 @@ class ImageProcessor:
         Returns:
             图片内容是否有效
         """
+        if not _HAS_PIL:
+            logger.warning("PIL库未安装，跳过图片内容验证")
+            return True
+        
         try:
-            from PIL import Image
-            
-            with Image.open(path) as img:
+            with _PIL_Image.open(path) as img:
+                # 尺寸在打开时即从文件头解析，先读取再 verify（verify 后图片不可再用于其它操作）
+                width, height = img.size
+                
                 # 验证图片可以正常打开
                 img.verify()
-                
-                # 重新打开获取尺寸信息（verify后需要重新打开）
-                with Image.open(path) as img2:
-                    width, height = img2.size
-                    
-                    # 检查图片尺寸是否合理
-                    if width < 1 or height < 1:
-                        logger.warning(f"图片尺寸无效 {width}x{height}: {path}")
-                        return False
-                    
-                    # 检查图片尺寸是否过大
-                    if width > 10000 or height > 10000:
-                        logger.warning(f"图片尺寸过大 {width}x{height}: {path}")
-                        return False
             
-            return True
+            # 检查图片尺寸是否合理
+            if width < 1 or height < 1:
+                logger.warning("图片尺寸无效 {}x{}: {}", width, height, path)
+                return False
+            
+            # 检查图片尺寸是否过大
+            if width > 10000 or height > 10000:
+                logger.warning("图片尺寸过大 {}x{}: {}", width, height, path)
+                return False
             
-        except ImportError:
-            logger.warning("PIL库未安装，跳过图片内容验证")
             return True
+            
         except Exception as e:
-            logger.warning(f"图片内容验证失败 {path}: {e}")
+            logger.warning("图片内容验证失败 {}: {}", path, e)
             return False
     
     async def cleanup(self):
@@ -219,4 +332,4 @@ class ImageProcessor:
             await self.downloader.cleanup()
             logger.debug("图片处理器清理完成")
         except Exception as e:
-            logger.error(f"清理图片处理器失败: {e}")
\ No newline at end of file
+            logger.error("清理图片处理器失败: {}", e)
\ No newline at end of file
@@ -3,6 +3,7 @@
 负责日志系统的初始化和配置
 """
 
+import sys
 from pathlib import Path
 from typing import Optional
 from loguru import logger
@@ -26,7 +27,7 @@ def setup_logger(log_level: Optional[str] = None, log_file: Optional[str] = None
     
     # 控制台输出
     logger.add(
-        lambda msg: print(msg, end=""),
+        sys.stderr,
         level=level,
         format=settings.LOG_FORMAT,
         colorize=True,
@@ -56,5 +57,5 @@ def setup_logger(log_level: Optional[str] = None, log_file: Optional[str] = None
             encoding="utf-8",
         )
         
-        logger.info(f"日志已配置为同时输出到文件: {log_file_path}")
+        logger.info("日志已配置为同时输出到文件: {}", log_file_path)
 
@@ -0,0 +1,140 @@
+import json
+import os
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+
+from xiaohongshu_mcp_python.utils import image_processor
+from xiaohongshu_mcp_python.config import PublishConfig
+from xiaohongshu_mcp_python.utils.image_processor import ImageProcessor, _cached_validate
+
+URL = "https://example.com/a.jpg"
+
+
+@pytest.fixture
+def processor(tmp_path):
+    """下载目录为临时目录、下载器被替换为写本地文件的图片处理器"""
+    processor = ImageProcessor(download_dir=str(tmp_path))
+
+    async def download_image(url):
+        path = tmp_path / f"{ImageProcessor._url_key(url)[:8]}.jpg"
+        path.write_bytes(b"image")
+        return str(path)
+
+    processor.downloader.download_image = AsyncMock(side_effect=download_image)
+    return processor
+
+
+def read_index(tmp_path):
+    with open(tmp_path / ".url_index.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.unit
+class TestUrlIndex:
+    """.url_index.json 跨运行 URL 索引测试"""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_download(self, processor, tmp_path):
+        """已下载的 URL 再次处理时直接复用本地文件（新实例从磁盘加载索引）"""
+        [path] = await processor._download_urls([URL])
+
+        again = ImageProcessor(download_dir=str(tmp_path))
+        again.downloader.download_image = AsyncMock()
+        assert await again._download_urls([URL]) == [path]
+        again.downloader.download_image.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_modified_file_redownloads(self, processor):
+        """本地文件被修改（mtime 变化）后重新下载"""
+        await processor._download_urls([URL])
+        entry = processor._url_cache[ImageProcessor._url_key(URL)]
+        entry["mtime_ns"] -= 1
+
+        await processor._download_urls([URL])
+        assert processor.downloader.download_image.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_redownloads(self, processor, tmp_path):
+        """超过有效期的条目视为未命中，并在写回时被清理"""
+        await processor._download_urls([URL])
+        key = ImageProcessor._url_key(URL)
+        processor._url_cache[key]["cached_at"] = time.time() - image_processor._URL_INDEX_TTL - 1
+
+        assert processor._lookup_url_cache(URL) is None
+        await processor._download_urls([URL])
+        assert processor.downloader.download_image.await_count == 2
+        assert read_index(tmp_path)[key]["cached_at"] > time.time() - 60
+
+    @pytest.mark.asyncio
+    async def test_concurrent_instances_merge(self, tmp_path):
+        """两个实例先后写索引时合并磁盘上的条目，不会互相覆盖"""
+        first = ImageProcessor(download_dir=str(tmp_path))
+        second = ImageProcessor(download_dir=str(tmp_path))
+        for processor, name in ((first, "a"), (second, "b")):
+            path = tmp_path / f"{name}.jpg"
+            path.write_bytes(b"image")
+            processor.downloader.download_image = AsyncMock(return_value=str(path))
+
+        await first._download_urls(["https://example.com/a.jpg"])
+        await second._download_urls(["https://example.com/b.jpg"])
+
+        index = read_index(tmp_path)
+        assert ImageProcessor._url_key("https://example.com/a.jpg") in index
+        assert ImageProcessor._url_key("https://example.com/b.jpg") in index
+
+
+@pytest.fixture
+def image(tmp_path):
+    """临时图片文件；前后清空验证缓存"""
+    _cached_validate.cache_clear()
+    path = tmp_path / "a.jpg"
+    path.write_bytes(b"image")
+    yield path
+    _cached_validate.cache_clear()
+
+
+@pytest.mark.unit
+class TestValidateImage:
+    """本地图片验证及其缓存测试"""
+
+    def test_valid_image_cached(self, image):
+        """未变化的文件第二次验证直接命中缓存"""
+        processor = ImageProcessor.__new__(ImageProcessor)
+
+        assert processor._validate_image_all(str(image)) is True
+        assert processor._validate_image_all(str(image)) is True
+        info = _cached_validate.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+    def test_rewritten_file_revalidated(self, image):
+        """文件被改写（mtime / 大小变化）后重新验证，不沿用旧结果"""
+        processor = ImageProcessor.__new__(ImageProcessor)
+        assert processor._validate_image_all(str(image)) is True
+
+        image.write_bytes(b"")
+        assert processor._validate_image_all(str(image)) is False
+
+    def test_permission_change_changes_key(self, image):
+        """chmod 后权限位变化，缓存键随之变化"""
+        st = os.stat(image)
+        _cached_validate(str(image), st.st_mtime_ns, st.st_size, st.st_mode, st.st_uid, st.st_gid)
+
+        os.chmod(image, 0o200)
+        try:
+            st2 = os.stat(image)
+            assert st2.st_mode != st.st_mode
+            _cached_validate(str(image), st2.st_mtime_ns, st2.st_size, st2.st_mode, st2.st_uid, st2.st_gid)
+            assert _cached_validate.cache_info().misses == 2
+        finally:
+            os.chmod(image, 0o644)
+
+    def test_oversized_and_unsupported(self, image, tmp_path):
+        """超过大小上限或格式不支持时验证失败"""
+        processor = ImageProcessor.__new__(ImageProcessor)
+        assert _cached_validate(str(image), 0, PublishConfig.MAX_IMAGE_SIZE + 1, 0, 0, 0) is False
+
+        other = tmp_path / "a.bmp"
+        other.write_bytes(b"image")
+        assert processor._validate_image_all(str(other)) is False
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+
+from xiaohongshu_mcp_python.browser.page_pool import PagePool
+
+
+def make_page():
+    """模拟的页面"""
+    page = MagicMock()
+    page.is_closed.return_value = False
+    page.goto = AsyncMock()
+    page.close = AsyncMock()
+    return page
+
+
+class StubBrowserManager:
+    """最小的浏览器管理器：可模拟浏览器断开后重启"""
+
+    def __init__(self):
+        self._context = object()
+        self._page_pool = None
+        self.connected = True
+        self.created = 0
+
+    async def ensure_started(self):
+        if not self.connected:
+            await self.restart()
+
+    async def restart(self):
+        # 与 BrowserManager.restart 一致：stop() 中关闭页面池，再创建新的上下文
+        if self._page_pool:
+            await self._page_pool.close()
+        self._context = object()
+        self.connected = True
+
+    async def new_page(self):
+        self.created += 1
+        return make_page()
+
+
+@pytest.fixture
+def manager():
+    return StubBrowserManager()
+
+
+@pytest.fixture
+def pool(manager):
+    pool = PagePool(manager, pool_size=2)
+    manager._page_pool = pool
+    return pool
+
+
+@pytest.mark.unit
+class TestPagePool:
+    """页面池测试"""
+
+    @pytest.mark.asyncio
+    async def test_released_page_is_reused(self, pool, manager):
+        """归还的页面被重置后再次取出，不新建页面"""
+        async with pool.acquire() as first:
+            pass
+        first.goto.assert_awaited_with("about:blank")
+
+        async with pool.acquire() as second:
+            assert second is first
+        assert manager.created == 1
+
+    @pytest.mark.asyncio
+    async def test_pool_size_limit(self, pool, manager):
+        """页面都在使用时等待归还，不超过 pool_size"""
+        entered = []
+        release = asyncio.Event()
+
+        async def worker():
+            async with pool.acquire() as page:
+                entered.append(page)
+                await release.wait()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert len(entered) == 2
+        assert manager.created == 2
+
+        release.set()
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+        assert len(entered) == 3
+        assert manager.created == 2
+
+    @pytest.mark.asyncio
+    async def test_restart_does_not_deadlock(self, pool, manager):
+        """浏览器断开后取页面会触发重启（重启中关闭页面池），不会死锁，且旧页面被丢弃"""
+        async with pool.acquire() as old_page:
+            pass
+
+        manager.connected = False
+        async def acquire_once():
+            async with pool.acquire() as page:
+                return page
+
+        new_page = await asyncio.wait_for(acquire_once(), timeout=1)
+
+        assert new_page is not old_page
+        old_page.close.assert_awaited_once()
+        assert manager.created == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_reset_drops_page(self, pool, manager):
+        """归还时重置失败的页面被关闭并移出池"""
+        async with pool.acquire() as page:
+            page.goto.side_effect = RuntimeError("页面崩溃")
+
+        page.close.assert_awaited_once()
+        assert pool.pages == {}
@@ -0,0 +1,169 @@
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from xiaohongshu_mcp_python.auth.login_types import LoginStateKind
+from xiaohongshu_mcp_python.auth.xiaohongshu_login import XiaohongshuLogin
+from xiaohongshu_mcp_python.config.xhs_xpath import XHSXPath
+
+
+@pytest.fixture
+def page():
+    """模拟的页面（已在探索页）"""
+    page = MagicMock()
+    page.url = XHSXPath.XHS_URL
+    page.evaluate = AsyncMock()
+    page.wait_for_selector = AsyncMock()
+    return page
+
+
+@pytest.fixture
+def login(page):
+    """页面控制器已初始化的登录管理器"""
+    browser_manager = MagicMock()
+    browser_manager.is_started.return_value = True
+    browser_manager.get_page = AsyncMock(return_value=page)
+    browser_manager.save_cookies = AsyncMock(return_value=True)
+
+    manager = XiaohongshuLogin(browser_manager, MagicMock())
+    manager.page_controller = MagicMock()
+    manager.page_controller.page = page
+    manager.page_controller.navigate = AsyncMock()
+    manager.page_controller.wait_for_element = AsyncMock()
+    return manager
+
+
+@pytest.mark.unit
+class TestEnsureLoginState:
+    """ensure_login_state 返回值测试"""
+
+    @pytest.mark.asyncio
+    async def test_logged_in(self, login, page):
+        """检测到用户链接时返回 LOGGED_IN"""
+        page.evaluate.return_value = {"type": "logged_in"}
+
+        state = await login.ensure_login_state()
+
+        assert state.kind is LoginStateKind.LOGGED_IN
+        assert state.logged_in
+        assert state.qrcode_url is None
+
+    @pytest.mark.asyncio
+    async def test_modal_open_returns_qrcode(self, login, page):
+        """弹窗打开时返回 MODAL_OPEN 并附带二维码地址"""
+        page.evaluate.return_value = {"type": "modal", "qr": "https://example.com/qr.png"}
+
+        state = await login.ensure_login_state()
+
+        assert state.kind is LoginStateKind.MODAL_OPEN
+        assert state.qrcode_url == "https://example.com/qr.png"
+
+    @pytest.mark.asyncio
+    async def test_in_page_timeout_is_failed(self, login, page):
+        """页面内等待超时返回 FAILED，默认超时为 LOGIN_STATE_TIMEOUT 秒"""
+        page.evaluate.return_value = {"type": "timeout"}
+
+        state = await login.ensure_login_state()
+
+        assert state.kind is LoginStateKind.FAILED
+        args = page.evaluate.call_args.args[1]
+        assert args["timeoutMs"] == XiaohongshuLogin.LOGIN_STATE_TIMEOUT * 1000
+        assert args["qrTimeoutMs"] == XiaohongshuLogin.QR_RENDER_TIMEOUT * 1000
+
+    @pytest.mark.asyncio
+    async def test_qr_render_timeout_is_failed(self, login, page):
+        """点击登录按钮后二维码迟迟未渲染，按二维码阶段的超时返回 FAILED"""
+        page.evaluate.return_value = {"type": "timeout", "phase": "qr"}
+
+        state = await login.ensure_login_state()
+
+        assert state.kind is LoginStateKind.FAILED
+        assert "二维码" in state.message
+
+    @pytest.mark.asyncio
+    async def test_evaluate_error_is_failed(self, login, page):
+        """页面脚本执行出错时返回 FAILED"""
+        page.evaluate.side_effect = RuntimeError("页面已关闭")
+
+        state = await login.ensure_login_state()
+
+        assert state.kind is LoginStateKind.FAILED
+        assert "页面已关闭" in state.message
+
+
+@pytest.mark.unit
+class TestWaitForLogin:
+    """wait_for_login 返回值测试"""
+
+    @pytest.mark.asyncio
+    async def test_success_reports_awaited_save(self, login):
+        """登录成功时返回的 cookies_saved 为实际保存结果"""
+        login.browser_manager.save_cookies.return_value = False
+
+        result = await login.wait_for_login(timeout=1)
+
+        assert result == (True, "登录成功", False)
+        login.browser_manager.save_cookies.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, login, page):
+        """超时返回失败且不保存 cookies"""
+        page.wait_for_selector.side_effect = PlaywrightTimeoutError("timeout")
+
+        success, message, cookies_saved = await login.wait_for_login(timeout=1)
+
+        assert success is False
+        assert cookies_saved is False
+        assert "超时" in message
+        login.browser_manager.save_cookies.assert_not_awaited()
+
+
+@pytest.mark.unit
+class TestLogin:
+    """登录流程测试"""
+
+    @pytest.mark.asyncio
+    async def test_login_stops_when_modal_fails(self, login, page):
+        """既未登录也没能打开弹窗时直接返回失败，不再等待扫码"""
+        login.initialize = AsyncMock()
+        login.clear_login_cookies = AsyncMock(return_value=True)
+        login.wait_for_login = AsyncMock()
+        page.evaluate.return_value = {"type": "timeout"}
+
+        success, message, cookies_saved = await login.login(timeout=1)
+
+        assert success is False
+        assert cookies_saved is False
+        login.wait_for_login.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_is_logged_in_navigate_reloads(self, login):
+        """navigate=True 时即使已在探索页也重新加载"""
+        assert await login.is_logged_in(navigate=True) is True
+        login.page_controller.navigate.assert_awaited_once()
+
+
+@pytest.mark.unit
+class TestClearLoginCookies:
+    """登出 / fresh 登录清除 cookies 测试"""
+
+    @pytest.mark.asyncio
+    async def test_clears_all_browser_cookies(self, login, page):
+        """清除本地文件和浏览器上下文中的全部 cookies，会话 cookie 不会残留"""
+        login.cookie_storage.clear_cookies.return_value = True
+        page.context.clear_cookies = AsyncMock()
+
+        assert await login.clear_login_cookies() is True
+
+        login.cookie_storage.clear_cookies.assert_called_once_with()
+        page.context.clear_cookies.assert_awaited_once_with()
+
+    @pytest.mark.asyncio
+    async def test_logout_uses_full_clear(self, login, page):
+        """登出走同一个清除逻辑"""
+        login.cookie_storage.clear_cookies.return_value = True
+        page.context.clear_cookies = AsyncMock()
+
+        assert await login.logout() is True
+        page.context.clear_cookies.assert_awaited_once_with()
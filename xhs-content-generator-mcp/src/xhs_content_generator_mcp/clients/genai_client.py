@@ -6,7 +6,18 @@ from typing import List, Optional
 from google import genai
 from google.genai import types
 
-from ..utils.error_parser import parse_genai_error
+from ..utils.error_parser import ProviderAPIError, is_non_retryable_error, parse_genai_error
+
+
+def _to_provider_error(error: Exception) -> ProviderAPIError:
+    """把 SDK 异常转换为 ProviderAPIError：信息为解析后的友好提示，保留 HTTP 状态码和错误状态（如 PERMISSION_DENIED）"""
+    code = getattr(error, "code", None)
+    status = getattr(error, "status", None)
+    return ProviderAPIError(
+        parse_genai_error(error),
+        status_code=code if isinstance(code, int) else None,
+        error_code=status if isinstance(status, str) else None,
+    )
 
 
 def retry_on_429(max_retries=3, base_delay=2):
@@ -20,30 +31,20 @@ def retry_on_429(max_retries=3, base_delay=2):
                     return func(*args, **kwargs)
                 except Exception as e:
                     last_error = e
-                    error_str = str(e).lower()
-
-                    # 不可重试的错误类型
-                    non_retryable = [
-                        "401", "unauthenticated",  # 认证错误
-                        "403", "permission_denied", "forbidden",  # 权限错误
-                        "404", "not_found",  # 资源不存在
-                        "invalid_argument",  # 参数错误
-                        "safety", "blocked", "filter",  # 安全过滤
-                    ]
-
-                    should_retry = True
-                    for keyword in non_retryable:
-                        if keyword in error_str:
-                            should_retry = False
-                            break
-
-                    if not should_retry:
+                    error = _to_provider_error(e)
+
+                    # 认证、权限、资源不存在按状态码判断；参数错误（400 / INVALID_ARGUMENT）重试也不会成功
+                    if (
+                        is_non_retryable_error(error)
+                        or error.status_code == 400
+                        or (error.error_code or "").upper() == "INVALID_ARGUMENT"
+                    ):
                         # 直接抛出，不重试
-                        raise Exception(parse_genai_error(e))
+                        raise error from e
 
                     # 可重试的错误
                     if attempt < max_retries - 1:
-                        if "429" in error_str or "resource_exhausted" in error_str:
+                        if error.status_code == 429:
                             wait_time = (base_delay ** attempt) + random.uniform(0, 1)
                             print(f"[重试] 遇到资源限制，{wait_time:.1f}秒后重试 (尝试 {attempt + 2}/{max_retries})")
                         else:
@@ -53,10 +54,10 @@ def retry_on_429(max_retries=3, base_delay=2):
                         continue
 
                     # 重试次数耗尽
-                    raise Exception(parse_genai_error(e))
+                    raise error from e
 
             # 理论上不会到这里，但保险起见
-            raise Exception(parse_genai_error(last_error))
+            raise _to_provider_error(last_error)
         return wrapper
     return decorator
 
@@ -120,7 +121,7 @@ class GenAIClient:
             use_search: 是否使用搜索
             use_thinking: 是否启用思考模式
             images: 图片列表
-            system_prompt: 系统提示词（暂不支持）
+            system_prompt: 系统提示词（可选）
 
         Returns:
             生成的文本
@@ -151,6 +152,10 @@ class GenAIClient:
             "safety_settings": self.default_safety_settings,
         }
 
+        # 系统提示词作为 system_instruction 传入
+        if system_prompt:
+            config_kwargs["system_instruction"] = system_prompt
+
         # 添加搜索工具
         if use_search:
             config_kwargs["tools"] = [types.Tool(google_search=types.GoogleSearch())]
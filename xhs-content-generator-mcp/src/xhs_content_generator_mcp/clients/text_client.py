@@ -1,14 +1,51 @@
 """Text API 客户端封装"""
 import time
 import random
-import base64
+import binascii
+import threading
 import requests
-from functools import wraps
+from requests.adapters import HTTPAdapter
+from functools import lru_cache, wraps
 from typing import List, Optional, Union
 
+from ..utils.error_parser import ProviderAPIError, is_non_retryable_error
 from ..utils.image_compressor import compress_image
 
 
+# 每个主机保持的连接池大小（不小于模型调用线程池的并发数，避免连接被频繁丢弃重建）
+HTTP_POOL_MAXSIZE = 32
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """获取共享的 HTTP 会话（所有客户端复用同一个连接池，避免每次请求重新建立 TCP/TLS 连接）"""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=HTTP_POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def _response_error_code(response: requests.Response) -> Optional[str]:
+    """从错误响应体中取出服务商错误码（OpenAI 兼容格式 {"error": {"code": ...}}），取不到时返回 None"""
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    if not isinstance(body, dict):
+        return None
+    error = body.get("error")
+    code = error.get("code") if isinstance(error, dict) else body.get("code")
+    return str(code) if code is not None else None
+
+
 def retry_on_429(max_retries=3, base_delay=2):
     """429 错误自动重试装饰器"""
     def decorator(func):
@@ -17,9 +54,9 @@ def retry_on_429(max_retries=3, base_delay=2):
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
-                    error_str = str(e)
-                    if "429" in error_str or "rate" in error_str.lower():
+                except ProviderAPIError as e:
+                    # 只重试限流；配额耗尽（insufficient_quota 等）同样返回 429，但等待后也不会恢复
+                    if e.status_code == 429 and not is_non_retryable_error(e):
                         if attempt < max_retries - 1:
                             wait_time = (base_delay ** attempt) + random.uniform(0, 1)
                             print(f"[重试] 遇到限流，{wait_time:.1f}秒后重试 (尝试 {attempt + 2}/{max_retries})")
@@ -59,8 +96,8 @@ class TextChatClient:
         self.chat_endpoint = f"{self.base_url}{endpoint}"
 
     def _encode_image_to_base64(self, image_data: bytes) -> str:
-        """将图片数据编码为 base64"""
-        return base64.b64encode(image_data).decode('utf-8')
+        """将图片数据编码为 base64（直接调用 binascii，不经过 base64 模块的额外包装和拷贝）"""
+        return binascii.b2a_base64(image_data, newline=False).decode('ascii')
 
     def _build_content_with_images(
         self,
@@ -155,7 +192,7 @@ class TextChatClient:
             "Authorization": f"Bearer {self.api_key}"
         }
 
-        response = requests.post(
+        response = get_http_session().post(
             self.chat_endpoint,
             json=payload,
             headers=headers,
@@ -165,10 +202,11 @@ class TextChatClient:
         if response.status_code != 200:
             error_detail = response.text[:500]
             status_code = response.status_code
+            error_code = _response_error_code(response)
 
             # 根据状态码给出更详细的错误信息
             if status_code == 401:
-                raise Exception(
+                raise ProviderAPIError(
                     "❌ API Key 认证失败\n\n"
                     "【可能原因】\n"
                     "1. API Key 无效或已过期\n"
@@ -177,10 +215,12 @@ class TextChatClient:
                     "【解决方案】\n"
                     "1. 检查 API Key 是否正确\n"
                     "2. 重新获取 API Key\n"
-                    f"\n【请求地址】{self.chat_endpoint}"
+                    f"\n【请求地址】{self.chat_endpoint}",
+                    status_code=status_code,
+                    error_code=error_code,
                 )
             elif status_code == 403:
-                raise Exception(
+                raise ProviderAPIError(
                     "❌ 权限被拒绝\n\n"
                     "【可能原因】\n"
                     "1. API Key 没有访问该模型的权限\n"
@@ -189,10 +229,12 @@ class TextChatClient:
                     "【解决方案】\n"
                     "1. 检查 API 权限配置\n"
                     "2. 尝试使用其他模型\n"
-                    f"\n【原始错误】{error_detail[:200]}"
+                    f"\n【原始错误】{error_detail[:200]}",
+                    status_code=status_code,
+                    error_code=error_code,
                 )
             elif status_code == 404:
-                raise Exception(
+                raise ProviderAPIError(
                     "❌ 模型不存在或 API 端点错误\n\n"
                     "【可能原因】\n"
                     f"1. 模型 '{model}' 不存在或已下线\n"
@@ -200,29 +242,35 @@ class TextChatClient:
                     "【解决方案】\n"
                     "1. 检查模型名称是否正确\n"
                     "2. 检查 Base URL 配置\n"
-                    f"\n【请求地址】{self.chat_endpoint}"
+                    f"\n【请求地址】{self.chat_endpoint}",
+                    status_code=status_code,
+                    error_code=error_code,
                 )
             elif status_code == 429:
-                raise Exception(
+                raise ProviderAPIError(
                     "⏳ API 配额或速率限制\n\n"
                     "【说明】\n"
                     "请求频率过高或配额已用尽。\n\n"
                     "【解决方案】\n"
                     "1. 稍后再试（等待 1-2 分钟）\n"
                     "2. 检查 API 配额使用情况\n"
-                    "3. 考虑升级计划获取更多配额"
+                    "3. 考虑升级计划获取更多配额",
+                    status_code=status_code,
+                    error_code=error_code,
                 )
             elif status_code >= 500:
-                raise Exception(
+                raise ProviderAPIError(
                     f"⚠️ API 服务器错误 ({status_code})\n\n"
                     "【说明】\n"
                     "这是服务端的临时故障，与您的配置无关。\n\n"
                     "【解决方案】\n"
                     "1. 稍等几分钟后重试\n"
-                    "2. 如果持续出现，检查服务商状态页"
+                    "2. 如果持续出现，检查服务商状态页",
+                    status_code=status_code,
+                    error_code=error_code,
                 )
             else:
-                raise Exception(
+                raise ProviderAPIError(
                     f"❌ API 请求失败 (状态码: {status_code})\n\n"
                     f"【原始错误】\n{error_detail}\n\n"
                     f"【请求地址】{self.chat_endpoint}\n"
@@ -230,7 +278,9 @@ class TextChatClient:
                     "【通用解决方案】\n"
                     "1. 检查 API Key 是否正确\n"
                     "2. 检查 Base URL 配置\n"
-                    "3. 检查模型名称是否正确"
+                    "3. 检查模型名称是否正确",
+                    status_code=status_code,
+                    error_code=error_code,
                 )
 
         result = response.json()
@@ -239,7 +289,7 @@ class TextChatClient:
         if "choices" in result and len(result["choices"]) > 0:
             return result["choices"][0]["message"]["content"]
         else:
-            raise Exception(
+            raise ProviderAPIError(
                 f"Text API 响应格式异常：未找到生成的文本。\n"
                 f"响应数据: {str(result)[:500]}\n"
                 "可能原因：\n"
@@ -250,9 +300,30 @@ class TextChatClient:
             )
 
 
+# 决定客户端实例的配置字段（model、temperature 等是每次调用时的参数，不影响客户端本身）
+_CLIENT_KEY_FIELDS = ('type', 'provider_name', 'api_key', 'base_url', 'endpoint_type')
+
+
+@lru_cache(maxsize=32)
+def _get_text_chat_client(client_key: tuple):
+    """按客户端配置复用客户端实例（客户端无请求状态，可在多个服务实例、多个线程间共享）"""
+    provider_config = dict(zip(_CLIENT_KEY_FIELDS, client_key))
+    provider_type = provider_config.get('type') or 'openai_compatible'
+    api_key = provider_config.get('api_key')
+    base_url = provider_config.get('base_url')
+
+    if provider_type == 'google_gemini':
+        from .genai_client import GenAIClient
+        return GenAIClient(api_key=api_key, base_url=base_url)
+    else:
+        # 使用统一的模型提供商客户端
+        from .model_providers import get_model_provider_client
+        return get_model_provider_client(provider_config)
+
+
 def get_text_chat_client(provider_config: dict):
     """
-    获取 Text Chat 客户端实例（根据 type 返回对应客户端）
+    获取 Text Chat 客户端实例（根据 type 返回对应客户端，相同配置复用同一实例）
 
     Args:
         provider_config: 服务商配置字典
@@ -265,17 +336,4 @@ def get_text_chat_client(provider_config: dict):
     Returns:
         GenAIClient 或 TextChatClient
     """
-    provider_type = provider_config.get('type', 'openai_compatible')
-    api_key = provider_config.get('api_key')
-    base_url = provider_config.get('base_url')
-    endpoint_type = provider_config.get('endpoint_type')
-  
-    if provider_type == 'google_gemini':
-        from .genai_client import GenAIClient
-        return GenAIClient(api_key=api_key, base_url=base_url)
-    else:
-        # 使用统一的模型提供商客户端
-        from .model_providers import get_model_provider_client
-        return get_model_provider_client(provider_config)
-
- 
\ No newline at end of file
+    return _get_text_chat_client(tuple(provider_config.get(field) for field in _CLIENT_KEY_FIELDS))
@@ -1,16 +1,29 @@
 """配置模块"""
 
 from .model_config import (
-    model_config,
+    get_model_config,
     GoogleGeminiConfig,
     OpenAICompatibleConfig,
     ModelConfig,
+    ProviderNotConfiguredError,
 )
 
 __all__ = [
-    "model_config",
+    "get_model_config",
     "GoogleGeminiConfig",
     "OpenAICompatibleConfig",
     "ModelConfig",
+    "ProviderNotConfiguredError",
+    "model_config",
 ]
 
+# 导入子模块时包上会留下同名属性 model_config（子模块本身），删掉它，
+# 让 `from xhs_content_generator_mcp.config import model_config` 走下面的 __getattr__ 拿到配置实例
+del model_config
+
+
+def __getattr__(name: str):
+    # 兼容旧用法：包上的 model_config 是全局配置实例，访问时才创建
+    if name == "model_config":
+        return get_model_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,96 @@
+"""将 .env 预编译为 Python 模块
+
+启动时导入已编译的模块（.pyc 缓存）代替逐行解析 .env 文件。
+用法：修改 .env 后运行 ``xhs-envcompile`` 重新生成。
+"""
+import argparse
+import functools
+import os
+from pathlib import Path
+from typing import Optional
+
+# Path(__file__).parents: [0] = config/, [1] = xhs_content_generator_mcp/, [2] = src/,
+# [3] = 项目根目录 xhs-content-generator-mcp/
+_CONFIG_DIR, _, _, _PROJECT_ROOT = Path(__file__).parents[:4]
+
+# 项目根目录的 .env 文件路径
+ENV_PATH = _PROJECT_ROOT / ".env"
+
+# 编译生成的模块（包含密钥，已加入 .gitignore）
+COMPILED_PATH = _CONFIG_DIR / "_env_compiled.py"
+
+
+def load_env(env_path: Path = ENV_PATH) -> None:
+    """
+    将 .env 中的变量写入环境变量（不覆盖已有变量），同一路径只加载一次
+
+    优先使用已编译的模块；编译模块不存在或 .env 在编译后被修改时，回退到 load_dotenv。
+    """
+    # 先解析为绝对路径再走缓存：load_env() 与 load_env(ENV_PATH)、相对路径与绝对路径都命中同一项
+    _load_env(Path(env_path).resolve())
+
+
+@functools.cache
+def _load_env(env_path: Path) -> None:
+    """按已解析的绝对路径加载 .env（结果缓存，同一文件只加载一次）"""
+    try:
+        from ._env_compiled import ENV, ENV_MTIME_NS
+
+        if os.stat(env_path).st_mtime_ns == ENV_MTIME_NS:
+            for key, value in ENV.items():
+                os.environ.setdefault(key, value)
+            return
+    except (ImportError, OSError):
+        pass
+
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=env_path)
+
+
+def compile_env(env_path: Path = ENV_PATH, output_path: Path = COMPILED_PATH) -> Path:
+    """
+    读取 .env 并生成包含 ENV 字典的 Python 模块
+
+    Args:
+        env_path: .env 文件路径
+        output_path: 生成的模块路径
+
+    Returns:
+        生成的模块路径
+    """
+    from dotenv import dotenv_values
+
+    mtime_ns = os.stat(env_path).st_mtime_ns
+    # 没有值的键（如 "FOO"）load_dotenv 也不会写入环境变量，这里同样跳过
+    env = {key: value for key, value in dotenv_values(env_path).items() if value is not None}
+
+    lines = [
+        '"""由 xhs-envcompile 根据 .env 自动生成，请勿手动修改"""',
+        f"ENV_MTIME_NS = {mtime_ns!r}",
+        "ENV = {",
+        *(f"    {key!r}: {value!r}," for key, value in env.items()),
+        "}",
+        "",
+    ]
+
+    # 先写临时文件再替换，避免并发启动的进程导入到写了一半的模块
+    tmp_path = output_path.with_suffix(".py.tmp")
+    tmp_path.write_text("\n".join(lines), encoding="utf-8")
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def main(argv: Optional[list] = None) -> None:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="将 .env 预编译为 Python 模块，加快启动")
+    parser.add_argument("--env-file", type=Path, default=ENV_PATH, help=".env 文件路径")
+    parser.add_argument("--output", type=Path, default=COMPILED_PATH, help="生成的模块路径")
+    args = parser.parse_args(argv)
+
+    output_path = compile_env(args.env_file, args.output)
+    print(f"已生成 {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,115 @@
 """模型配置"""
-from pathlib import Path
-from typing import Optional
+import os
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Dict, List, Mapping, Optional, Tuple, TypedDict
 
-from dotenv import load_dotenv
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, ValidationInfo, create_model, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# 加载 .env 文件
-# 计算项目根目录的 .env 文件路径
-# Path(__file__) = src/xhs_content_generator_mcp/config/model_config.py
-# .parent = src/xhs_content_generator_mcp/config/
-# .parent.parent = src/xhs_content_generator_mcp/
-# .parent.parent.parent = src/
-# .parent.parent.parent.parent = 项目根目录 xhs-content-generator-mcp/
-_env_path = Path(__file__).parent.parent.parent.parent / ".env"
-load_dotenv(dotenv_path=_env_path)
+from .env_compile import ENV_PATH as _env_path, load_env
+
+# 各服务商未配置时使用的默认值（只读，模块加载时构建一次）
+_GEMINI_DEFAULTS: Mapping[str, Any] = MappingProxyType({
+    "model": "gemini-2.0-flash-exp",
+    "temperature": 1.0,
+    "max_output_tokens": 8000,
+    "timeout": 300,
+})
+_OPENAI_DEFAULTS: Mapping[str, Any] = MappingProxyType({
+    "model": "qwen-plus",
+    "temperature": 1.0,
+    "max_output_tokens": 8000,
+    "timeout": 300,
+})
+_BAILIAN_DEFAULTS: Mapping[str, Any] = MappingProxyType({
+    "base_url": "https://dashscope.aliyuncs.com/compatible-mode/v1",
+    "model": "qwen-plus",
+    "temperature": 0.3,
+    "max_output_tokens": 8000,
+    "timeout": 60,
+})
+# 图片分析使用较低温度，且不需要太多 token
+_VL_DEFAULTS: Mapping[str, Any] = MappingProxyType({
+    "base_url": "https://dashscope.aliyuncs.com/compatible-mode/v1",
+    "model": "qwen3-vl-plus",
+    "temperature": 0.3,
+    "max_output_tokens": 2000,
+})
+
+
+class ProviderNotConfiguredError(ValueError):
+    """服务商未配置 API Key（继承 ValueError，原有的 except ValueError 仍然适用）"""
+
+
+# 服务商未配置 API Key 时的错误信息（ModelConfig 与 _UnconfiguredModelConfig 共用）
+_MISSING_KEY_MESSAGES: Mapping[str, str] = MappingProxyType({
+    "google_gemini": "Google Gemini API Key 必须配置（设置环境变量 GEMINI_API_KEY）",
+    "openai_compatible": "OpenAI 兼容接口 API Key 必须配置（设置环境变量 OPENAI_API_KEY）",
+    "alibaba_bailian": "阿里百炼 API Key 必须配置（设置环境变量 ALIBABA_BAILIAN_API_KEY）",
+})
+
+# 任一存在即需要创建完整的 ModelConfig
+_API_KEY_ENV_VARS = ("GEMINI_API_KEY", "OPENAI_API_KEY", "ALIBABA_BAILIAN_API_KEY", "VL_MODEL_API_KEY")
+
+
+# 温度参数的合法范围（与 GoogleGeminiConfig / OpenAICompatibleConfig 的 ge/le 约束一致）
+_TEMPERATURE_RANGE = (0.0, 2.0)
+
+
+class RawProviderConfig(TypedDict, total=False):
+    """服务商原始配置（已填充默认值，不经过 pydantic 校验）"""
+
+    api_key: str
+    base_url: Optional[str]
+    model: str
+    temperature: float
+    max_output_tokens: int
+    timeout: int
+    endpoint_type: Optional[str]
+
+
+class ProviderConfigDict(TypedDict, total=False):
+    """传递给客户端的服务商配置字典"""
+
+    type: str
+    provider_name: str
+    api_key: str
+    base_url: Optional[str]
+    endpoint_type: Optional[str]
+    model: str
+    temperature: float
+    max_output_tokens: int
+
+
+def _check_temperature(temperature: float) -> None:
+    """校验温度参数范围（只在构建并缓存配置时执行一次）"""
+    low, high = _TEMPERATURE_RANGE
+    if not low <= temperature <= high:
+        raise ValueError(f"温度参数必须在 {low} 到 {high} 之间，当前为: {temperature}")
+
+
+def _to_optional_int(v: Any) -> Any:
+    """将空字符串转换为 None，其余交给 pydantic 转换为 int"""
+    if v == "":
+        return None
+    return v
+
+
+def _to_optional_float(v: Any) -> Any:
+    """将空字符串和无法解析的字符串转换为 None"""
+    if isinstance(v, str):
+        try:
+            return float(v.strip())
+        except ValueError:
+            return None
+    return v
+
+
+def _apply_defaults(defaults: Mapping[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+    """values 中为空（None、空串、0）的项取 defaults 中的默认值，与原先的 `or` 回退语义一致"""
+    merged = dict(defaults)
+    merged.update((k, v) for k, v in values.items() if v or k not in defaults)
+    return merged
 
 
 class GoogleGeminiConfig(BaseModel):
@@ -51,185 +146,146 @@ class OpenAICompatibleConfig(BaseModel):
     )
 
 
-class ModelConfig(BaseSettings):
-    """模型配置主类"""
+# 配置项字段表：(属性名, 环境变量名, 类型)，默认值均为 None
+# 新增环境变量只需在此追加一行
+_FIELDS: List[Tuple[str, str, Any]] = [
+    # Google Gemini 配置
+    ("google_gemini__api_key", "GEMINI_API_KEY", Optional[str]),
+    ("google_gemini__base_url", "GEMINI_BASE_URL", Optional[str]),
+    ("google_gemini__model", "GEMINI_MODEL", Optional[str]),
+    ("google_gemini__temperature", "GEMINI_TEMPERATURE", Optional[float]),
+    ("google_gemini__max_output_tokens", "GEMINI_MAX_OUTPUT_TOKENS", Optional[int]),
+    ("google_gemini__timeout", "GEMINI_TIMEOUT", Optional[int]),
+    # OpenAI 兼容接口配置
+    ("openai_compatible__api_key", "OPENAI_API_KEY", Optional[str]),
+    ("openai_compatible__base_url", "OPENAI_BASE_URL", Optional[str]),
+    ("openai_compatible__model", "OPENAI_MODEL", Optional[str]),
+    ("openai_compatible__temperature", "OPENAI_TEMPERATURE", Optional[float]),
+    ("openai_compatible__max_output_tokens", "OPENAI_MAX_OUTPUT_TOKENS", Optional[int]),
+    ("openai_compatible__timeout", "OPENAI_TIMEOUT", Optional[int]),
+    ("openai_compatible__endpoint_type", "OPENAI_ENDPOINT_TYPE", Optional[str]),
+    ("openai_compatible__provider_name", "OPENAI_PROVIDER_NAME", Optional[str]),
+    # 阿里百炼配置（兼容模式）
+    ("alibaba_bailian__api_key", "ALIBABA_BAILIAN_API_KEY", Optional[str]),
+    ("alibaba_bailian__endpoint", "ALIBABA_BAILIAN_ENDPOINT", Optional[str]),
+    ("alibaba_bailian__model", "ALIBABA_BAILIAN_MODEL", Optional[str]),
+    ("alibaba_bailian__temperature", "ALIBABA_BAILIAN_TEMPERATURE", Optional[float]),
+    ("alibaba_bailian__max_tokens", "ALIBABA_BAILIAN_MAX_TOKENS", Optional[int]),
+    ("alibaba_bailian__timeout", "ALIBABA_BAILIAN_TIMEOUT", Optional[int]),
+    # VL 模型配置（用于图片分析）
+    ("vl_model__provider_type", "VL_MODEL_PROVIDER_TYPE", Optional[str]),
+    ("vl_model__api_key", "VL_MODEL_API_KEY", Optional[str]),
+    ("vl_model__base_url", "VL_MODEL_BASE_URL", Optional[str]),
+    ("vl_model__model", "VL_MODEL_MODEL", Optional[str]),
+    ("vl_model__temperature", "VL_MODEL_TEMPERATURE", Optional[float]),
+    ("vl_model__max_output_tokens", "VL_MODEL_MAX_OUTPUT_TOKENS", Optional[int]),
+]
+
+
+class _ModelConfigBase(BaseSettings):
+    """模型配置基类（配置项字段由 _FIELDS 生成，见下方 ModelConfig）"""
 
     model_config = SettingsConfigDict(
-        # 使用绝对路径指向项目根目录的 .env 文件
-        # 这样无论从哪个目录运行，都能正确找到 .env 文件
-        # 如果文件不存在，BaseSettings 会忽略它，只从环境变量读取
-        env_file=str(_env_path),
-        env_file_encoding="utf-8",
+        # .env 已在创建实例前由 load_env 写入环境变量（不覆盖已有变量），
+        # 这里直接从环境变量读取，避免再解析一遍 .env 文件
         case_sensitive=False,
         extra="ignore",
         env_nested_delimiter="__",
     )
 
-    # Google Gemini 配置
-    google_gemini__api_key: Optional[str] = Field(
-        default=None, alias="GEMINI_API_KEY"
-    )
-    google_gemini__base_url: Optional[str] = Field(
-        default=None, alias="GEMINI_BASE_URL"
-    )
-    google_gemini__model: Optional[str] = Field(default=None, alias="GEMINI_MODEL")
-    google_gemini__temperature: Optional[float] = Field(
-        default=None, alias="GEMINI_TEMPERATURE"
-    )
-    google_gemini__max_output_tokens: Optional[int] = Field(
-        default=None, alias="GEMINI_MAX_OUTPUT_TOKENS"
-    )
-    google_gemini__timeout: Optional[int] = Field(
-        default=None, alias="GEMINI_TIMEOUT"
-    )
+    # 已解析配置的缓存，配置在进程内不变，重复调用直接返回
+    _cache: Dict[Any, Any] = PrivateAttr(default_factory=dict)
 
-    # OpenAI 兼容接口配置
-    openai_compatible__api_key: Optional[str] = Field(
-        default=None, alias="OPENAI_API_KEY"
-    )
-    openai_compatible__base_url: Optional[str] = Field(
-        default=None, alias="OPENAI_BASE_URL"
-    )
-    openai_compatible__model: Optional[str] = Field(
-        default=None, alias="OPENAI_MODEL"
-    )
-    openai_compatible__temperature: Optional[float] = Field(
-        default=None, alias="OPENAI_TEMPERATURE"
-    )
-    openai_compatible__max_output_tokens: Optional[int] = Field(
-        default=None, alias="OPENAI_MAX_OUTPUT_TOKENS"
-    )
-    openai_compatible__timeout: Optional[int] = Field(
-        default=None, alias="OPENAI_TIMEOUT"
-    )
-    openai_compatible__endpoint_type: Optional[str] = Field(
-        default=None, alias="OPENAI_ENDPOINT_TYPE"
-    )
-    openai_compatible__provider_name: Optional[str] = Field(
-        default=None, alias="OPENAI_PROVIDER_NAME"
-    )
+    # 需要转换的可选数值字段 -> 转换函数（由 parse_optional_values 统一分发）
+    _FIELD_COERCERS: ClassVar[Dict[str, Callable[[Any], Any]]] = {
+        "google_gemini__max_output_tokens": _to_optional_int,
+        "google_gemini__timeout": _to_optional_int,
+        "openai_compatible__max_output_tokens": _to_optional_int,
+        "openai_compatible__timeout": _to_optional_int,
+        "alibaba_bailian__max_tokens": _to_optional_int,
+        "alibaba_bailian__timeout": _to_optional_int,
+        "vl_model__max_output_tokens": _to_optional_int,
+        "google_gemini__temperature": _to_optional_float,
+        "openai_compatible__temperature": _to_optional_float,
+        "alibaba_bailian__temperature": _to_optional_float,
+        "vl_model__temperature": _to_optional_float,
+    }
 
-    # 阿里百炼配置（兼容模式）
-    alibaba_bailian__api_key: Optional[str] = Field(
-        default=None, alias="ALIBABA_BAILIAN_API_KEY"
-    )
-    alibaba_bailian__endpoint: Optional[str] = Field(
-        default=None, alias="ALIBABA_BAILIAN_ENDPOINT"
-    )
-    alibaba_bailian__model: Optional[str] = Field(
-        default=None, alias="ALIBABA_BAILIAN_MODEL"
-    )
-    alibaba_bailian__temperature: Optional[float] = Field(
-        default=None, alias="ALIBABA_BAILIAN_TEMPERATURE"
-    )
-    alibaba_bailian__max_tokens: Optional[int] = Field(
-        default=None, alias="ALIBABA_BAILIAN_MAX_TOKENS"
-    )
-    alibaba_bailian__timeout: Optional[int] = Field(
-        default=None, alias="ALIBABA_BAILIAN_TIMEOUT"
-    )
+    # 字段由 create_model 在子类 ModelConfig 上生成，基类定义时尚不存在，因此关闭字段存在性检查
+    @field_validator(*_FIELD_COERCERS, mode="before", check_fields=False)
+    @classmethod
+    def parse_optional_values(cls, v, info: ValidationInfo):
+        """按字段查表转换可选数值字段（空字符串转换为 None），只注册在 _FIELD_COERCERS 中的字段上"""
+        coercer = cls._FIELD_COERCERS.get(info.field_name)
+        return coercer(v) if coercer else v
 
-    # VL 模型配置（用于图片分析）
-    vl_model__provider_type: Optional[str] = Field(
-        default=None, alias="VL_MODEL_PROVIDER_TYPE"
-    )
-    vl_model__api_key: Optional[str] = Field(
-        default=None, alias="VL_MODEL_API_KEY"
-    )
-    vl_model__base_url: Optional[str] = Field(
-        default=None, alias="VL_MODEL_BASE_URL"
-    )
-    vl_model__model: Optional[str] = Field(
-        default=None, alias="VL_MODEL_MODEL"
-    )
-    vl_model__temperature: Optional[float] = Field(
-        default=None, alias="VL_MODEL_TEMPERATURE"
-    )
-    vl_model__max_output_tokens: Optional[int] = Field(
-        default=None, alias="VL_MODEL_MAX_OUTPUT_TOKENS"
-    )
+    def _cached(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """按 key 缓存 factory 的结果；factory 抛出异常时不缓存"""
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = factory()
+            return value
 
-    @field_validator(
-        "google_gemini__max_output_tokens",
-        "google_gemini__timeout",
-        "openai_compatible__max_output_tokens",
-        "openai_compatible__timeout",
-        "alibaba_bailian__max_tokens",
-        "alibaba_bailian__timeout",
-        "vl_model__max_output_tokens",
-        mode="before",
-    )
-    @classmethod
-    def parse_optional_int(cls, v):
-        """将空字符串转换为 None"""
-        if v == "" or v is None:
-            return None
-        return v
-
-    @field_validator(
-        "google_gemini__temperature",
-        "openai_compatible__temperature",
-        "alibaba_bailian__temperature",
-        "vl_model__temperature",
-        mode="before",
-    )
-    @classmethod
-    def parse_optional_float(cls, v):
-        """将空字符串转换为 None"""
-        if v == "" or v is None:
-            return None
-        if isinstance(v, str):
-            try:
-                return float(v)
-            except ValueError:
-                return None
-        return v
+    def clear_cache(self) -> None:
+        """清除已解析配置的缓存（测试中修改配置后使用）"""
+        self._cache.clear()
 
     def get_google_gemini_config(self) -> GoogleGeminiConfig:
         """获取 Google Gemini 配置"""
+        return self._cached("google_gemini", lambda: GoogleGeminiConfig(**self._raw_google_gemini_config()))
+
+    def _raw_google_gemini_config(self) -> RawProviderConfig:
+        """Google Gemini 配置字典（不经过 pydantic 校验）"""
         if not self.google_gemini__api_key:
-            raise ValueError("Google Gemini API Key 必须配置（设置环境变量 GEMINI_API_KEY）")
-
-        return GoogleGeminiConfig(
-            api_key=self.google_gemini__api_key,
-            base_url=self.google_gemini__base_url,
-            model=self.google_gemini__model or "gemini-2.0-flash-exp",
-            temperature=self.google_gemini__temperature or 1.0,
-            max_output_tokens=self.google_gemini__max_output_tokens or 8000,
-            timeout=self.google_gemini__timeout or 300,
-        )
+            raise ProviderNotConfiguredError(_MISSING_KEY_MESSAGES["google_gemini"])
+
+        return _apply_defaults(_GEMINI_DEFAULTS, {
+            "api_key": self.google_gemini__api_key,
+            "base_url": self.google_gemini__base_url,
+            "model": self.google_gemini__model,
+            "temperature": self.google_gemini__temperature,
+            "max_output_tokens": self.google_gemini__max_output_tokens,
+            "timeout": self.google_gemini__timeout,
+        })
 
     def get_openai_compatible_config(self) -> OpenAICompatibleConfig:
         """获取 OpenAI 兼容接口配置"""
+        return self._cached("openai_compatible", lambda: OpenAICompatibleConfig(**self._raw_openai_compatible_config()))
+
+    def _raw_openai_compatible_config(self) -> RawProviderConfig:
+        """OpenAI 兼容接口配置字典（不经过 pydantic 校验）"""
         if not self.openai_compatible__api_key:
-            raise ValueError(
-                "OpenAI 兼容接口 API Key 必须配置（设置环境变量 OPENAI_API_KEY）"
-            )
-
-        return OpenAICompatibleConfig(
-            api_key=self.openai_compatible__api_key,
-            base_url=self.openai_compatible__base_url,
-            model=self.openai_compatible__model or "qwen-plus",
-            temperature=self.openai_compatible__temperature or 1.0,
-            max_output_tokens=self.openai_compatible__max_output_tokens or 8000,
-            timeout=self.openai_compatible__timeout or 300,
-            endpoint_type=self.openai_compatible__endpoint_type,
-        )
+            raise ProviderNotConfiguredError(_MISSING_KEY_MESSAGES["openai_compatible"])
+
+        return _apply_defaults(_OPENAI_DEFAULTS, {
+            "api_key": self.openai_compatible__api_key,
+            "base_url": self.openai_compatible__base_url,
+            "model": self.openai_compatible__model,
+            "temperature": self.openai_compatible__temperature,
+            "max_output_tokens": self.openai_compatible__max_output_tokens,
+            "timeout": self.openai_compatible__timeout,
+            "endpoint_type": self.openai_compatible__endpoint_type,
+        })
 
     def get_alibaba_bailian_config(self) -> OpenAICompatibleConfig:
         """获取阿里百炼配置（使用 OpenAI 兼容接口）"""
+        return self._cached("alibaba_bailian", lambda: OpenAICompatibleConfig(**self._raw_alibaba_bailian_config()))
+
+    def _raw_alibaba_bailian_config(self) -> RawProviderConfig:
+        """阿里百炼配置字典（不经过 pydantic 校验）"""
         if not self.alibaba_bailian__api_key:
-            raise ValueError("阿里百炼 API Key 必须配置（设置环境变量 ALIBABA_BAILIAN_API_KEY）")
-
-        return OpenAICompatibleConfig(
-            api_key=self.alibaba_bailian__api_key,
-            base_url=self.alibaba_bailian__endpoint or "https://dashscope.aliyuncs.com/compatible-mode/v1",
-            model=self.alibaba_bailian__model or "qwen-plus",
-            temperature=self.alibaba_bailian__temperature or 0.3,
-            max_output_tokens=self.alibaba_bailian__max_tokens or 8000,
-            timeout=self.alibaba_bailian__timeout or 60,
-            endpoint_type=None,  # 使用默认端点
-        )
+            raise ProviderNotConfiguredError(_MISSING_KEY_MESSAGES["alibaba_bailian"])
+
+        return _apply_defaults(_BAILIAN_DEFAULTS, {
+            "api_key": self.alibaba_bailian__api_key,
+            "base_url": self.alibaba_bailian__endpoint,
+            "model": self.alibaba_bailian__model,
+            "temperature": self.alibaba_bailian__temperature,
+            "max_output_tokens": self.alibaba_bailian__max_tokens,
+            "timeout": self.alibaba_bailian__timeout,
+            "endpoint_type": None,  # 使用默认端点
+        })
 
     def get_provider_config(
         self, provider_type: str, model: Optional[str] = None, temperature: Optional[float] = None, max_output_tokens: Optional[int] = None
@@ -246,47 +302,93 @@ class ModelConfig(BaseSettings):
         Returns:
             配置字典
         """
-        if provider_type == "google_gemini":
-            config = self.get_google_gemini_config()
-            return {
-                "type": "google_gemini",
-                "api_key": config.api_key,
-                "base_url": config.base_url,
-                "model": model or config.model,
-                "temperature": temperature if temperature is not None else config.temperature,
-                "max_output_tokens": max_output_tokens if max_output_tokens is not None else config.max_output_tokens,
-            }
-        elif provider_type == "alibaba_bailian":
-            config = self.get_alibaba_bailian_config()
-            return {
-                "type": "openai_compatible",
-                "provider_name": "alibaba-bailian",
-                "api_key": config.api_key,
-                "base_url": config.base_url,
-                "endpoint_type": config.endpoint_type,
-                "model": model or config.model,
-                "temperature": temperature if temperature is not None else config.temperature,
-                "max_output_tokens": max_output_tokens if max_output_tokens is not None else config.max_output_tokens,
-            }
-        elif provider_type == "openai_compatible":
-            config = self.get_openai_compatible_config()
-            # 如果配置了 provider_name，使用它
-            provider_name = self.openai_compatible__provider_name
-            result = {
-                "type": "openai_compatible",
-                "api_key": config.api_key,
-                "base_url": config.base_url,
-                "endpoint_type": config.endpoint_type,
-                "model": model or config.model,
-                "temperature": temperature if temperature is not None else config.temperature,
-                "max_output_tokens": max_output_tokens if max_output_tokens is not None else config.max_output_tokens,
-            }
-            if provider_name:
-                result["provider_name"] = provider_name
-            return result
-        else:
+        key = ("provider", provider_type, model, temperature, max_output_tokens)
+        config = self._cached(
+            key,
+            lambda: self._build_provider_config(provider_type, model, temperature, max_output_tokens),
+        )
+        # 返回副本，调用方修改不会污染缓存
+        return dict(config)
+
+    def get_provider_config_or_none(
+        self, provider_type: str, model: Optional[str] = None, temperature: Optional[float] = None, max_output_tokens: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        获取服务商配置字典，服务商未配置时返回 None（参数同 get_provider_config）
+
+        用于按优先级回退选择服务商的场景，调用方不需要用异常做流程控制。
+        只有"未配置"会返回 None；温度超出范围、服务商类型不支持等配置错误照常抛出，不会被静默跳过。
+        """
+        try:
+            return self.get_provider_config(provider_type, model, temperature, max_output_tokens)
+        except ProviderNotConfiguredError:
+            return None
+
+    def _build_provider_config(
+        self, provider_type: str, model: Optional[str], temperature: Optional[float], max_output_tokens: Optional[int]
+    ) -> ProviderConfigDict:
+        builder = self._PROVIDER_BUILDERS.get(provider_type)
+        if builder is None:
             raise ValueError(f"不支持的服务商类型: {provider_type}")
 
+        base = builder(self)
+        config: ProviderConfigDict = {
+            **base,
+            "model": model or base["model"],
+            "temperature": temperature if temperature is not None else base["temperature"],
+            "max_output_tokens": max_output_tokens if max_output_tokens is not None else base["max_output_tokens"],
+        }
+        # 结果会被缓存，范围校验对每组参数只执行一次
+        _check_temperature(config["temperature"])
+        return config
+
+    def _provider_base_google_gemini(self) -> ProviderConfigDict:
+        config = self._raw_google_gemini_config()
+        return {
+            "type": "google_gemini",
+            "api_key": config["api_key"],
+            "base_url": config["base_url"],
+            "model": config["model"],
+            "temperature": config["temperature"],
+            "max_output_tokens": config["max_output_tokens"],
+        }
+
+    def _provider_base_alibaba_bailian(self) -> ProviderConfigDict:
+        config = self._raw_alibaba_bailian_config()
+        return {
+            "type": "openai_compatible",
+            "provider_name": "alibaba-bailian",
+            "api_key": config["api_key"],
+            "base_url": config["base_url"],
+            "endpoint_type": config["endpoint_type"],
+            "model": config["model"],
+            "temperature": config["temperature"],
+            "max_output_tokens": config["max_output_tokens"],
+        }
+
+    def _provider_base_openai_compatible(self) -> ProviderConfigDict:
+        config = self._raw_openai_compatible_config()
+        result = {
+            "type": "openai_compatible",
+            "api_key": config["api_key"],
+            "base_url": config["base_url"],
+            "endpoint_type": config["endpoint_type"],
+            "model": config["model"],
+            "temperature": config["temperature"],
+            "max_output_tokens": config["max_output_tokens"],
+        }
+        # 如果配置了 provider_name，使用它
+        if self.openai_compatible__provider_name:
+            result["provider_name"] = self.openai_compatible__provider_name
+        return result
+
+    # 服务商类型 -> 基础配置构建函数
+    _PROVIDER_BUILDERS: ClassVar[Dict[str, Callable[["ModelConfig"], ProviderConfigDict]]] = {
+        "google_gemini": _provider_base_google_gemini,
+        "alibaba_bailian": _provider_base_alibaba_bailian,
+        "openai_compatible": _provider_base_openai_compatible,
+    }
+
     def get_vl_model_config(self) -> dict:
         """
         获取 VL 模型配置（用于图片分析）
@@ -296,78 +398,170 @@ class ModelConfig(BaseSettings):
         Returns:
             VL 模型配置字典，如果未配置则返回 None
         """
-        # 如果单独配置了 VL 模型，使用配置的值
-        if self.vl_model__api_key:
-            provider_type = self.vl_model__provider_type or "openai_compatible"
-            
-            if provider_type == "openai_compatible":
-                return {
-                    "type": "openai_compatible",
-                    "api_key": self.vl_model__api_key,
-                    "base_url": self.vl_model__base_url or "https://dashscope.aliyuncs.com/compatible-mode/v1",
-                    "model": self.vl_model__model or "qwen3-vl-plus",
-                    "temperature": self.vl_model__temperature if self.vl_model__temperature is not None else 0.3,
-                    "max_output_tokens": self.vl_model__max_output_tokens or 2000,
-                }
-            elif provider_type == "google_gemini":
-                # 尝试使用 Google Gemini 配置
-                try:
-                    gemini_config = self.get_google_gemini_config()
-                    return {
-                        "type": "google_gemini",
-                        "api_key": self.vl_model__api_key or gemini_config.api_key,
-                        "base_url": self.vl_model__base_url or gemini_config.base_url,
-                        "model": self.vl_model__model or gemini_config.model,
-                        "temperature": self.vl_model__temperature if self.vl_model__temperature is not None else 0.3,
-                        "max_output_tokens": self.vl_model__max_output_tokens or 2000,
-                    }
-                except ValueError:
-                    return {
-                        "type": "google_gemini",
-                        "api_key": self.vl_model__api_key,
-                        "base_url": self.vl_model__base_url,
-                        "model": self.vl_model__model or "gemini-2.0-flash-exp",
-                        "temperature": self.vl_model__temperature or 0.3,
-                        "max_output_tokens": self.vl_model__max_output_tokens or 2000,
-                    }
-            else:
-                # 其他类型的 VL 模型
-                return {
-                    "type": provider_type,
-                    "api_key": self.vl_model__api_key,
-                    "base_url": self.vl_model__base_url,
-                    "model": self.vl_model__model or "gpt-4o",
-                    "temperature": self.vl_model__temperature or 0.3,
-                    "max_output_tokens": self.vl_model__max_output_tokens or 2000,
-                }
-        
-        # 如果没有单独配置 VL 模型，尝试使用阿里百炼配置（默认使用 qwen3-vl-plus）
-        try:
-            bailian_config = self.get_alibaba_bailian_config()
+        config = self._cached("vl_model", self._build_vl_model_config)
+        return dict(config) if config is not None else None
+
+    def _build_vl_model_config(self) -> Optional[dict]:
+        # 按优先级依次尝试：单独配置的 VL 模型 -> 阿里百炼 -> Google Gemini（向后兼容）
+        for is_configured, builder in self._VL_FALLBACK_CHAIN:
+            if is_configured(self):
+                return builder(self)
+        # 如果都未配置，返回 None（表示未配置 VL 模型）
+        return None
+
+    def _vl_from_vl_fields(self) -> dict:
+        """使用单独配置的 VL 模型"""
+        provider_type = self.vl_model__provider_type or "openai_compatible"
+
+        if provider_type == "openai_compatible":
             return {
                 "type": "openai_compatible",
-                "api_key": bailian_config.api_key,
-                "base_url": bailian_config.base_url,
-                "model": "qwen3-vl-plus",  # VL 模型使用 qwen3-vl-plus
-                "temperature": 0.3,  # 图片分析使用较低温度
-                "max_output_tokens": 2000,  # 图片分析不需要太多 token
+                "api_key": self.vl_model__api_key,
+                "base_url": self.vl_model__base_url or _VL_DEFAULTS["base_url"],
+                "model": self.vl_model__model or _VL_DEFAULTS["model"],
+                "temperature": self.vl_model__temperature if self.vl_model__temperature is not None else _VL_DEFAULTS["temperature"],
+                "max_output_tokens": self.vl_model__max_output_tokens or _VL_DEFAULTS["max_output_tokens"],
             }
-        except ValueError:
-            # 如果阿里百炼也未配置，尝试使用 Google Gemini 配置（向后兼容）
-            try:
-                gemini_config = self.get_google_gemini_config()
+        if provider_type == "google_gemini":
+            # 未单独配置的字段回退到 Google Gemini 配置
+            if self.google_gemini__api_key:
+                gemini_config = self._raw_google_gemini_config()
                 return {
                     "type": "google_gemini",
-                    "api_key": gemini_config.api_key,
-                    "base_url": gemini_config.base_url,
-                    "model": gemini_config.model,
-                    "temperature": 0.3,
-                    "max_output_tokens": 2000,
+                    "api_key": self.vl_model__api_key,
+                    "base_url": self.vl_model__base_url or gemini_config["base_url"],
+                    "model": self.vl_model__model or gemini_config["model"],
+                    "temperature": self.vl_model__temperature if self.vl_model__temperature is not None else _VL_DEFAULTS["temperature"],
+                    "max_output_tokens": self.vl_model__max_output_tokens or _VL_DEFAULTS["max_output_tokens"],
                 }
-            except ValueError:
-                # 如果都未配置，返回 None（表示未配置 VL 模型）
-                return None
+            return {
+                "type": "google_gemini",
+                "api_key": self.vl_model__api_key,
+                "base_url": self.vl_model__base_url,
+                "model": self.vl_model__model or _GEMINI_DEFAULTS["model"],
+                "temperature": self.vl_model__temperature or _VL_DEFAULTS["temperature"],
+                "max_output_tokens": self.vl_model__max_output_tokens or _VL_DEFAULTS["max_output_tokens"],
+            }
+        # 其他类型的 VL 模型
+        return {
+            "type": provider_type,
+            "api_key": self.vl_model__api_key,
+            "base_url": self.vl_model__base_url,
+            "model": self.vl_model__model or "gpt-4o",
+            "temperature": self.vl_model__temperature or _VL_DEFAULTS["temperature"],
+            "max_output_tokens": self.vl_model__max_output_tokens or _VL_DEFAULTS["max_output_tokens"],
+        }
+
+    def _vl_from_alibaba_bailian(self) -> dict:
+        """使用阿里百炼的接入配置，模型固定为 qwen3-vl-plus"""
+        bailian_config = self._raw_alibaba_bailian_config()
+        return {
+            "type": "openai_compatible",
+            "api_key": bailian_config["api_key"],
+            "base_url": bailian_config["base_url"],
+            "model": _VL_DEFAULTS["model"],
+            "temperature": _VL_DEFAULTS["temperature"],
+            "max_output_tokens": _VL_DEFAULTS["max_output_tokens"],
+        }
+
+    def _vl_from_google_gemini(self) -> dict:
+        """使用 Google Gemini 配置"""
+        gemini_config = self._raw_google_gemini_config()
+        return {
+            "type": "google_gemini",
+            "api_key": gemini_config["api_key"],
+            "base_url": gemini_config["base_url"],
+            "model": gemini_config["model"],
+            "temperature": _VL_DEFAULTS["temperature"],
+            "max_output_tokens": _VL_DEFAULTS["max_output_tokens"],
+        }
+
+    # VL 模型配置来源（是否已配置, 构建函数），按顺序取第一个已配置的
+    _VL_FALLBACK_CHAIN: ClassVar[List[Tuple[Callable[["ModelConfig"], Any], Callable[["ModelConfig"], dict]]]] = [
+        (lambda s: s.vl_model__api_key, _vl_from_vl_fields),
+        (lambda s: s.alibaba_bailian__api_key, _vl_from_alibaba_bailian),
+        (lambda s: s.google_gemini__api_key, _vl_from_google_gemini),
+    ]
+
+
+# 模型配置主类：在基类上按 _FIELDS 一次性生成配置项字段
+ModelConfig = create_model(
+    "ModelConfig",
+    __base__=_ModelConfigBase,
+    __module__=__name__,
+    **{name: (typ, Field(default=None, alias=alias)) for name, alias, typ in _FIELDS},
+)
+ModelConfig.__doc__ = "模型配置主类"
+
+
+class _UnconfiguredModelConfig:
+    """
+    未设置任何 API Key 时使用的占位配置
+
+    与 ModelConfig 的接口和错误信息一致，但不创建 pydantic-settings 实例（不扫描环境变量、不做校验）。
+    """
+
+    def clear_cache(self) -> None:
+        pass
+
+    def get_google_gemini_config(self) -> GoogleGeminiConfig:
+        raise ProviderNotConfiguredError(_MISSING_KEY_MESSAGES["google_gemini"])
+
+    def get_openai_compatible_config(self) -> OpenAICompatibleConfig:
+        raise ProviderNotConfiguredError(_MISSING_KEY_MESSAGES["openai_compatible"])
+
+    def get_alibaba_bailian_config(self) -> OpenAICompatibleConfig:
+        raise ProviderNotConfiguredError(_MISSING_KEY_MESSAGES["alibaba_bailian"])
+
+    def get_provider_config(
+        self, provider_type: str, model: Optional[str] = None, temperature: Optional[float] = None, max_output_tokens: Optional[int] = None
+    ) -> dict:
+        message = _MISSING_KEY_MESSAGES.get(provider_type)
+        if message is None:
+            raise ValueError(f"不支持的服务商类型: {provider_type}")
+        raise ProviderNotConfiguredError(message)
+
+    def get_provider_config_or_none(
+        self, provider_type: str, model: Optional[str] = None, temperature: Optional[float] = None, max_output_tokens: Optional[int] = None
+    ) -> Optional[dict]:
+        return None
+
+    def get_vl_model_config(self) -> Optional[dict]:
+        return None
+
+
+_UNCONFIGURED = _UnconfiguredModelConfig()
+
+
+def _has_any_api_key() -> bool:
+    """检查环境变量中是否设置了任一服务商的 API Key（ModelConfig 不区分大小写，这里同样忽略大小写）"""
+    names = {name.upper() for name, value in os.environ.items() if value}
+    return any(name in names for name in _API_KEY_ENV_VARS)
+
+
+# 全局模型配置实例（首次访问时创建，导入本模块不读取 .env、不做配置校验）
+_model_config: Optional[ModelConfig] = None
+
+
+def get_model_config() -> ModelConfig:
+    """
+    获取全局模型配置实例，首次调用时加载 .env 并创建
+
+    未设置任何 API Key 时返回占位配置（调用即抛出与 ModelConfig 相同的 ValueError），
+    且不缓存，之后设置了 API Key 再调用时会创建完整的 ModelConfig。
+    """
+    global _model_config
+    if _model_config is None:
+        # 加载项目根目录的 .env 文件（优先使用 xhs-envcompile 预编译的模块）
+        load_env(_env_path)
+        if not _has_any_api_key():
+            return _UNCONFIGURED
+        _model_config = ModelConfig()
+    return _model_config
 
 
-# 全局模型配置实例
-model_config = ModelConfig()
+def __getattr__(name: str):
+    # 兼容 `from .model_config import model_config` 的旧用法，访问时才创建实例
+    if name == "model_config":
+        return get_model_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
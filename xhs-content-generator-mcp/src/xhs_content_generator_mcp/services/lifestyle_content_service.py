@@ -1,15 +1,55 @@
 """生活化内容生成服务"""
+import functools
 import json
-from math import log
 import re
 import time
+import traceback
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
 from loguru import logger
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson 未安装时回退到标准库
+    from json import loads as _json_loads
+
 from ..clients.text_client import get_text_chat_client
-from ..config import model_config
+from ..config import get_model_config
+from ..utils.error_parser import format_provider_error, is_non_retryable_error
+
+# LLM 输出首尾可能带有的代码块标记（按顺序匹配，先匹配较长的）
+_FENCE_PREFIXES = ("```json", "```")
+_FENCE_SUFFIX = "```"
+# 解析 LLM 输出中的JSON对象
+_JSON_DECODER = json.JSONDecoder()
+# 字符串形式的标签分隔符
+_TAG_SPLIT_RE = re.compile(r'[，,、\s]+')
+# JSON 解析失败后重试时逐次提高温度（最高 1.0，配置的温度更高时保持不变），避免重复得到同样的输出
+_PARSE_RETRY_TEMPERATURE_STEP = 0.3
+_PARSE_RETRY_MAX_TEMPERATURE = 1.0
+# JSON 解析失败后重试时追加到用户消息末尾的提醒
+_JSON_ONLY_REMINDER = "\n\n严格要求：只输出 JSON，不要任何解释文字。"
+# 封面页中的标题行
+_COVER_TITLE_RE = re.compile(r'标题：[^\n]+')
+# 提示词模板中的占位符（只匹配这些字段，JSON 示例中的其他大括号保持原样）
+_PROMPT_FIELDS_RE = re.compile(r'\{(profession|age|gender|personality|mood|scene|content_type|topic_hint)\}')
+
+# 未配置任何服务商时的默认配置（只在初始化失败前使用，不会被修改）
+_EMPTY_DEFAULT_CONFIG = {'type': 'alibaba_bailian', 'api_key': ''}
+
+# 内容生成提示词模板路径
+_CONTENT_PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "lifestyle_content_prompt.txt"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_content_prompt() -> str:
+    """加载内容生成提示词模板（进程内只读取一次，所有服务实例共用）"""
+    if not _CONTENT_PROMPT_PATH.exists():
+        raise FileNotFoundError(f"提示词模板文件不存在: {_CONTENT_PROMPT_PATH}")
+
+    with open(_CONTENT_PROMPT_PATH, "r", encoding="utf-8") as f:
+        return f.read()
 
 
 class LifestyleContentService:
@@ -25,23 +65,18 @@ class LifestyleContentService:
         logger.debug("初始化 LifestyleContentService...")
         self.provider_config = provider_config or self._get_default_config()
         self.client = self._get_client()
-        self.content_prompt_template = self._load_content_prompt_template()
-        logger.info(f"LifestyleContentService 初始化完成，使用服务商: {self.provider_config.get('type', 'alibaba_bailian')}")
+        self.content_prompt_template = _load_content_prompt()
+        logger.info("LifestyleContentService 初始化完成，使用服务商: {}", self.provider_config.get('type', 'alibaba_bailian'))
 
     def _get_default_config(self) -> dict:
-        """获取默认配置（使用阿里百炼）"""
-        try:
-            return model_config.get_provider_config(provider_type='alibaba_bailian')
-        except ValueError:
-            # 如果配置未设置，尝试使用 openai_compatible
-            try:
-                return model_config.get_provider_config(provider_type='openai_compatible')
-            except ValueError:
-                # 如果配置未设置，返回空配置（会在 _get_client 中报错）
-                return {
-                    'type': 'alibaba_bailian',
-                    'api_key': '',
-                }
+        """获取默认配置（优先使用阿里百炼，其次 openai_compatible）"""
+        model_config = get_model_config()
+        # 都未配置时返回空配置（会在 _get_client 中报错）
+        return (
+            model_config.get_provider_config_or_none(provider_type='alibaba_bailian')
+            or model_config.get_provider_config_or_none(provider_type='openai_compatible')
+            or _EMPTY_DEFAULT_CONFIG
+        )
 
     def _get_client(self):
         """根据配置获取客户端"""
@@ -53,18 +88,9 @@ class LifestyleContentService:
                 "2. 或在调用时传入 provider_config 参数"
             )
 
-        logger.info(f"使用文本服务商: {self.provider_config.get('type', 'alibaba_bailian')}")
+        logger.info("使用文本服务商: {}", self.provider_config.get('type', 'alibaba_bailian'))
         return get_text_chat_client(self.provider_config)
 
-    def _load_content_prompt_template(self) -> str:
-        """加载内容生成提示词模板"""
-        prompt_path = Path(__file__).parent.parent / "prompts" / "lifestyle_content_prompt.txt"
-        if not prompt_path.exists():
-            raise FileNotFoundError(f"提示词模板文件不存在: {prompt_path}")
-        
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            return f.read()
-
     def _generate_content(
         self,
         profession: str,
@@ -92,8 +118,6 @@ class LifestyleContentService:
         Returns:
             包含 title、content、tags 的字典
         """
-        import json
-        
         # 从配置中获取模型参数
         model = self.provider_config.get('model', 'qwen-plus')
         temperature = self.provider_config.get('temperature', 0.8)  # 生活化内容使用更高的温度
@@ -104,66 +128,74 @@ class LifestyleContentService:
         if topic_hint:
             topic_desc = f"\n话题提示：{topic_hint}"
         
-        # 构建提示词（使用 replace 而不是 format，避免 JSON 示例中的大括号被误解析）
-        prompt = self.content_prompt_template.replace("{profession}", str(profession))
-        prompt = prompt.replace("{age}", str(age))
-        prompt = prompt.replace("{gender}", str(gender))
-        prompt = prompt.replace("{personality}", str(personality))
-        prompt = prompt.replace("{mood}", str(mood))
-        prompt = prompt.replace("{scene}", str(scene or "日常生活"))
-        prompt = prompt.replace("{content_type}", str(content_type or "生活分享"))
-        prompt = prompt.replace("{topic_hint}", topic_desc)
+        # 构建提示词（一次遍历替换全部占位符；不使用 format，避免 JSON 示例中的大括号被误解析）
+        values = {
+            "profession": str(profession),
+            "age": str(age),
+            "gender": str(gender),
+            "personality": str(personality),
+            "mood": str(mood),
+            "scene": str(scene or "日常生活"),
+            "content_type": str(content_type or "生活分享"),
+            "topic_hint": topic_desc,
+        }
+        prompt = _PROMPT_FIELDS_RE.sub(lambda m: values[m.group(1)], self.content_prompt_template)
         
         # 最多重试3次
         max_retries = 3
         last_error = None
+        parse_failures = 0
         
         for attempt in range(max_retries):
             try:
-                logger.info(f"生成生活化内容（尝试 {attempt + 1}/{max_retries}）...")
+                logger.info("生成生活化内容（尝试 {}/{}）...", attempt + 1, max_retries)
+                
+                attempt_prompt = prompt
+                if parse_failures:
+                    # 上次输出无法解析：追加只输出 JSON 的提醒并提高温度，避免重复得到同样的输出
+                    attempt_prompt += _JSON_ONLY_REMINDER
+                    attempt_temperature = max(
+                        temperature,
+                        min(round(temperature + _PARSE_RETRY_TEMPERATURE_STEP * parse_failures, 2), _PARSE_RETRY_MAX_TEMPERATURE),
+                    )
+                else:
+                    attempt_temperature = temperature
                 
                 generated_text = self.client.generate_text(
-                    prompt=prompt,
+                    prompt=attempt_prompt,
                     model=model,
-                    temperature=temperature,
+                    temperature=attempt_temperature,
                     max_output_tokens=max_output_tokens
                 )
                 
-                logger.debug(f"API 返回文本长度: {len(generated_text)} 字符")
+                logger.debug("API 返回文本长度: {} 字符", len(generated_text))
                 
                 # 清理文本，去掉可能存在的代码块标记
                 json_text = generated_text.strip()
                 
-                # 去掉所有可能的代码块标记
-                json_text = re.sub(r'^```json\s*', '', json_text, flags=re.MULTILINE)
-                json_text = re.sub(r'^```\s*', '', json_text, flags=re.MULTILINE)
-                json_text = re.sub(r'\s*```$', '', json_text, flags=re.MULTILINE)
-                json_text = json_text.strip()
+                # 去掉首尾的代码块标记（```json 或 ```）
+                for prefix in _FENCE_PREFIXES:
+                    if json_text.startswith(prefix):
+                        json_text = json_text[len(prefix):].lstrip()
+                        break
+                if json_text.endswith(_FENCE_SUFFIX):
+                    json_text = json_text[:-len(_FENCE_SUFFIX)].rstrip()
                 
-                # 尝试找到JSON对象的开始和结束位置
-                if not json_text.startswith('{'):
-                    brace_start = json_text.find('{')
-                    if brace_start != -1:
-                        json_text = json_text[brace_start:]
-                
-                # 尝试找到匹配的结束 }
-                if json_text.startswith('{'):
-                    brace_count = 0
-                    json_end_pos = -1
-                    for i, char in enumerate(json_text):
-                        if char == '{':
-                            brace_count += 1
-                        elif char == '}':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                json_end_pos = i + 1
-                                break
-                    
-                    if json_end_pos > 0:
+                # 截取第一个 { 到最后一个 } 之间的内容，去掉JSON对象前后的说明文字
+                brace_start = json_text.find('{')
+                if brace_start != -1:
+                    brace_end = json_text.rfind('}')
+                    json_text = json_text[brace_start:brace_end + 1] if brace_end > brace_start else json_text[brace_start:]
+                    try:
+                        # 常见情况：截取后正好是一个完整的JSON对象，直接整体解析
+                        result = _json_loads(json_text)
+                    except ValueError:
+                        # 对象后的多余文本中也有 } 时，解析出第一个完整的对象（raw_decode 同时返回结束位置）
+                        result, json_end_pos = _JSON_DECODER.raw_decode(json_text)
                         json_text = json_text[:json_end_pos]
-                
-                # 解析JSON
-                result = json.loads(json_text)
+                else:
+                    # 没有JSON对象时不必尝试解析，直接重试
+                    raise ValueError("生成文本中没有JSON对象")
                 title = result.get("title", "").strip()
                 content = result.get("content", "").strip()
                 tags = result.get("tags", [])
@@ -171,7 +203,7 @@ class LifestyleContentService:
                 
                 # 确保tags是列表
                 if isinstance(tags, str):
-                    tags = [tag.strip() for tag in re.split(r'[，,、\s]+', tags) if tag.strip()]
+                    tags = [tag.strip() for tag in _TAG_SPLIT_RE.split(tags) if tag.strip()]
                 elif not isinstance(tags, list):
                     tags = []
                 
@@ -187,7 +219,7 @@ class LifestyleContentService:
                 if not pages:
                     raise ValueError("未生成pages数据")
                 
-                logger.info(f"内容生成成功（尝试 {attempt + 1}/{max_retries}）- 标题: {len(title)}字符, 正文: {len(content)}字符, 标签: {len(tags)}个, 页数: {len(pages)}个")
+                logger.info("内容生成成功（尝试 {}/{}）- 标题: {}字符, 正文: {}字符, 标签: {}个, 页数: {}个", attempt + 1, max_retries, len(title), len(content), len(tags), len(pages))
                 
                 return {
                     "title": title,
@@ -198,24 +230,32 @@ class LifestyleContentService:
                 
             except (json.JSONDecodeError, ValueError) as e:
                 last_error = e
-                logger.error(f"JSON解析失败（尝试 {attempt + 1}/{max_retries}）: {e}")
+                parse_failures += 1
+                logger.error("JSON解析失败（尝试 {}/{}）: {}", attempt + 1, max_retries, e)
                 if 'generated_text' in locals():
-                    logger.error(f"生成文本内容: {generated_text[:500]}")
+                    # 生成文本只在 DEBUG 级别输出（lazy 模式下级别未放行时不做截取）
+                    logger.opt(lazy=True).debug("JSON解析失败的生成文本: {}", lambda: generated_text[:500])
                 if attempt < max_retries - 1:
                     time.sleep(0.5)
                     continue
             
             except Exception as e:
                 last_error = e
-                logger.error(f"生成内容时发生异常（尝试 {attempt + 1}/{max_retries}）: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+                logger.error(
+                    "生成内容时发生异常（尝试 {}/{}）: {}: {}", attempt + 1, max_retries, type(e).__name__, e
+                )
+                # 堆栈只在 DEBUG 级别输出，级别未放行时不调用 format_exc
+                logger.opt(lazy=True).debug("异常堆栈: {}", traceback.format_exc)
+                if is_non_retryable_error(e):
+                    # 认证失败、模型不存在等错误重试也不会成功，直接抛出
+                    logger.error("错误不可重试，停止重试")
+                    raise
                 if attempt < max_retries - 1:
                     time.sleep(0.5)
                     continue
         
         # 所有重试都失败
-        logger.error(f"生成内容失败（已重试{max_retries}次）: {last_error}")
+        logger.error("生成内容失败（已重试{}次）: {}", max_retries, last_error)
         raise Exception(f"生成内容失败（已重试{max_retries}次）: {last_error}")
 
     def generate_lifestyle_content(
@@ -246,7 +286,7 @@ class LifestyleContentService:
             包含生成结果的字典
         """
         try:
-            logger.info(f"开始生成生活化内容: {profession}, {age}岁, {gender}, {personality}, {mood}")
+            logger.info("开始生成生活化内容: {}, {}岁, {}, {}, {}", profession, age, gender, personality, mood)
             
             # 一次性生成完整数据结构（包含 pages 和 image_prompts）
             content_result = self._generate_content(
@@ -270,26 +310,26 @@ class LifestyleContentService:
             MAX_CONTENT_LENGTH = 100
             
             if len(title) > MAX_TITLE_LENGTH:
-                logger.warning(f"标题超过限制: {len(title)}/{MAX_TITLE_LENGTH}，进行截断")
+                logger.warning("标题超过限制: {}/{}，进行截断", len(title), MAX_TITLE_LENGTH)
                 title = title[:MAX_TITLE_LENGTH]
                 # 更新封面页的标题
                 if pages and pages[0].get("type") == "cover":
                     cover_content = pages[0].get("content", "")
-                    cover_content = re.sub(r'标题：[^\n]+', f'标题：{title}', cover_content)
+                    cover_content = _COVER_TITLE_RE.sub(f'标题：{title}', cover_content)
                     pages[0]["content"] = cover_content
             
             # 正文不截断，只记录日志
             if len(content) > MAX_CONTENT_LENGTH:
-                logger.info(f"正文长度: {len(content)}字符（限制: {MAX_CONTENT_LENGTH}字符，不截断）")
+                logger.info("正文长度: {}字符（限制: {}字符，不截断）", len(content), MAX_CONTENT_LENGTH)
             
             # 构建人物设定摘要
-            persona_context = f"{age}岁{gender}{profession}，性格{personality}，心情{mood}"
-            if scene:
-                persona_context += f"，场景{scene}"
-            if content_type:
-                persona_context += f"，内容类型{content_type}"
+            persona_context = (
+                f"{age}岁{gender}{profession}，性格{personality}，心情{mood}"
+                f"{f'，场景{scene}' if scene else ''}"
+                f"{f'，内容类型{content_type}' if content_type else ''}"
+            )
             
-            logger.info(f"生活化内容生成完成 - 标题: {len(title)}字符, 正文: {len(content)}字符, 标签: {len(tags)}个, 页数: {len(pages)}个")
+            logger.info("生活化内容生成完成 - 标题: {}字符, 正文: {}字符, 标签: {}个, 页数: {}个", len(title), len(content), len(tags), len(pages))
             # 对齐 outline_service 的返回格式
             return {
                 "success": True,
@@ -302,58 +342,11 @@ class LifestyleContentService:
 
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"生活化内容生成失败: {error_msg}")
-            import traceback
+            logger.error("生活化内容生成失败: {}", error_msg)
             logger.error(traceback.format_exc())
 
             # 根据错误类型提供更详细的错误信息
-            if "api_key" in error_msg.lower() or "unauthorized" in error_msg.lower() or "401" in error_msg:
-                detailed_error = (
-                    f"API 认证失败。\n"
-                    f"错误详情: {error_msg}\n"
-                    "可能原因：\n"
-                    "1. API Key 无效或已过期\n"
-                    "2. API Key 没有访问该模型的权限\n"
-                    "解决方案：检查并更新 API Key"
-                )
-            elif "model" in error_msg.lower() or "404" in error_msg:
-                detailed_error = (
-                    f"模型访问失败。\n"
-                    f"错误详情: {error_msg}\n"
-                    "可能原因：\n"
-                    "1. 模型名称不正确\n"
-                    "2. 没有访问该模型的权限\n"
-                    "解决方案：检查模型名称配置"
-                )
-            elif "timeout" in error_msg.lower() or "连接" in error_msg:
-                detailed_error = (
-                    f"网络连接失败。\n"
-                    f"错误详情: {error_msg}\n"
-                    "可能原因：\n"
-                    "1. 网络连接不稳定\n"
-                    "2. API 服务暂时不可用\n"
-                    "3. Base URL 配置错误\n"
-                    "解决方案：检查网络连接，稍后重试"
-                )
-            elif "rate" in error_msg.lower() or "429" in error_msg or "quota" in error_msg.lower():
-                detailed_error = (
-                    f"API 配额限制。\n"
-                    f"错误详情: {error_msg}\n"
-                    "可能原因：\n"
-                    "1. API 调用次数超限\n"
-                    "2. 账户配额用尽\n"
-                    "解决方案：等待配额重置，或升级 API 套餐"
-                )
-            else:
-                detailed_error = (
-                    f"生活化内容生成失败。\n"
-                    f"错误详情: {error_msg}\n"
-                    "可能原因：\n"
-                    "1. Text API 配置错误或密钥无效\n"
-                    "2. 网络连接问题\n"
-                    "3. 模型无法访问或不存在\n"
-                    "建议：检查配置和网络连接"
-                )
+            detailed_error = format_provider_error(error_msg, "生活化内容生成失败")
 
             return {
                 "success": False,
@@ -1,13 +1,197 @@
 """大纲生成服务"""
+import asyncio
+import functools
+import hashlib
+import json
+import random
 import re
+import threading
 import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 from loguru import logger
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson 未安装时回退到标准库
+    from json import loads as _json_loads
+
 from ..clients.text_client import get_text_chat_client
-from ..config import model_config
+from ..config import get_model_config
+from ..utils.error_parser import format_provider_error, is_non_retryable_error
+from ..utils.executor import run_in_llm_executor
+
+# LLM 输出首尾可能带有的代码块标记（按顺序匹配，先匹配较长的）
+_FENCE_PREFIXES = ("```json", "```")
+_FENCE_SUFFIX = "```"
+# 解析 LLM 输出中的JSON对象
+_JSON_DECODER = json.JSONDecoder()
+# 字符串形式的标签分隔符
+_TAG_SPLIT_RE = re.compile(r'[，,、\s]+')
+# JSON 解析失败后重试时逐次提高温度（最高 1.0，配置的温度更高时保持不变），避免重复得到同样的输出
+_PARSE_RETRY_TEMPERATURE_STEP = 0.3
+_PARSE_RETRY_MAX_TEMPERATURE = 1.0
+# JSON 解析失败后重试时追加到用户消息末尾的提醒
+_JSON_ONLY_REMINDER = "\n\n严格要求：只输出 JSON，不要任何解释文字。"
+
+# 轻微超出长度限制时在本地截断，不再重新生成：标题超出不超过 10%，正文超出不超过 5%
+_NEAR_MISS_TITLE_RATIO = 1.1
+_NEAR_MISS_CONTENT_RATIO = 1.05
+# 正文截断时优先截断到的句末标点
+_SENTENCE_ENDS = ("。", "！", "？", "!", "?", "…")
+
+
+def _truncate_at_sentence_end(text: str, limit: int) -> str:
+    """把文本截断到 limit 字符以内，尽量截断在最后一个完整句子之后（截断点太靠前时直接按字符截断）"""
+    if len(text) <= limit:
+        return text
+    head = text[:limit]
+    end = max(head.rfind(mark) for mark in _SENTENCE_ENDS) + 1
+    return head[:end] if end > limit // 2 else head
+
+
+# 重试间隔：指数退避 + 随机抖动，最长不超过 _RETRY_MAX_DELAY 秒
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 4.0
+
+
+def _retry_delay(attempt: int) -> float:
+    """第 attempt 次（从 0 开始）失败后的等待时间"""
+    return min(_RETRY_BASE_DELAY * 2 ** attempt, _RETRY_MAX_DELAY) + random.uniform(0, 0.25)
+
+
+# 单次批量生成的主题数上限：所有主题同时排队，过多会长时间占满模型调用线程池并触发服务商限流
+MAX_BATCH_TOPICS = 20
+
+# 未配置任何服务商时的默认配置（只在初始化失败前使用，不会被修改）
+_EMPTY_DEFAULT_CONFIG = {'type': 'alibaba_bailian', 'api_key': ''}
+
+# 标题正文标签生成提示词模板路径
+_TITLE_CONTENT_TAGS_PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "title_content_tags_prompt.txt"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_title_content_tags_prompt() -> str:
+    """加载标题正文标签生成提示词模板（进程内只读取一次，所有服务实例共用）"""
+    if not _TITLE_CONTENT_TAGS_PROMPT_PATH.exists():
+        raise FileNotFoundError(f"标题正文标签生成提示词模板文件不存在: {_TITLE_CONTENT_TAGS_PROMPT_PATH}")
+
+    with open(_TITLE_CONTENT_TAGS_PROMPT_PATH, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+# 生成结果缓存：相同主题 + 提示词模板 + 模型参数在有效期内直接返回上次的结果，不再调用 LLM
+_RESULT_CACHE_MAXSIZE = 1024
+_RESULT_CACHE_TTL = 3600  # 秒
+
+# key -> (过期时间, 生成结果)，按最近使用排序，超出容量时淘汰最久未使用的
+_result_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+# 服务调用在线程池中执行，缓存读写需要加锁
+_result_cache_lock = threading.Lock()
+# 正在生成中的请求：key -> Future，相同 key 的并发请求等待同一次生成的结果（与缓存共用一把锁）
+_inflight_results: Dict[bytes, "Future[Dict[str, Any]]"] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _split_title_content_tags_prompt() -> Tuple[Optional[str], str]:
+    """
+    按 {topic} 占位符把提示词模板拆分为 (固定前缀, 后缀)
+
+    模板中没有占位符时前缀为 None，整个模板作为用户消息。
+    """
+    template = _load_title_content_tags_prompt()
+    prefix, marker, suffix = template.partition("{topic}")
+    if not marker:
+        return None, template
+    return prefix.rstrip() or None, suffix
+
+
+@functools.lru_cache(maxsize=1)
+def _title_content_tags_prompt_digest() -> str:
+    """提示词模板的摘要，作为缓存 key 的一部分（模板更新后旧结果不再命中）"""
+    return hashlib.blake2b(_load_title_content_tags_prompt().encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _result_cache_key(topic: str, provider_config: Dict[str, Any]) -> bytes:
+    """根据规范化后的主题、提示词模板和模型参数计算缓存 key"""
+    parts = (
+        topic.strip().lower(),
+        _title_content_tags_prompt_digest(),
+        str(provider_config.get('type')),
+        str(provider_config.get('base_url')),
+        str(provider_config.get('model')),
+        str(provider_config.get('temperature')),
+        str(provider_config.get('max_output_tokens')),
+    )
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).digest()
+
+
+def _lookup_cached_result(key: bytes) -> Optional[Dict[str, Any]]:
+    """读取未过期的缓存结果（返回副本），调用方需持有 _result_cache_lock"""
+    entry = _result_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if expires_at < time.monotonic():
+        del _result_cache[key]
+        return None
+    _result_cache.move_to_end(key)
+    return {**result, "tags": list(result["tags"])}
+
+
+def _get_cached_result(key: bytes) -> Optional[Dict[str, Any]]:
+    """读取未过期的缓存结果（返回副本）"""
+    with _result_cache_lock:
+        return _lookup_cached_result(key)
+
+
+def _set_cached_result(key: bytes, result: Dict[str, Any]) -> None:
+    """写入缓存（保存副本），超出容量时淘汰最久未使用的项"""
+    with _result_cache_lock:
+        _result_cache[key] = (time.monotonic() + _RESULT_CACHE_TTL, {**result, "tags": list(result["tags"])})
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > _RESULT_CACHE_MAXSIZE:
+            _result_cache.popitem(last=False)
+
+
+def _generate_once(key: bytes, generate: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    合并相同 key 的并发生成请求：第一个请求调用 generate 并写入缓存，
+    其余请求等待它的结果（失败时抛出同样的异常），相同主题的突发请求只调用一次 LLM
+    """
+    with _result_cache_lock:
+        # 调用方查缓存未命中后、拿到锁之前，上一次生成可能刚好写完缓存并移除了进行中的记录，
+        # 这里在锁内再查一次缓存，避免重复生成
+        cached = _lookup_cached_result(key)
+        if cached is not None:
+            return cached
+        future = _inflight_results.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = _inflight_results[key] = Future()
+
+    if not is_leader:
+        logger.info("相同主题正在生成中，等待其结果")
+        result = future.result()
+        return {**result, "tags": list(result["tags"])}
+
+    try:
+        result = generate()
+        # 先写缓存再移除进行中的记录，之后到达的请求在锁内总能命中其中之一
+        _set_cached_result(key, result)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _result_cache_lock:
+            _inflight_results.pop(key, None)
 
 
 class OutlineService:
@@ -23,23 +207,19 @@ class OutlineService:
         logger.debug("初始化 OutlineService...")
         self.provider_config = provider_config or self._get_default_config()
         self.client = self._get_client()
-        self.title_content_tags_prompt_template = self._load_title_content_tags_prompt_template()
-        logger.info(f"OutlineService 初始化完成，使用服务商: {self.provider_config.get('type', 'google_gemini')}")
+        self.title_content_tags_prompt_template = _load_title_content_tags_prompt()
+        self._prompt_prefix, self._prompt_suffix = _split_title_content_tags_prompt()
+        logger.info("OutlineService 初始化完成，使用服务商: {}", self.provider_config.get('type', 'google_gemini'))
 
     def _get_default_config(self) -> dict:
-        """获取默认配置（使用阿里百炼）"""
-        try:
-            return model_config.get_provider_config(provider_type='alibaba_bailian')
-        except ValueError:
-            # 如果配置未设置，尝试使用 openai_compatible
-            try:
-                return model_config.get_provider_config(provider_type='openai_compatible')
-            except ValueError:
-                # 如果配置未设置，返回空配置（会在 _get_client 中报错）
-                return {
-                    'type': 'alibaba_bailian',
-                    'api_key': '',
-                }
+        """获取默认配置（优先使用阿里百炼，其次 openai_compatible）"""
+        model_config = get_model_config()
+        # 都未配置时返回空配置（会在 _get_client 中报错）
+        return (
+            model_config.get_provider_config_or_none(provider_type='alibaba_bailian')
+            or model_config.get_provider_config_or_none(provider_type='openai_compatible')
+            or _EMPTY_DEFAULT_CONFIG
+        )
 
     def _get_client(self):
         """根据配置获取客户端"""
@@ -51,17 +231,28 @@ class OutlineService:
                 "2. 或在调用时传入 provider_config 参数"
             )
 
-        logger.info(f"使用文本服务商: {self.provider_config.get('type', 'google_gemini')}")
+        logger.info("使用文本服务商: {}", self.provider_config.get('type', 'google_gemini'))
         return get_text_chat_client(self.provider_config)
 
-    def _load_title_content_tags_prompt_template(self) -> str:
-        """加载标题正文标签生成提示词模板"""
-        prompt_path = Path(__file__).parent.parent / "prompts" / "title_content_tags_prompt.txt"
-        if not prompt_path.exists():
-            raise FileNotFoundError(f"标题正文标签生成提示词模板文件不存在: {prompt_path}")
-        
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            return f.read()
+    def warm_prompt_cache(self) -> None:
+        """
+        发送只生成 1 个 token 的请求，让服务商提前缓存固定的系统提示词前缀
+
+        会产生一次计费调用，由启动流程按需调用；模板没有固定前缀时不发送请求，失败不影响服务使用。
+        """
+        if not self._prompt_prefix:
+            return
+        try:
+            self.client.generate_text(
+                prompt="预热",
+                system_prompt=self._prompt_prefix,
+                model=self.provider_config.get('model', 'gemini-2.0-flash-exp'),
+                temperature=0,
+                max_output_tokens=1
+            )
+            logger.debug("提示词前缀缓存预热完成")
+        except Exception as e:
+            logger.debug("提示词前缀缓存预热失败（忽略）: {}", e)
 
     def _generate_title_content_tags(self, topic: str, max_retries: int = 5) -> Dict[str, Any]:
         """
@@ -74,8 +265,6 @@ class OutlineService:
         Returns:
             包含 title、content、tags 的字典
         """
-        import json
-        
         # 从配置中获取模型参数
         model = self.provider_config.get('model', 'gemini-2.0-flash-exp')
         temperature = self.provider_config.get('temperature', 0.3)
@@ -86,90 +275,99 @@ class OutlineService:
         MAX_CONTENT_LENGTH = 1000
         
         last_error = None
+        parse_failures = 0
         
         for attempt in range(max_retries):
             try:
-                logger.info(f"使用LLM生成标题、正文和标签（尝试 {attempt + 1}/{max_retries}）...")
+                logger.info("使用LLM生成标题、正文和标签（尝试 {}/{}）...", attempt + 1, max_retries)
                 
-                # 构建提示词（使用replace避免topic中的{}被format解析）
-                prompt = self.title_content_tags_prompt_template.replace(
-                    "{topic}", topic
-                )
+                # 构建提示词：模板中 {topic} 之前的固定部分作为系统提示词，每次请求完全相同，
+                # 可命中服务商的提示词前缀缓存；主题及之后的部分作为用户消息
+                prompt = topic + self._prompt_suffix
                 
-                # 如果不是第一次尝试，在提示词中强调长度限制
+                # 如果不是第一次尝试，在用户消息中强调长度限制（不修改系统提示词，保持前缀缓存有效）
                 if attempt > 0:
                     prompt += f"\n\n**重要提醒**：标题必须严格控制在{MAX_TITLE_LENGTH}字符以内，正文必须严格控制在{MAX_CONTENT_LENGTH}字符以内。"
                 
+                if parse_failures:
+                    # 上次输出无法解析：追加只输出 JSON 的提醒并提高温度，避免重复得到同样的输出
+                    prompt += _JSON_ONLY_REMINDER
+                    attempt_temperature = max(
+                        temperature,
+                        min(round(temperature + _PARSE_RETRY_TEMPERATURE_STEP * parse_failures, 2), _PARSE_RETRY_MAX_TEMPERATURE),
+                    )
+                else:
+                    attempt_temperature = temperature
+                
                 generated_text = self.client.generate_text(
                     prompt=prompt,
+                    system_prompt=self._prompt_prefix,
                     model=model,
-                    temperature=temperature,
+                    temperature=attempt_temperature,
                     max_output_tokens=max_output_tokens
                 )
                 
-                # 立即打印生成文本（使用error级别确保显示）
-                logger.error(f"[DEBUG-生成文本-立即打印] 长度: {len(generated_text)} 字符")
-                logger.error(f"[DEBUG-生成文本-立即打印] 内容: {generated_text}")
-                import sys
-                sys.stdout.flush()
+                # 生成文本只在 DEBUG 级别输出（lazy 模式下级别未放行时不做截取和格式化）
+                logger.opt(lazy=True).debug(
+                    "生成文本长度: {} 字符, 预览: {}",
+                    lambda: len(generated_text),
+                    lambda: generated_text[:200],
+                )
                 # 清理文本，去掉可能存在的代码块标记
                 json_text = generated_text.strip()
                 
-                # 去掉所有可能的代码块标记
-                # 去掉 ```json 或 ``` 标记
-                json_text = re.sub(r'^```json\s*', '', json_text, flags=re.MULTILINE)
-                json_text = re.sub(r'^```\s*', '', json_text, flags=re.MULTILINE)
-                json_text = re.sub(r'\s*```$', '', json_text, flags=re.MULTILINE)
-                json_text = json_text.strip()
-                
-                # 尝试找到JSON对象的开始和结束位置
-                if not json_text.startswith('{'):
-                    # 查找第一个 {
-                    brace_start = json_text.find('{')
-                    if brace_start != -1:
-                        json_text = json_text[brace_start:]
+                # 去掉首尾的代码块标记（```json 或 ```）
+                for prefix in _FENCE_PREFIXES:
+                    if json_text.startswith(prefix):
+                        json_text = json_text[len(prefix):].lstrip()
+                        break
+                if json_text.endswith(_FENCE_SUFFIX):
+                    json_text = json_text[:-len(_FENCE_SUFFIX)].rstrip()
                 
-                # 尝试找到匹配的结束 }
-                if json_text.startswith('{'):
-                    brace_count = 0
-                    json_end_pos = -1
-                    for i, char in enumerate(json_text):
-                        if char == '{':
-                            brace_count += 1
-                        elif char == '}':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                json_end_pos = i + 1
-                                break
-                    
-                    if json_end_pos > 0:
+                # 截取第一个 { 到最后一个 } 之间的内容，去掉JSON对象前后的说明文字
+                brace_start = json_text.find('{')
+                if brace_start != -1:
+                    brace_end = json_text.rfind('}')
+                    json_text = json_text[brace_start:brace_end + 1] if brace_end > brace_start else json_text[brace_start:]
+                    try:
+                        # 常见情况：截取后正好是一个完整的JSON对象，直接整体解析
+                        result = _json_loads(json_text)
+                    except ValueError:
+                        # 对象后的多余文本中也有 } 时，解析出第一个完整的对象（raw_decode 同时返回结束位置）
+                        result, json_end_pos = _JSON_DECODER.raw_decode(json_text)
                         json_text = json_text[:json_end_pos]
-                
-                # 解析JSON
-                result = json.loads(json_text)
+                else:
+                    # 没有JSON对象时不必尝试解析，直接重试
+                    raise ValueError("生成文本中没有JSON对象")
                 title = result.get("title", "").strip()
                 content = result.get("content", "").strip()
-                tags = result.get("tags", [])
-                
-                # 确保tags是列表
-                if isinstance(tags, str):
-                    tags = [tag.strip() for tag in re.split(r'[，,、\s]+', tags) if tag.strip()]
-                elif not isinstance(tags, list):
-                    tags = []
                 
                 # 验证结果
                 if not title and not content:
                     raise ValueError("生成的标题和正文都为空")
                 
-                # 验证长度限制
+                # 验证长度限制（先于标签处理，超出限制时直接重新生成）
                 title_length = len(title)
                 content_length = len(content)
                 
-                if title_length > MAX_TITLE_LENGTH or content_length > MAX_CONTENT_LENGTH:
+                over_limit = title_length > MAX_TITLE_LENGTH or content_length > MAX_CONTENT_LENGTH
+                near_miss = (
+                    title_length <= MAX_TITLE_LENGTH * _NEAR_MISS_TITLE_RATIO
+                    and content_length <= MAX_CONTENT_LENGTH * _NEAR_MISS_CONTENT_RATIO
+                )
+                
+                if over_limit and near_miss:
+                    # 只是略微超出，本地截断比再调用一次 LLM 便宜得多
+                    logger.info(
+                        "生成内容略超出限制（尝试 {}/{}）- 标题: {}/{}, 正文: {}/{}，本地截断",
+                        attempt + 1, max_retries, title_length, MAX_TITLE_LENGTH, content_length, MAX_CONTENT_LENGTH,
+                    )
+                    title = title[:MAX_TITLE_LENGTH]
+                    content = _truncate_at_sentence_end(content, MAX_CONTENT_LENGTH)
+                elif over_limit:
                     logger.warning(
-                        f"生成内容超出限制（尝试 {attempt + 1}/{max_retries}）- "
-                        f"标题: {title_length}/{MAX_TITLE_LENGTH}, 正文: {content_length}/{MAX_CONTENT_LENGTH}，"
-                        f"将重新生成..."
+                        "生成内容超出限制（尝试 {}/{}）- 标题: {}/{}, 正文: {}/{}，将重新生成...",
+                        attempt + 1, max_retries, title_length, MAX_TITLE_LENGTH, content_length, MAX_CONTENT_LENGTH,
                     )
                     if attempt < max_retries - 1:
                         # 继续下一次循环，重新生成
@@ -185,7 +383,14 @@ class OutlineService:
                         logger.error(error_msg)
                         raise ValueError(error_msg)
                 
-                logger.info(f"LLM生成成功（尝试 {attempt + 1}/{max_retries}）- 标题: {len(title)}字符, 正文: {len(content)}字符, 标签: {len(tags)}个")
+                # 长度符合要求后再处理标签，确保tags是列表
+                tags = result.get("tags", [])
+                if isinstance(tags, str):
+                    tags = [tag.strip() for tag in _TAG_SPLIT_RE.split(tags) if tag.strip()]
+                elif not isinstance(tags, list):
+                    tags = []
+                
+                logger.info("LLM生成成功（尝试 {}/{}）- 标题: {}字符, 正文: {}字符, 标签: {}个", attempt + 1, max_retries, len(title), len(content), len(tags))
                 
                 return {
                     "title": title,
@@ -195,32 +400,35 @@ class OutlineService:
                 
             except (json.JSONDecodeError, ValueError) as e:
                 last_error = e
-                logger.error(f"[DEBUG-JSON解析失败] JSON解析失败（尝试 {attempt + 1}/{max_retries}）: {e}")
+                parse_failures += 1
+                logger.error("JSON解析失败（尝试 {}/{}）: {}", attempt + 1, max_retries, e)
                 if 'generated_text' in locals():
-                    logger.error(f"[DEBUG-JSON解析失败-生成文本] 长度: {len(generated_text)} 字符")
-                    logger.error(f"[DEBUG-JSON解析失败-生成文本] 内容: {generated_text}")
-                    logger.error(f"[DEBUG-JSON解析失败-清理后文本] 内容: {json_text if 'json_text' in locals() else 'N/A'}")
+                    logger.opt(lazy=True).debug("JSON解析失败的生成文本: {}", lambda: generated_text)
+                    cleaned_text = json_text if 'json_text' in locals() else 'N/A'
+                    logger.opt(lazy=True).debug("JSON解析失败的清理后文本: {}", lambda: cleaned_text)
                 if attempt < max_retries - 1:
-                    time.sleep(0.5)  # 短暂延迟后重试
+                    time.sleep(_retry_delay(attempt))  # 退避后重试
                     continue
             
             except Exception as e:
                 last_error = e
-                logger.error(f"[DEBUG-通用异常] 生成标题、正文和标签时发生异常（尝试 {attempt + 1}/{max_retries}）: {e}")
-                logger.error(f"[DEBUG-通用异常] 异常类型: {type(e).__name__}")
-                import traceback
-                logger.error(f"[DEBUG-通用异常] 异常堆栈: {traceback.format_exc()}")
+                logger.error(
+                    "生成标题、正文和标签时发生异常（尝试 {}/{}）: {}: {}", attempt + 1, max_retries, type(e).__name__, e
+                )
+                # 堆栈和生成文本只在 DEBUG 级别输出，级别未放行时不调用 format_exc
+                logger.opt(lazy=True).debug("异常堆栈: {}", traceback.format_exc)
                 if 'generated_text' in locals():
-                    logger.error(f"[DEBUG-通用异常-生成文本] 长度: {len(generated_text)} 字符")
-                    logger.error(f"[DEBUG-通用异常-生成文本] 内容: {generated_text}")
-                else:
-                    logger.error(f"[DEBUG-通用异常] generated_text 变量不存在")
+                    logger.opt(lazy=True).debug("异常时的生成文本: {}", lambda: generated_text)
+                if is_non_retryable_error(e):
+                    # 认证失败、模型不存在等错误重试也不会成功，直接抛出
+                    logger.error("错误不可重试，停止重试")
+                    raise
                 if attempt < max_retries - 1:
-                    time.sleep(0.5)
+                    time.sleep(_retry_delay(attempt))
                     continue
         
         # 所有重试都失败
-        logger.error(f"使用LLM生成标题、正文和标签失败（已重试{max_retries}次）: {last_error}")
+        logger.error("使用LLM生成标题、正文和标签失败（已重试{}次）: {}", max_retries, last_error)
         raise Exception(f"生成标题、正文和标签失败（已重试{max_retries}次）: {last_error}")
 
     def generate_outline(
@@ -228,7 +436,7 @@ class OutlineService:
         topic: str
     ) -> Dict[str, Any]:
         """
-        生成小红书内容（标题、正文、标签）
+        生成小红书内容（标题、正文、标签）；多个主题请使用 generate_outline_batch
 
         Args:
             topic: 主题
@@ -237,16 +445,21 @@ class OutlineService:
             包含标题、正文、标签的字典
         """
         try:
-            logger.info(f"开始生成内容: topic={topic[:50]}...")
+            logger.info("开始生成内容: topic={}...", topic[:50])
             
-            # 直接使用LLM生成标题、正文和标签
-            extracted = self._generate_title_content_tags(topic)
+            # 命中缓存时直接返回，否则使用LLM生成标题、正文和标签（相同主题的并发请求只生成一次）
+            cache_key = _result_cache_key(topic, self.provider_config)
+            extracted = _get_cached_result(cache_key)
+            if extracted is not None:
+                logger.info("命中生成结果缓存，跳过 LLM 调用")
+            else:
+                extracted = _generate_once(cache_key, lambda: self._generate_title_content_tags(topic))
             
             title = extracted.get("title", "")
             content = extracted.get("content", "")
             tags = extracted.get("tags", [])
             
-            logger.info(f"生成完成 - 标题: {title[:30]}..., 正文长度: {len(content)}, 标签数: {len(tags)}")
+            logger.info("生成完成 - 标题: {}..., 正文长度: {}, 标签数: {}", title[:30], len(content), len(tags))
             
             return {
                 "success": True,
@@ -257,59 +470,40 @@ class OutlineService:
 
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"大纲生成失败: {error_msg}")
+            logger.error("大纲生成失败: {}", error_msg)
 
             # 根据错误类型提供更详细的错误信息
-            if "api_key" in error_msg.lower() or "unauthorized" in error_msg.lower() or "401" in error_msg:
-                detailed_error = (
-                    f"API 认证失败。\n"
-                    f"错误详情: {error_msg}\n"
-                    "可能原因：\n"
-                    "1. API Key 无效或已过期\n"
-                    "2. API Key 没有访问该模型的权限\n"
-                    "解决方案：检查并更新 API Key"
-                )
-            elif "model" in error_msg.lower() or "404" in error_msg:
-                detailed_error = (
-                    f"模型访问失败。\n"
-                    f"错误详情: {error_msg}\n"
-                    "可能原因：\n"
-                    "1. 模型名称不正确\n"
-                    "2. 没有访问该模型的权限\n"
-                    "解决方案：检查模型名称配置"
-                )
-            elif "timeout" in error_msg.lower() or "连接" in error_msg:
-                detailed_error = (
-                    f"网络连接失败。\n"
-                    f"错误详情: {error_msg}\n"
-                    "可能原因：\n"
-                    "1. 网络连接不稳定\n"
-                    "2. API 服务暂时不可用\n"
-                    "3. Base URL 配置错误\n"
-                    "解决方案：检查网络连接，稍后重试"
-                )
-            elif "rate" in error_msg.lower() or "429" in error_msg or "quota" in error_msg.lower():
-                detailed_error = (
-                    f"API 配额限制。\n"
-                    f"错误详情: {error_msg}\n"
-                    "可能原因：\n"
-                    "1. API 调用次数超限\n"
-                    "2. 账户配额用尽\n"
-                    "解决方案：等待配额重置，或升级 API 套餐"
-                )
-            else:
-                detailed_error = (
-                    f"大纲生成失败。\n"
-                    f"错误详情: {error_msg}\n"
-                    "可能原因：\n"
-                    "1. Text API 配置错误或密钥无效\n"
-                    "2. 网络连接问题\n"
-                    "3. 模型无法访问或不存在\n"
-                    "建议：检查配置和网络连接"
-                )
+            detailed_error = format_provider_error(error_msg, "大纲生成失败")
 
             return {
                 "success": False,
                 "error": detailed_error
             }
 
+    async def generate_outline_batch(self, topics: List[str], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        并发生成多个主题的内容（每个主题单独请求，互不阻塞）
+
+        不把多个主题合并到同一个提示词中：每个请求的输出长度上限（max_output_tokens）不随主题数增长，
+        总耗时约等于单个主题的耗时。
+
+        Args:
+            topics: 主题列表，最多 MAX_BATCH_TOPICS 个
+            max_concurrency: 最大并发请求数，按服务商的速率限制调整
+
+        Returns:
+            与 topics 顺序一致的结果列表，每项格式同 generate_outline
+
+        Raises:
+            ValueError: 主题数超过 MAX_BATCH_TOPICS
+        """
+        if len(topics) > MAX_BATCH_TOPICS:
+            raise ValueError(f"主题数量超过上限：最多 {MAX_BATCH_TOPICS} 个，当前 {len(topics)} 个")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def generate(topic: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await run_in_llm_executor(self.generate_outline, topic)
+
+        return list(await asyncio.gather(*(generate(topic) for topic in topics)))
@@ -1,4 +1,5 @@
 """视觉语言模型服务 - 用于分析图片"""
+from functools import lru_cache
 from typing import List, Optional
 from loguru import logger
 
@@ -19,11 +20,14 @@ class VisionService:
         logger.debug("初始化 VisionService...")
         self.provider_config = provider_config or self._get_default_config()
         self.client = self._get_client()
-        logger.info(f"VisionService 初始化完成，使用服务商: {self.provider_config.get('type', 'openai_compatible')}, 模型: {self.provider_config.get('model', 'qwen3-vl-plus')}")
+        logger.info("VisionService 初始化完成，使用服务商: {}, 模型: {}", self.provider_config.get('type', 'openai_compatible'), self.provider_config.get('model', 'qwen3-vl-plus'))
 
     def _get_default_config(self) -> dict:
         """获取默认配置（使用阿里云 qwen3-vl-plus）"""
         import os
+        from ..config.env_compile import load_env
+        # .env 不再在导入配置模块时加载，这里确保已加载
+        load_env()
         api_key = os.getenv("DASHSCOPE_API_KEY")
         if not api_key:
             raise ValueError(
@@ -78,7 +82,7 @@ class VisionService:
             图片内容的文本描述
         """
         try:
-            logger.info(f"开始分析 {len(images)} 张图片...")
+            logger.info("开始分析 {} 张图片...", len(images))
             
             # 构建分析提示词
             prompt = "请详细分析这些图片的内容，包括：\n"
@@ -99,7 +103,7 @@ class VisionService:
             temperature = self.provider_config.get('temperature', 0.3)
             max_output_tokens = self.provider_config.get('max_output_tokens', 2000)
             
-            logger.debug(f"调用 VL 模型分析图片: model={model}")
+            logger.debug("调用 VL 模型分析图片: model={}", model)
             analysis_result = self.client.generate_text(
                 prompt=prompt,
                 model=model,
@@ -108,12 +112,12 @@ class VisionService:
                 images=images
             )
             
-            logger.info(f"图片分析完成，描述长度: {len(analysis_result)} 字符")
+            logger.info("图片分析完成，描述长度: {} 字符", len(analysis_result))
             return analysis_result
             
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"图片分析失败: {error_msg}")
+            logger.error("图片分析失败: {}", error_msg)
             raise Exception(
                 f"图片分析失败。\n"
                 f"错误详情: {error_msg}\n"
@@ -125,9 +129,15 @@ class VisionService:
             )
 
 
+@lru_cache(maxsize=32)
+def _get_vision_service(config_key: Optional[tuple]) -> VisionService:
+    """按服务商配置复用服务实例（客户端只初始化一次）；config_key 为 None 时使用默认配置"""
+    return VisionService(provider_config=dict(config_key) if config_key is not None else None)
+
+
 def get_vision_service(provider_config: Optional[dict] = None) -> VisionService:
     """
-    获取视觉语言模型服务实例
+    获取视觉语言模型服务实例（相同配置复用同一实例）
 
     Args:
         provider_config: 服务商配置字典，如果为 None 则使用默认配置
@@ -135,5 +145,6 @@ def get_vision_service(provider_config: Optional[dict] = None) -> VisionService:
     Returns:
         VisionService 实例
     """
-    return VisionService(provider_config=provider_config)
+    config_key = tuple(sorted(provider_config.items())) if provider_config else None
+    return _get_vision_service(config_key)
 
@@ -0,0 +1,16 @@
+"""MCP 工具模块
+
+所有工具注册到同一个 FastMCP 实例上，导入本包即完成注册。
+"""
+from fastmcp import FastMCP
+
+# 创建 MCP 应用实例
+mcp = FastMCP("XHS Content Generator MCP")
+
+# 所有工具都返回结果字典，直接给出输出 schema，注册时无需再从返回类型推导
+RESULT_SCHEMA = {"type": "object", "additionalProperties": True}
+
+# 导入各工具模块，通过 @mcp.tool() 注册工具（必须在 mcp 创建之后）
+from . import outline, lifestyle  # noqa: E402,F401
+
+__all__ = ["mcp", "RESULT_SCHEMA"]
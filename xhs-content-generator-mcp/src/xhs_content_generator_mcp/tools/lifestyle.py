@@ -0,0 +1,107 @@
+"""生活化内容生成工具"""
+import traceback
+from functools import lru_cache
+from typing import Optional
+
+from loguru import logger
+
+from . import RESULT_SCHEMA, mcp
+from ..config import get_model_config
+from ..services.lifestyle_content_service import LifestyleContentService
+from ..utils.executor import run_in_llm_executor
+
+
+@lru_cache(maxsize=32)
+def _get_lifestyle_service(config_key: tuple) -> LifestyleContentService:
+    """
+    按服务商配置复用生活化内容服务实例（客户端、提示词模板只初始化一次）
+
+    Args:
+        config_key: tuple(sorted(provider_config.items()))，可哈希的配置键
+    """
+    return LifestyleContentService(provider_config=dict(config_key))
+
+
+@mcp.tool(output_schema=RESULT_SCHEMA)
+async def generate_lifestyle_content(
+    profession: str,
+    age: int,
+    gender: str,
+    personality: str,
+    mood: str,
+    scene: Optional[str] = None,
+    content_type: Optional[str] = None,
+    topic_hint: Optional[str] = None,
+) -> dict:
+    """
+    生成生活化、随意、带情绪的小红书内容（包含图片生成提示词）
+    
+    Args:
+        profession: 职业，例如"程序员"、"设计师"、"学生"、"自由职业者"
+        age: 年龄，例如 25、30
+        gender: 性别，例如"男"、"女"、"不指定"
+        personality: 性格特点，例如"活泼开朗"、"内敛文艺"、"幽默风趣"、"温柔细腻"
+        mood: 情绪倾向，例如"开心"、"感慨"、"治愈"、"吐槽"
+        scene: 生活场景（可选），例如"周末日常"、"工作间隙"、"深夜emo"、"旅行途中"
+        content_type: 内容类型（可选），例如"日常分享"、"心情记录"、"生活感悟"、"好物推荐"
+        topic_hint: 话题提示（可选），例如"今天天气真好"、"工作累了"
+    
+    Returns:
+        包含生成结果的字典（对齐 outline_service 格式）：
+        - success: 是否成功
+        - outline: 完整的内容文本（标题+正文+标签）
+        - pages: 解析后的页面列表，每个页面包含 index、type、content（对齐 outline_service）
+        - title: 生成的标题（1-20字符）
+        - content: 生成的正文内容（不超过100字，生活化、随意、带情绪）
+        - tags: 标签列表（3-5个）
+        - persona_context: 人物设定摘要（用于调试/追溯）
+        - error: 错误信息（如果失败）
+    """
+    try:
+        logger.info("生成生活化内容 - 职业: {}, 年龄: {}, 性别: {}, 性格: {}, 心情: {}", profession, age, gender, personality, mood)
+        
+        # 从配置获取服务商配置（使用默认配置，max_output_tokens=2048）
+        try:
+            provider_config = get_model_config().get_provider_config(
+                provider_type="alibaba_bailian",
+                model=None,
+                temperature=0.8,
+                max_output_tokens=2048,
+            )
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        # 获取（复用）服务并生成内容（同步阻塞的模型调用放到有界线程池执行，不阻塞事件循环）
+        service = _get_lifestyle_service(tuple(sorted(provider_config.items())))
+        result = await run_in_llm_executor(
+            service.generate_lifestyle_content,
+            profession=profession,
+            age=age,
+            gender=gender,
+            personality=personality,
+            mood=mood,
+            scene=scene,
+            content_type=content_type,
+            topic_hint=topic_hint,
+        )
+        
+        # lazy 模式下只有日志级别放行时才会计算参数
+        logger.opt(lazy=True).info(
+            "生活化内容生成完成 - 成功: {}, 标题长度: {}, 正文长度: {}, 页数: {}",
+            lambda: result.get('success'),
+            lambda: len(result.get('title', '')),
+            lambda: len(result.get('content', '')),
+            lambda: len(result.get('pages', [])),
+        )
+        return result
+        
+    except Exception as e:
+        logger.error("生成生活化内容失败: {}", e)
+        logger.error(traceback.format_exc())
+        return {
+            "success": False,
+            "error": f"生成生活化内容时发生异常: {str(e)}"
+        }
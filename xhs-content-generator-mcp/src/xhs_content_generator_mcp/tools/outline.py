@@ -0,0 +1,152 @@
+"""小红书笔记生成工具"""
+import traceback
+from functools import lru_cache
+from typing import List
+
+from loguru import logger
+
+from . import RESULT_SCHEMA, mcp
+from ..config import get_model_config
+from ..services.outline_service import MAX_BATCH_TOPICS, OutlineService
+from ..utils.executor import run_in_llm_executor
+
+
+@lru_cache(maxsize=32)
+def _get_outline_service(config_key: tuple) -> OutlineService:
+    """
+    按服务商配置复用大纲服务实例（客户端、提示词模板只初始化一次）
+
+    Args:
+        config_key: tuple(sorted(provider_config.items()))，可哈希的配置键
+    """
+    return OutlineService(provider_config=dict(config_key))
+
+
+def _get_default_outline_service() -> OutlineService:
+    """按默认服务商配置获取（复用）大纲服务，服务商未配置时抛出 ValueError"""
+    # 使用默认配置（max_output_tokens=2048）
+    provider_config = get_model_config().get_provider_config(
+        provider_type="alibaba_bailian",
+        model=None,
+        temperature=0.3,
+        max_output_tokens=2048,
+    )
+    return _get_outline_service(tuple(sorted(provider_config.items())))
+
+
+def warm_up_outline_service() -> None:
+    """创建默认配置的大纲服务并预热提示词前缀缓存（服务启动时调用，之后的请求复用同一实例）"""
+    _get_default_outline_service().warm_prompt_cache()
+
+
+@mcp.tool(output_schema=RESULT_SCHEMA)
+async def generate_xhs_note(
+    topic: str,
+) -> dict:
+    """
+    生成完整的小红书内容笔记
+    
+    说明：
+        - 该工具会根据主题直接生成一篇可发布的完整小红书笔记
+        - 输出中包含标题、正文、标签等字段，可直接用于发布接口或后续流程
+    
+    Args:
+        topic: 内容主题，例如"如何在家做拿铁"、"秋季显白美甲"等
+    
+    Returns:
+        包含生成结果的字典（完整小红书内容）：
+        - success: 是否成功
+        - title: 生成的标题（1-20字符，匹配发布接口）
+        - content: 生成的正文内容（不超过1000字符，匹配发布接口）
+        - tags: 生成的标签列表（3-5个，匹配发布接口）
+        - error: 错误信息（如果失败）
+    """
+    try:
+        logger.opt(lazy=True).info("生成大纲 - 主题: {}...", lambda: topic[:50])
+        
+        # 获取（复用）服务
+        try:
+            service = _get_default_outline_service()
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        # 生成大纲（同步阻塞的模型调用放到有界线程池执行，不阻塞事件循环）
+        result = await run_in_llm_executor(
+            service.generate_outline,
+            topic=topic,
+        )
+        
+        # lazy 模式下只有日志级别放行时才会计算参数
+        logger.opt(lazy=True).info(
+            "大纲生成完成 - 成功: {}, 页数: {}",
+            lambda: result.get('success'),
+            lambda: len(result.get('pages', [])),
+        )
+        return result
+        
+    except Exception as e:
+        logger.error("生成大纲失败: {}", e)
+        logger.error(traceback.format_exc())
+        return {
+            "success": False,
+            "error": f"生成大纲时发生异常: {str(e)}"
+        }
+
+
+@mcp.tool(output_schema=RESULT_SCHEMA)
+async def generate_xhs_notes(
+    topics: List[str],
+) -> dict:
+    """
+    批量生成多篇小红书内容笔记
+    
+    说明：
+        - 每个主题单独请求、并发生成，总耗时约等于生成单篇的耗时
+        - 单个主题失败不影响其它主题，失败项的 success 为 False
+        - 一次最多 20 个主题，超出时直接返回错误，请分批调用
+    
+    Args:
+        topics: 内容主题列表（最多 20 个），例如 ["如何在家做拿铁", "秋季显白美甲"]
+    
+    Returns:
+        包含生成结果的字典：
+        - success: 是否全部成功
+        - results: 与 topics 顺序一致的结果列表，每项格式同 generate_xhs_note
+        - error: 错误信息（如果失败）
+    """
+    try:
+        logger.info("批量生成大纲 - 主题数: {}", len(topics))
+        
+        if len(topics) > MAX_BATCH_TOPICS:
+            return {
+                "success": False,
+                "error": f"主题数量超过上限：最多 {MAX_BATCH_TOPICS} 个，当前 {len(topics)} 个，请分批生成"
+            }
+        
+        try:
+            service = _get_default_outline_service()
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        results = await service.generate_outline_batch(topics)
+        
+        succeeded = sum(1 for result in results if result.get('success'))
+        logger.info("批量生成大纲完成 - 成功: {}/{}", succeeded, len(results))
+        return {
+            "success": succeeded == len(results),
+            "results": results
+        }
+        
+    except Exception as e:
+        logger.error("批量生成大纲失败: {}", e)
+        logger.error(traceback.format_exc())
+        return {
+            "success": False,
+            "error": f"批量生成大纲时发生异常: {str(e)}"
+        }
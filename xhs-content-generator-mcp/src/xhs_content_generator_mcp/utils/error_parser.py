@@ -1,4 +1,16 @@
 """错误解析工具"""
+from typing import Optional
+
+
+class ProviderAPIError(Exception):
+    """服务商接口返回的错误，携带 HTTP 状态码和服务商错误码（是否重试按这两个字段判断，不解析错误信息文本）"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, error_code: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.error_code = error_code
+
+
 def parse_genai_error(error: Exception) -> str:
     """
     解析 Google GenAI API 错误，返回用户友好的错误信息
@@ -215,3 +227,91 @@ def parse_genai_error(error: Exception) -> str:
         "3. 查看 Google Cloud Console 中的错误日志"
     )
 
+
+
+# 服务层错误分类规则：(错误信息中的关键字（小写）, 错误说明模板)，按顺序取第一个匹配的
+_PROVIDER_ERROR_RULES = (
+    (("api_key", "unauthorized", "401"), (
+        "API 认证失败。\n"
+        "错误详情: {error_msg}\n"
+        "可能原因：\n"
+        "1. API Key 无效或已过期\n"
+        "2. API Key 没有访问该模型的权限\n"
+        "解决方案：检查并更新 API Key"
+    )),
+    (("model", "404"), (
+        "模型访问失败。\n"
+        "错误详情: {error_msg}\n"
+        "可能原因：\n"
+        "1. 模型名称不正确\n"
+        "2. 没有访问该模型的权限\n"
+        "解决方案：检查模型名称配置"
+    )),
+    (("timeout", "连接"), (
+        "网络连接失败。\n"
+        "错误详情: {error_msg}\n"
+        "可能原因：\n"
+        "1. 网络连接不稳定\n"
+        "2. API 服务暂时不可用\n"
+        "3. Base URL 配置错误\n"
+        "解决方案：检查网络连接，稍后重试"
+    )),
+    (("rate", "429", "quota"), (
+        "API 配额限制。\n"
+        "错误详情: {error_msg}\n"
+        "可能原因：\n"
+        "1. API 调用次数超限\n"
+        "2. 账户配额用尽\n"
+        "解决方案：等待配额重置，或升级 API 套餐"
+    )),
+)
+
+_PROVIDER_ERROR_DEFAULT = (
+    "{title}。\n"
+    "错误详情: {error_msg}\n"
+    "可能原因：\n"
+    "1. Text API 配置错误或密钥无效\n"
+    "2. 网络连接问题\n"
+    "3. 模型无法访问或不存在\n"
+    "建议：检查配置和网络连接"
+)
+
+
+def format_provider_error(error_msg: str, title: str) -> str:
+    """
+    根据错误信息中的关键字生成详细的错误说明（供各生成服务共用）
+
+    Args:
+        error_msg: 原始错误信息
+        title: 未匹配到已知错误类型时使用的标题，例如"大纲生成失败"
+
+    Returns:
+        详细的错误说明
+    """
+    error_lower = error_msg.lower()
+    for keywords, template in _PROVIDER_ERROR_RULES:
+        if any(keyword in error_lower for keyword in keywords):
+            return template.format(error_msg=error_msg)
+    return _PROVIDER_ERROR_DEFAULT.format(title=title, error_msg=error_msg)
+
+
+# 重试也不会成功的 HTTP 状态码：认证失败、权限不足、模型或端点不存在
+_NON_RETRYABLE_STATUS_CODES = frozenset({401, 403, 404})
+# 重试也不会成功的服务商错误码（小写）：配额耗尽与 429 限流不同，等待后重试也不会恢复
+_NON_RETRYABLE_ERROR_CODES = frozenset({
+    "invalid_api_key", "model_not_found", "insufficient_quota", "quota_exceeded",
+    "unauthenticated", "permission_denied", "not_found",
+})
+
+
+def is_non_retryable_error(error: Exception) -> bool:
+    """
+    判断错误是否不可重试（认证失败、模型不存在等），这类错误应立即失败而不是等待后重试
+
+    只按 ProviderAPIError 的状态码和错误码判断；其它异常（网络错误、JSON 解析失败等）都可以重试。
+    """
+    if not isinstance(error, ProviderAPIError):
+        return False
+    if error.status_code in _NON_RETRYABLE_STATUS_CODES:
+        return True
+    return (error.error_code or "").lower() in _NON_RETRYABLE_ERROR_CODES
@@ -0,0 +1,46 @@
+"""模型调用线程池
+
+同步阻塞的模型调用统一放到有界线程池中执行，并发数可控，避免突发请求压垮下游 API。
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# 线程池大小，可通过环境变量 XHS_LLM_WORKERS 调整
+DEFAULT_LLM_WORKERS = 8
+
+_llm_executor: Optional[ThreadPoolExecutor] = None
+_llm_executor_lock = threading.Lock()
+
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    """获取模型调用线程池，首次调用时创建（此时 .env 已加载，可读取 XHS_LLM_WORKERS）"""
+    global _llm_executor
+    if _llm_executor is None:
+        with _llm_executor_lock:
+            if _llm_executor is None:
+                max_workers = int(os.getenv("XHS_LLM_WORKERS") or DEFAULT_LLM_WORKERS)
+                _llm_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="xhs-llm")
+    return _llm_executor
+
+
+async def run_in_llm_executor(func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+    """
+    在模型调用线程池中执行同步函数（用法同 asyncio.to_thread，同样会传递 contextvars）
+
+    Args:
+        func: 同步函数
+        *args: 位置参数
+        **kwargs: 关键字参数
+
+    Returns:
+        func 的返回值
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_llm_executor(), call)
@@ -0,0 +1,116 @@
+import os
+import sys
+import types
+
+import dotenv
+import pytest
+
+from xhs_content_generator_mcp.config import env_compile
+
+COMPILED_MODULE = "xhs_content_generator_mcp.config._env_compiled"
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    """临时 .env 文件；每个测试前后清空 load_env 缓存并移除测试写入的环境变量"""
+    path = tmp_path / ".env"
+    path.write_text("XHS_TEST_FROM_FILE=file\n", encoding="utf-8")
+    monkeypatch.delenv("XHS_TEST_FROM_FILE", raising=False)
+    monkeypatch.delenv("XHS_TEST_FROM_COMPILED", raising=False)
+    env_compile._load_env.cache_clear()
+    yield path
+    env_compile._load_env.cache_clear()
+    os.environ.pop("XHS_TEST_FROM_FILE", None)
+    os.environ.pop("XHS_TEST_FROM_COMPILED", None)
+
+
+@pytest.fixture
+def dotenv_calls(monkeypatch):
+    """记录 load_dotenv 的调用，并照常加载"""
+    calls = []
+    real_load_dotenv = dotenv.load_dotenv
+
+    def load_dotenv(dotenv_path):
+        calls.append(dotenv_path)
+        return real_load_dotenv(dotenv_path=dotenv_path)
+
+    monkeypatch.setattr(dotenv, "load_dotenv", load_dotenv)
+    return calls
+
+
+def fake_compiled(monkeypatch, mtime_ns):
+    """注入编译生成的模块"""
+    module = types.ModuleType(COMPILED_MODULE)
+    module.ENV = {"XHS_TEST_FROM_COMPILED": "compiled"}
+    module.ENV_MTIME_NS = mtime_ns
+    monkeypatch.setitem(sys.modules, COMPILED_MODULE, module)
+
+
+class TestLoadEnv:
+    """load_env 测试"""
+
+    def test_same_file_loaded_once(self, env_file, dotenv_calls, monkeypatch):
+        """同一文件无论以相对路径还是绝对路径传入都只解析一次"""
+        monkeypatch.setitem(sys.modules, COMPILED_MODULE, None)
+        monkeypatch.chdir(env_file.parent)
+
+        env_compile.load_env(env_file)
+        env_compile.load_env(".env")
+        env_compile.load_env(str(env_file))
+
+        assert len(dotenv_calls) == 1
+        assert os.environ["XHS_TEST_FROM_FILE"] == "file"
+
+    def test_default_and_explicit_path_share_cache(self, env_file, monkeypatch):
+        """load_env() 与 load_env(ENV_PATH) 命中同一缓存项"""
+        monkeypatch.setitem(sys.modules, COMPILED_MODULE, None)
+        calls = []
+        monkeypatch.setattr(dotenv, "load_dotenv", lambda dotenv_path: calls.append(dotenv_path))
+
+        env_compile.load_env()
+        env_compile.load_env(env_compile.ENV_PATH)
+
+        assert calls == [env_compile.ENV_PATH.resolve()]
+
+    def test_compiled_module_used_when_mtime_matches(self, env_file, dotenv_calls, monkeypatch):
+        """.env 未在编译后修改时使用编译模块，不再解析 .env"""
+        fake_compiled(monkeypatch, os.stat(env_file).st_mtime_ns)
+
+        env_compile.load_env(env_file)
+
+        assert dotenv_calls == []
+        assert os.environ["XHS_TEST_FROM_COMPILED"] == "compiled"
+        assert "XHS_TEST_FROM_FILE" not in os.environ
+
+    def test_stale_compiled_module_falls_back(self, env_file, dotenv_calls, monkeypatch):
+        """.env 在编译后被修改（mtime 不一致）时回退到 load_dotenv"""
+        fake_compiled(monkeypatch, os.stat(env_file).st_mtime_ns - 1)
+
+        env_compile.load_env(env_file)
+
+        assert len(dotenv_calls) == 1
+        assert os.environ["XHS_TEST_FROM_FILE"] == "file"
+        assert "XHS_TEST_FROM_COMPILED" not in os.environ
+
+    def test_existing_variables_not_overridden(self, env_file, monkeypatch):
+        """已有的环境变量不会被编译模块覆盖"""
+        fake_compiled(monkeypatch, os.stat(env_file).st_mtime_ns)
+        monkeypatch.setenv("XHS_TEST_FROM_COMPILED", "shell")
+
+        env_compile.load_env(env_file)
+
+        assert os.environ["XHS_TEST_FROM_COMPILED"] == "shell"
+
+
+class TestCompileEnv:
+    """compile_env 测试"""
+
+    def test_records_mtime_and_values(self, env_file, tmp_path):
+        """生成的模块记录 .env 的 mtime 和全部有值的变量"""
+        env_file.write_text("A=1\nB=two words\nEMPTY_KEY\n", encoding="utf-8")
+        output = env_compile.compile_env(env_file, tmp_path / "_env_compiled.py")
+
+        namespace = {}
+        exec(output.read_text(encoding="utf-8"), namespace)
+        assert namespace["ENV_MTIME_NS"] == os.stat(env_file).st_mtime_ns
+        assert namespace["ENV"] == {"A": "1", "B": "two words"}
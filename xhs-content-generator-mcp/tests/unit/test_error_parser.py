@@ -0,0 +1,33 @@
+import pytest
+
+from xhs_content_generator_mcp.utils.error_parser import ProviderAPIError, is_non_retryable_error
+
+
+class TestIsNonRetryableError:
+    """重试判断测试：只看状态码和错误码，不看错误信息文本"""
+
+    @pytest.mark.parametrize("status_code", [401, 403, 404])
+    def test_non_retryable_status(self, status_code):
+        """认证、权限、资源不存在不重试"""
+        assert is_non_retryable_error(ProviderAPIError("请求失败", status_code=status_code))
+
+    @pytest.mark.parametrize("status_code", [408, 409, 429, 500, 503])
+    def test_retryable_status(self, status_code):
+        """超时、冲突、限流和服务端错误可以重试，即使提示里写了「检查 API Key」"""
+        error = ProviderAPIError("请求失败，请检查 API Key 和网络", status_code=status_code)
+        assert not is_non_retryable_error(error)
+
+    def test_message_digits_ignored(self):
+        """错误信息里出现 4040 之类的数字不影响判断"""
+        error = ProviderAPIError("请求 ID 40401 处理失败", status_code=500)
+        assert not is_non_retryable_error(error)
+
+    def test_error_code(self):
+        """没有状态码时按服务商错误码判断（不区分大小写）"""
+        assert is_non_retryable_error(ProviderAPIError("x", error_code="invalid_api_key"))
+        assert is_non_retryable_error(ProviderAPIError("x", error_code="PERMISSION_DENIED"))
+        assert not is_non_retryable_error(ProviderAPIError("x", error_code="RESOURCE_EXHAUSTED"))
+
+    def test_other_exceptions_retryable(self):
+        """非服务商错误（网络错误、解析失败等）都可以重试"""
+        assert not is_non_retryable_error(RuntimeError("401 Unauthorized"))
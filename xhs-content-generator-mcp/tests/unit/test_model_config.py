@@ -0,0 +1,70 @@
+import pytest
+
+from xhs_content_generator_mcp.config import ModelConfig, ProviderNotConfiguredError
+from xhs_content_generator_mcp.config.model_config import _API_KEY_ENV_VARS, _check_temperature
+
+
+@pytest.fixture
+def gemini_only(monkeypatch):
+    """只配置 Google Gemini 的模型配置"""
+    for name in _API_KEY_ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    return ModelConfig()
+
+
+class TestCheckTemperature:
+    """温度参数校验测试"""
+
+    @pytest.mark.parametrize("temperature", [0.0, 0.3, 2.0])
+    def test_in_range(self, temperature):
+        """范围内（含边界）不抛出异常"""
+        _check_temperature(temperature)
+
+    @pytest.mark.parametrize("temperature", [-0.1, 2.1, 5])
+    def test_out_of_range(self, temperature):
+        """超出范围抛出 ValueError"""
+        with pytest.raises(ValueError, match="温度参数"):
+            _check_temperature(temperature)
+
+
+class TestGetProviderConfigOrNone:
+    """按优先级回退选择服务商测试"""
+
+    def test_unconfigured_provider_returns_none(self, gemini_only):
+        """未配置 API Key 的服务商返回 None"""
+        assert gemini_only.get_provider_config_or_none("openai_compatible") is None
+        with pytest.raises(ProviderNotConfiguredError):
+            gemini_only.get_provider_config("openai_compatible")
+
+    def test_configured_provider(self, gemini_only):
+        """已配置的服务商返回配置字典"""
+        config = gemini_only.get_provider_config_or_none("google_gemini", temperature=0.5)
+        assert config["api_key"] == "test-key"
+        assert config["temperature"] == 0.5
+
+    def test_invalid_temperature_is_not_swallowed(self, gemini_only):
+        """温度超出范围时抛出异常，不会当作未配置而回退到下一个服务商"""
+        with pytest.raises(ValueError, match="温度参数"):
+            gemini_only.get_provider_config_or_none("google_gemini", temperature=5)
+
+    def test_unsupported_provider_is_not_swallowed(self, gemini_only):
+        """不支持的服务商类型抛出异常"""
+        with pytest.raises(ValueError, match="不支持的服务商类型"):
+            gemini_only.get_provider_config_or_none("unknown")
+
+
+class TestPackageExports:
+    """config 包导出测试"""
+
+    def test_model_config_is_instance(self, gemini_only, monkeypatch):
+        """从包中导入 model_config 得到配置实例，而不是同名子模块"""
+        import sys
+        import xhs_content_generator_mcp.config as config
+
+        config_module = sys.modules["xhs_content_generator_mcp.config.model_config"]
+        monkeypatch.setattr(config_module, "_model_config", gemini_only)
+        from xhs_content_generator_mcp.config import model_config
+
+        assert model_config is gemini_only
+        assert config.model_config is gemini_only
@@ -0,0 +1,214 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from xhs_content_generator_mcp.services import outline_service
+from xhs_content_generator_mcp.services.outline_service import (
+    MAX_BATCH_TOPICS,
+    OutlineService,
+    _generate_once,
+    _get_cached_result,
+    _truncate_at_sentence_end,
+)
+
+KEY = b"k" * 16
+RESULT = {"title": "标题", "content": "正文", "tags": ["标签1", "标签2", "标签3"]}
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """每个测试前后清空结果缓存和进行中的请求"""
+    outline_service._result_cache.clear()
+    outline_service._inflight_results.clear()
+    yield
+    outline_service._result_cache.clear()
+    outline_service._inflight_results.clear()
+
+
+class TestGenerateOnce:
+    """相同 key 的并发生成请求合并测试"""
+
+    def test_concurrent_requests_generate_once(self):
+        """并发请求只调用一次 generate，且都拿到结果"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def generate():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {**RESULT, "tags": list(RESULT["tags"])}
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            leader = pool.submit(_generate_once, KEY, generate)
+            assert started.wait(5)
+            followers = [pool.submit(_generate_once, KEY, generate) for _ in range(3)]
+            release.set()
+            results = [leader.result(5)] + [f.result(5) for f in followers]
+
+        assert len(calls) == 1
+        assert all(result == RESULT for result in results)
+        # 每个请求拿到各自的副本，修改标签不会互相影响
+        assert len({id(result["tags"]) for result in results}) == len(results)
+        assert outline_service._inflight_results == {}
+
+    def test_late_arrival_hits_cache(self):
+        """上一次生成完成后才到达的请求命中缓存，不会成为新的生成者"""
+        calls = []
+
+        def generate():
+            calls.append(1)
+            return {**RESULT, "tags": list(RESULT["tags"])}
+
+        _generate_once(KEY, generate)
+        assert _generate_once(KEY, generate) == RESULT
+        assert len(calls) == 1
+
+    def test_failure_propagates_and_is_not_cached(self):
+        """生成失败时等待者收到同样的异常，结果不写入缓存"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def generate():
+            started.set()
+            release.wait(5)
+            raise RuntimeError("boom")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(_generate_once, KEY, generate)
+            assert started.wait(5)
+            follower = pool.submit(_generate_once, KEY, generate)
+            release.set()
+            for future in (leader, follower):
+                with pytest.raises(RuntimeError, match="boom"):
+                    future.result(5)
+
+        assert _get_cached_result(KEY) is None
+        assert outline_service._inflight_results == {}
+
+
+@pytest.fixture
+def service():
+    """跳过客户端初始化的大纲服务，生成函数按主题返回结果（主题越靠前越慢，"坏"主题失败）"""
+    service = OutlineService.__new__(OutlineService)
+    service.provider_config = {"type": "alibaba_bailian", "model": "test"}
+
+    def generate(topic):
+        if topic == "坏":
+            raise RuntimeError("boom")
+        time.sleep(0.02 * (5 - len(topic)))
+        return {"title": topic, "content": "正文", "tags": ["标签"]}
+
+    service._generate_title_content_tags = generate
+    return service
+
+
+class TestGenerateOutlineBatch:
+    """批量生成测试"""
+
+    @pytest.mark.asyncio
+    async def test_results_keep_topic_order(self, service):
+        """结果顺序与主题顺序一致，与完成先后无关"""
+        topics = ["a", "bb", "ccc", "dddd"]
+
+        results = await service.generate_outline_batch(topics)
+
+        assert [result["title"] for result in results] == topics
+        assert all(result["success"] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_one_failure_does_not_affect_others(self, service):
+        """单个主题失败时只有该项 success 为 False"""
+        results = await service.generate_outline_batch(["a", "坏", "bb"])
+
+        assert [result["success"] for result in results] == [True, False, True]
+        assert "error" in results[1]
+        assert [results[0]["title"], results[2]["title"]] == ["a", "bb"]
+
+    @pytest.mark.asyncio
+    async def test_too_many_topics_rejected(self, service):
+        """主题数超过上限时直接报错，不发起任何请求"""
+        service._generate_title_content_tags = None
+
+        with pytest.raises(ValueError, match=str(MAX_BATCH_TOPICS)):
+            await service.generate_outline_batch(["a"] * (MAX_BATCH_TOPICS + 1))
+
+
+class TestTruncateAtSentenceEnd:
+    """正文本地截断测试"""
+
+    def test_within_limit_unchanged(self):
+        """未超出限制时原样返回"""
+        assert _truncate_at_sentence_end("第一句。第二句。", 8) == "第一句。第二句。"
+
+    def test_cuts_after_last_sentence(self):
+        """截断到限制内最后一个句末标点之后"""
+        assert _truncate_at_sentence_end("第一句。第二句！第三句很长", 10) == "第一句。第二句！"
+
+    def test_falls_back_to_hard_cut(self):
+        """句末标点落在前半段时直接按字符截断，避免丢掉太多内容"""
+        text = "短。" + "很长的一句话没有标点" * 3
+        assert _truncate_at_sentence_end(text, 20) == text[:20]
+
+
+def make_generating_service(*outputs):
+    """客户端依次返回给定文本的大纲服务"""
+    service = OutlineService.__new__(OutlineService)
+    service.provider_config = {"type": "alibaba_bailian", "model": "test"}
+    service._prompt_prefix = ""
+    service._prompt_suffix = ""
+    service.client = MagicMock()
+    service.client.generate_text.side_effect = list(outputs)
+    return service
+
+
+def outline_json(title, content, tags=("标签",)):
+    return json.dumps({"title": title, "content": content, "tags": list(tags)}, ensure_ascii=False)
+
+
+class TestGenerateTitleContentTags:
+    """生成结果解析与长度处理测试"""
+
+    def test_near_miss_truncated_locally(self):
+        """略微超出限制时本地截断，不再调用 LLM"""
+        content = "这是一句话。" * 170  # 1020 字符，超出不到 5%
+        service = make_generating_service(outline_json("标" * 22, content))
+
+        result = service._generate_title_content_tags("主题")
+
+        assert service.client.generate_text.call_count == 1
+        assert result["title"] == "标" * 20
+        assert len(result["content"]) <= 1000
+        assert result["content"].endswith("。")
+
+    def test_large_overflow_regenerates(self):
+        """超出较多时重新生成"""
+        service = make_generating_service(
+            outline_json("标" * 23, "正文"),
+            outline_json("标题", "正文"),
+        )
+
+        result = service._generate_title_content_tags("主题")
+
+        assert service.client.generate_text.call_count == 2
+        assert result["title"] == "标题"
+
+    def test_json_extracted_from_fenced_and_chatty_output(self):
+        """去掉代码块标记和对象前后的说明文字（说明文字中含有 } 也能解析）"""
+        output = "好的，结果如下：\n```json\n" + outline_json("标题", "正文", ("a", "b")) + "\n```\n以上 {仅供参考}"
+        service = make_generating_service(output)
+
+        result = service._generate_title_content_tags("主题")
+
+        assert result == {"title": "标题", "content": "正文", "tags": ["a", "b"]}
+
+    def test_string_tags_split(self):
+        """字符串形式的标签按分隔符拆分"""
+        service = make_generating_service(json.dumps({"title": "标题", "content": "正文", "tags": "a，b、c d"}))
+
+        assert service._generate_title_content_tags("主题")["tags"] == ["a", "b", "c", "d"]
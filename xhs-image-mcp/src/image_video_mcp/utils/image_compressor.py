@@ -39,18 +39,20 @@ def compress_image(
             background = Image.new('RGB', img.size, (255, 255, 255))
             if img.mode == 'P':
                 img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
+            # 直接以带 alpha 的图作为 mask，避免 split() 拆出全部通道
+            background.paste(img, (0, 0), img if img.mode in ('RGBA', 'LA') else None)
             img = background
         elif img.mode != 'RGB':
             img = img.convert('RGB')
 
         # 如果图片尺寸过大，先缩小
+        # reducing_gap：先按整数倍快速 reduce，再对缩小后的图做 LANCZOS，避免在原始分辨率上重采样
         width, height = img.size
         if width > max_dimension or height > max_dimension:
             ratio = min(max_dimension / width, max_dimension / height)
             new_width = int(width * ratio)
             new_height = int(height * ratio)
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
 
         # 逐步降低质量直到满足大小要求
         quality = quality_start